@@ -1,801 +1,2228 @@
 import can
-import tkinter as tk
 import math
 import time
+import bisect
+import collections
 import array
+import argparse
+import functools
 import warnings
 import os
+import sys
+import threading
+import wave
+import struct
+import re
+import pickle
+import io
+import itertools
+import mmap
+import json
+import asyncio
+import random
+import concurrent.futures
+import hashlib
+import base64
 
-# Suppress ALSA warnings
-os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = "1"
-stderr = os.dup(2)
-os.close(2)
-os.open(os.devnull, os.O_RDWR)
+# Optional: vectorized audio synthesis
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Optional: rasterize cached gauge faces with text (GAUGE_FACE_CACHE)
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:
+    Image = None
 
 # ================= CAN =================
-bus = can.interface.Bus(channel="vcan0", interface="socketcan")
+CAN_CHANNEL = "vcan0"
+CAN_INTERFACE = "socketcan"
+CAN_RX_FILTERS = True             # Only let the input IDs in CAN_SIGNALS through
+CAN_RECEIVE_OWN_MESSAGES = False  # Whether our own transmissions are echoed back to us
+
+bus = None
+
+def can_input_filters(id_offsets=(0,)):
+    """Exact-match receive filters for every ID in the input signal table,
+    once per vehicle ID offset sharing the bus"""
+    return [{"can_id": msg_id + id_offset,
+             "can_mask": 0x1FFFFFFF if msg_id + id_offset > 0x7FF else 0x7FF,
+             "extended": msg_id + id_offset > 0x7FF}
+            for id_offset in id_offsets for msg_id in sorted(can_decoders)]
+
+def open_bus(channel=CAN_CHANNEL, interface=CAN_INTERFACE,
+             receive_own_messages=CAN_RECEIVE_OWN_MESSAGES, id_offsets=(0,)):
+    global bus
+    bus = can.interface.Bus(channel=channel, interface=interface,
+                            can_filters=can_input_filters(id_offsets) if CAN_RX_FILTERS else None,
+                            receive_own_messages=receive_own_messages)
+    return bus
 
 # ================= AUDIO SYSTEM =================
 # Set to False to disable audio and improve performance
 ENABLE_AUDIO_ATTEMPT = False  # Change to True to enable audio
 
+# Where mixed audio goes: "device" (PyAudio), "null" (discard) or a .wav path
+AUDIO_SINK = "device"
+
+SAMPLE_RATE = 22050
+AUDIO_BLOCK_FRAMES = 1024  # Frames rendered per mixer callback
 AUDIO_ENABLED = False
 AUDIO_DEVICE = None
 audio = None
+pyaudio = None
 
-if ENABLE_AUDIO_ATTEMPT:
-    try:
-        import pyaudio
-        # Restore stderr after import to see our messages
-        os.dup2(stderr, 2)
-        os.close(stderr)
-        
-        # Initialize PyAudio
-        audio = pyaudio.PyAudio()
-        SAMPLE_RATE = 22050
-        
-        # Find the best output device (prefer PulseAudio/default for mixing support)
-        device_priority = []
-        
-        for i in range(audio.get_device_count()):
-            info = audio.get_device_info_by_index(i)
-            if info['maxOutputChannels'] > 0:
-                name = info['name'].lower()
-                # Prioritize software mixers over hardware devices
-                if 'pulse' in name or 'default' in name:
-                    priority = 0  # Highest priority
-                elif 'sysdefault' in name:
-                    priority = 1
-                else:
-                    priority = 2  # Hardware devices last
-                device_priority.append((priority, i, info['name']))
-        
-        if device_priority:
-            device_priority.sort()  # Sort by priority
-            AUDIO_DEVICE = device_priority[0][1]
-            print(f"✓ Using audio device {AUDIO_DEVICE}: {device_priority[0][2]}")
-            
-            # Test the device by trying to open a stream
-            try:
-                test_stream = audio.open(
-                    format=pyaudio.paInt16,
-                    channels=1,
-                    rate=22050,
-                    output=True,
-                    output_device_index=AUDIO_DEVICE
-                )
-                test_stream.close()
-                AUDIO_ENABLED = True
-                print("✓ Audio system working - sounds enabled")
-            except Exception as e:
-                print(f"⚠ Audio device test failed: {e}")
-                print("  Disabling audio to prevent lag")
-                audio.terminate()
-                AUDIO_ENABLED = False
-        else:
-            raise Exception("No audio output device found")
-        
-        # Audio state
-        engine_stream = None
-        last_rpm_sound = 0
-        turn_signal_time = 0
-        last_turn_signal_blink = False
-        
-    except ImportError:
-        # Restore stderr
+# Audio state
+mixer = None
+audio_output = None
+turn_signal_time = 0
+
+def init_audio(sink=None):
+    """Start the mixer on PyAudio or a null/file sink (window mode only)"""
+    global AUDIO_ENABLED, AUDIO_DEVICE, audio, pyaudio, mixer, audio_output
+
+    sink = sink or (AUDIO_SINK if ENABLE_AUDIO_ATTEMPT else None)
+    if sink is not None and sink != "device":
+        # No sound card needed
+        mixer = AudioMixer()
+        audio_output = NullOutput(mixer) if sink == "null" else WaveFileOutput(mixer, sink)
+        AUDIO_ENABLED = True
+        print(f"✓ Audio mixed to {sink}")
+        return
+
+    # Suppress ALSA warnings
+    os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = "1"
+    stderr = os.dup(2)
+    os.close(2)
+    os.open(os.devnull, os.O_RDWR)
+
+    if ENABLE_AUDIO_ATTEMPT:
         try:
+            import pyaudio
+            # Restore stderr after import to see our messages
             os.dup2(stderr, 2)
             os.close(stderr)
-        except:
-            pass
-        AUDIO_ENABLED = False
-        print("⚠ PyAudio not installed. Audio disabled for better performance.")
-    except Exception as e:
+
+            # Initialize PyAudio
+            audio = pyaudio.PyAudio()
+
+            # Find the best output device (prefer PulseAudio/default for mixing support)
+            device_priority = []
+
+            for i in range(audio.get_device_count()):
+                info = audio.get_device_info_by_index(i)
+                if info['maxOutputChannels'] > 0:
+                    name = info['name'].lower()
+                    # Prioritize software mixers over hardware devices
+                    if 'pulse' in name or 'default' in name:
+                        priority = 0  # Highest priority
+                    elif 'sysdefault' in name:
+                        priority = 1
+                    else:
+                        priority = 2  # Hardware devices last
+                    device_priority.append((priority, i, info['name']))
+
+            if device_priority:
+                device_priority.sort()  # Sort by priority
+                AUDIO_DEVICE = device_priority[0][1]
+                print(f"✓ Using audio device {AUDIO_DEVICE}: {device_priority[0][2]}")
+
+                # Open the long-lived output stream, which also tests the device
+                try:
+                    mixer = AudioMixer()
+                    audio_output = PyAudioOutput(mixer)
+                    AUDIO_ENABLED = True
+                    print("✓ Audio system working - sounds enabled")
+                except Exception as e:
+                    print(f"⚠ Audio device test failed: {e}")
+                    print("  Disabling audio to prevent lag")
+                    audio.terminate()
+                    AUDIO_ENABLED = False
+            else:
+                raise Exception("No audio output device found")
+
+        except ImportError:
+            # Restore stderr
+            try:
+                os.dup2(stderr, 2)
+                os.close(stderr)
+            except:
+                pass
+            AUDIO_ENABLED = False
+            print("⚠ PyAudio not installed. Audio disabled for better performance.")
+        except Exception as e:
+            # Restore stderr
+            try:
+                os.dup2(stderr, 2)
+                os.close(stderr)
+            except:
+                pass
+            AUDIO_ENABLED = False
+            print(f"⚠ Audio system unavailable: {e}")
+            print("  Dashboard will run without sound for better performance")
+    else:
         # Restore stderr
         try:
             os.dup2(stderr, 2)
             os.close(stderr)
         except:
             pass
-        AUDIO_ENABLED = False
-        print(f"⚠ Audio system unavailable: {e}")
-        print("  Dashboard will run without sound for better performance")
-else:
-    # Restore stderr
-    try:
-        os.dup2(stderr, 2)
-        os.close(stderr)
-    except:
-        pass
-    print("ℹ Audio disabled - Set ENABLE_AUDIO_ATTEMPT=True to enable")
-    
-# Initialize audio state even if disabled
-if not AUDIO_ENABLED:
-    SAMPLE_RATE = 22050
-    engine_stream = None
-    last_rpm_sound = 0
-    turn_signal_time = 0
-    last_turn_signal_blink = False
-
-def generate_engine_sound(rpm, throttle):
-    """Generate realistic engine sound based on RPM and throttle"""
-    if not AUDIO_ENABLED or rpm < 500:
-        return None
-    
-    duration = 0.15
-    samples = int(SAMPLE_RATE * duration)
-    
-    # Base frequency from RPM
-    base_freq = max(20, (rpm / 60.0) * 2)
-    
-    # Use array for efficient audio generation
-    audio_array = array.array('h')  # signed short
-    
-    for i in range(samples):
-        t = i / SAMPLE_RATE
-        
+        print("ℹ Audio disabled - Set ENABLE_AUDIO_ATTEMPT=True to enable")
+
+def to_pcm16(samples, gain):
+    """Convert float samples in [-1, 1] to signed 16-bit PCM bytes"""
+    if np is not None:
+        return (samples * (32767 * gain)).astype("<i2").tobytes()
+    return array.array('h', [int(sample * 32767 * gain) for sample in samples]).tobytes()
+
+def synth_engine(base_freq, volume, samples, phase=0.0, start=0):
+    """Engine tone with harmonics and roughness, vectorized when NumPy is available
+
+    phase and start continue a previous block so the mixer's tone has no seams.
+    """
+    if np is not None:
+        i = np.arange(start, start + samples)
+        phase = phase + (2 * math.pi * base_freq / SAMPLE_RATE) * (i - start)
+
         # Generate engine sound with harmonics
-        fundamental = math.sin(2 * math.pi * base_freq * t)
-        harmonic2 = 0.4 * math.sin(2 * math.pi * base_freq * 2 * t)
-        harmonic3 = 0.2 * math.sin(2 * math.pi * base_freq * 3 * t)
-        
+        wave = np.sin(phase) + 0.4 * np.sin(2 * phase) + 0.2 * np.sin(3 * phase)
+
         # Add roughness
-        noise = ((i * 7919) % 200 - 100) / 1000.0
-        
-        # Combine
-        sample = fundamental + harmonic2 + harmonic3 + noise
-        
-        # Volume based on throttle
-        volume = 0.2 + (throttle / 100.0) * 0.4
-        sample *= volume
-        
-        # Clamp
-        sample = max(-1.0, min(1.0, sample))
-        
-        # Convert to 16-bit int
-        audio_array.append(int(sample * 32767 * 0.8))
-    
-    return audio_array.tobytes()
+        wave += ((i * 7919) % 200 - 100) / 1000.0
 
-def play_engine_sound(rpm, throttle):
-    """Play engine sound"""
-    global engine_stream, last_rpm_sound
-    
-    if not AUDIO_ENABLED or not audio:
-        return
-        
-    if not engine_started or rpm < 500:
-        return
-    
-    # Update every 400 RPM to reduce audio overhead
-    if abs(rpm - last_rpm_sound) < 400:
-        return
-    
-    last_rpm_sound = rpm
-    
-    try:
-        sound_data = generate_engine_sound(rpm, throttle)
-        if sound_data:
-            stream = audio.open(
-                format=pyaudio.paInt16,
-                channels=1,
-                rate=SAMPLE_RATE,
-                output=True,
-                output_device_index=AUDIO_DEVICE,
-                frames_per_buffer=2048
-            )
-            try:
-                stream.write(sound_data)
-            except:
-                pass  # Ignore buffer overflow errors
-            # Close immediately to free the device
+        # Volume based on throttle, then clamp
+        return np.clip(wave * volume, -1.0, 1.0)
+
+    step = 2 * math.pi * base_freq / SAMPLE_RATE
+    sin = math.sin
+    wave = []
+    for i in range(start, start + samples):
+        angle = phase + step * (i - start)
+        sample = sin(angle) + 0.4 * sin(2 * angle) + 0.2 * sin(3 * angle)
+        sample += ((i * 7919) % 200 - 100) / 1000.0
+        wave.append(max(-1.0, min(1.0, sample * volume)))
+    return wave
+
+@functools.lru_cache(maxsize=1)
+def turn_signal_clip():
+    """Turn signal click, synthesized once"""
+    samples = int(SAMPLE_RATE * 0.08)
+    if np is not None:
+        t = np.arange(samples) / SAMPLE_RATE
+        wave = np.exp(-t * 25) * np.sin(2 * math.pi * 900 * t)
+    else:
+        wave = [math.exp(-(i / SAMPLE_RATE) * 25) * math.sin(2 * math.pi * 900 * i / SAMPLE_RATE)
+                for i in range(samples)]
+    return to_pcm16(wave, 0.5)
+
+@functools.lru_cache(maxsize=1)
+def warning_clip():
+    """Warning beep, synthesized once"""
+    samples = int(SAMPLE_RATE * 0.15)
+    if np is not None:
+        wave = np.sin(2 * math.pi * 1200 * np.arange(samples) / SAMPLE_RATE) * 0.5
+    else:
+        wave = [math.sin(2 * math.pi * 1200 * i / SAMPLE_RATE) * 0.5 for i in range(samples)]
+    return to_pcm16(wave, 0.6)
+
+# ================= AUDIO MIXER =================
+def pcm16_to_float(clip):
+    """Signed 16-bit PCM bytes back to float samples for mixing"""
+    if np is not None:
+        return np.frombuffer(clip, dtype="<i2") / 32767.0
+    return [sample / 32767.0 for sample in array.array('h', clip)]
+
+class AudioMixer:
+    """Continuous engine tone with one-shot clips overlaid, rendered block by block
+
+    The UI thread only posts events; render() runs on the audio thread.
+    """
+
+    def __init__(self):
+        self.events = collections.deque()  # append/popleft are atomic across threads
+        self.engine_running = False
+        self.engine_freq = 20.0
+        self.engine_volume = 0.0
+        self.engine_phase = 0.0
+        self.position = 0                  # Samples rendered so far
+        self.voices = []                   # [samples, offset] for clips still playing
+
+    def set_engine(self, rpm, throttle, running):
+        self.events.append(("engine", rpm, throttle, running))
+
+    def play(self, clip):
+        self.events.append(("clip", clip))
+
+    def _drain_events(self):
+        while True:
             try:
-                stream.stop_stream()
-                stream.close()
-            except:
-                pass
-    except Exception as e:
-        pass  # Silently ignore audio errors to prevent spam
+                event = self.events.popleft()
+            except IndexError:
+                return
+            if event[0] == "engine":
+                _, rpm, throttle, running = event
+                self.engine_running = running
+                # Base frequency from RPM, volume from throttle
+                self.engine_freq = max(20, (rpm / 60.0) * 2)
+                self.engine_volume = 0.2 + (throttle / 100.0) * 0.4
+            else:
+                self.voices.append([pcm16_to_float(event[1]), 0])
 
-def play_turn_signal_sound():
-    """Play turn signal click"""
-    global turn_signal_time
-    
-    if not AUDIO_ENABLED or not audio:
-        return
-    
-    current_time = time.time()
-    if current_time - turn_signal_time < 0.3:
-        return
-    
-    turn_signal_time = current_time
-    
-    try:
-        duration = 0.08
-        samples = int(SAMPLE_RATE * duration)
-        
-        audio_array = array.array('h')
-        
-        for i in range(samples):
-            t = i / SAMPLE_RATE
-            envelope = math.exp(-t * 25)
-            sample = envelope * math.sin(2 * math.pi * 900 * t)
-            audio_array.append(int(sample * 32767 * 0.5))
-        
-        sound_data = audio_array.tobytes()
-        
-        stream = audio.open(
+    def render(self, frames):
+        """Mix the next block of audio into signed 16-bit PCM bytes"""
+        self._drain_events()
+
+        if self.engine_running:
+            block = synth_engine(self.engine_freq, self.engine_volume, frames,
+                                 phase=self.engine_phase, start=self.position)
+            self.engine_phase = (self.engine_phase
+                                 + 2 * math.pi * self.engine_freq / SAMPLE_RATE * frames) % (2 * math.pi)
+            block = block * 0.8 if np is not None else [sample * 0.8 for sample in block]
+        else:
+            block = np.zeros(frames) if np is not None else [0.0] * frames
+
+        # Overlay one-shot clips
+        for voice in self.voices:
+            samples, offset = voice
+            chunk = samples[offset:offset + frames]
+            if np is not None:
+                block[:len(chunk)] += chunk
+            else:
+                for i, sample in enumerate(chunk):
+                    block[i] += sample
+            voice[1] = offset + frames
+        self.voices = [voice for voice in self.voices if voice[1] < len(voice[0])]
+        self.position += frames
+
+        if np is not None:
+            block = np.clip(block, -1.0, 1.0)
+        else:
+            block = [max(-1.0, min(1.0, sample)) for sample in block]
+        return to_pcm16(block, 1.0)
+
+class PyAudioOutput:
+    """One long-lived non-blocking PyAudio stream fed by the mixer callback"""
+
+    def __init__(self, mixer):
+        self.mixer = mixer
+        self.stream = audio.open(
             format=pyaudio.paInt16,
             channels=1,
             rate=SAMPLE_RATE,
             output=True,
             output_device_index=AUDIO_DEVICE,
-            frames_per_buffer=2048
+            frames_per_buffer=AUDIO_BLOCK_FRAMES,
+            stream_callback=self._callback
         )
+
+    def _callback(self, in_data, frame_count, time_info, status):
+        try:
+            return (self.mixer.render(frame_count), pyaudio.paContinue)
+        except Exception:
+            return (bytes(2 * frame_count), pyaudio.paContinue)  # Never stall the stream
+
+    def close(self):
         try:
-            stream.write(sound_data)
+            self.stream.stop_stream()
+            self.stream.close()
         except:
-            pass  # Ignore buffer overflow errors
+            pass
+
+class NullOutput:
+    """Pulls blocks from the mixer at real-time pace and discards them"""
+
+    def __init__(self, mixer):
+        self.mixer = mixer
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="audio-output", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        block_time = AUDIO_BLOCK_FRAMES / SAMPLE_RATE
+        next_time = time.perf_counter()
+        while self.running:
+            self.write(self.mixer.render(AUDIO_BLOCK_FRAMES))
+            next_time += block_time
+            delay = next_time - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+    def write(self, data):
+        pass
+
+    def close(self):
+        self.running = False
+        self.thread.join(timeout=1.0)
+
+class WaveFileOutput(NullOutput):
+    """Records the mixed output to a .wav file instead of a sound card"""
+
+    def __init__(self, mixer, path):
+        self.wav = wave.open(path, "wb")
+        self.wav.setnchannels(1)
+        self.wav.setsampwidth(2)
+        self.wav.setframerate(SAMPLE_RATE)
+        super().__init__(mixer)
+
+    def write(self, data):
+        self.wav.writeframes(data)
+
+    def close(self):
+        super().close()
+        self.wav.close()
+
+def close_audio():
+    if audio_output is not None:
+        audio_output.close()
+    if audio is not None:
         try:
-            stream.stop_stream()
-            stream.close()
+            audio.terminate()
         except:
             pass
-    except Exception as e:
-        pass  # Silently ignore audio errors
+
+def play_engine_sound(rpm, throttle):
+    """Keep the mixer's engine tone in step with the vehicle"""
+    if not AUDIO_ENABLED or mixer is None:
+        return
+
+    mixer.set_engine(rpm, throttle, vehicle.engine_started and rpm >= 500)
+
+def play_turn_signal_sound():
+    """Play turn signal click"""
+    global turn_signal_time
+
+    if not AUDIO_ENABLED or mixer is None:
+        return
+
+    current_time = time.time()
+    if current_time - turn_signal_time < 0.3:
+        return
+
+    turn_signal_time = current_time
+    mixer.play(turn_signal_clip())
 
 def play_warning_sound():
     """Play warning beep"""
-    if not AUDIO_ENABLED or not audio:
+    if not AUDIO_ENABLED or mixer is None:
         return
-    
-    try:
-        duration = 0.15
-        samples = int(SAMPLE_RATE * duration)
-        
-        audio_array = array.array('h')
-        
-        for i in range(samples):
-            t = i / SAMPLE_RATE
-            sample = math.sin(2 * math.pi * 1200 * t) * 0.5
-            audio_array.append(int(sample * 32767 * 0.6))
-        
-        sound_data = audio_array.tobytes()
-        
-        stream = audio.open(
-            format=pyaudio.paInt16,
-            channels=1,
-            rate=SAMPLE_RATE,
-            output=True,
-            output_device_index=AUDIO_DEVICE,
-            frames_per_buffer=2048
-        )
-        try:
-            stream.write(sound_data)
-        except:
-            pass  # Ignore buffer overflow errors
-        try:
-            stream.stop_stream()
-            stream.close()
-        except:
-            pass
-    except Exception as e:
-        pass  # Silently ignore audio errors
+
+    mixer.play(warning_clip())
 
 # ================= WINDOW =================
+# The cluster is designed on a W x H reference and scaled to the window's real
+# size, so it fits any panel (--geometry 1280x480) and follows window resizes
 W, H = 1600, 800
 BG = "#000000"
+WINDOW_SIZE = None        # Initial (width, height), None for W x H (--geometry)
+WINDOW_RESIZABLE = True   # Change to False to lock the window size
+RESIZE_SETTLE_MS = 100    # Lay the cluster out again once resizing pauses this long
 
-root = tk.Tk()
-root.title("Interactive Premium Instrument Cluster")
-root.geometry(f"{W}x{H}")
-root.configure(bg=BG)
-root.resizable(False, False)
+# Where each part of the cluster is anchored, as fractions of the window size.
+# Parts keep their shape and are scaled by min(width / W, height / H).
+LAYOUT = {
+    "speedometer": (350 / W, 400 / H),
+    "tachometer": (1250 / W, 400 / H),
+    "center": (800 / W, 400 / H),
+    "indicators": (250 / W, 730 / H),   # First lamp, the rest follow to the right
+    "left_turn": (120 / W, 400 / H),
+    "right_turn": (1480 / W, 400 / H),
+    "controls": ((W - 200) / W, 100 / H),
+    "profile_hud": (0.0, 0.0),
+}
+GAUGE_RADIUS = 240  # Reference units
 
-# Make it look more realistic
-try:
-    root.attributes('-alpha', 0.98)  # Slight transparency for realism
-except:
-    pass
+root = None
+canvas = None
+resize_job = None
+
+def window_size(text):
+    """argparse type for WIDTHxHEIGHT"""
+    try:
+        width, height = (int(n) for n in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got {text!r}")
+    if width < 1 or height < 1:
+        raise argparse.ArgumentTypeError(f"window size must be positive, got {text!r}")
+    return width, height
+
+def build_window(size=None):
+    """Create the Tk window and canvas (tkinter is only imported here)"""
+    global root, canvas, scene
+    import tkinter as tk
+
+    width, height = size or WINDOW_SIZE or (W, H)
+    root = tk.Tk()
+    root.title("Interactive Premium Instrument Cluster")
+    root.geometry(f"{width}x{height}")
+    root.configure(bg=BG)
+    root.resizable(WINDOW_RESIZABLE, WINDOW_RESIZABLE)
+
+    # Make it look more realistic
+    try:
+        root.attributes('-alpha', 0.98)  # Slight transparency for realism
+    except:
+        pass
+
+    canvas = tk.Canvas(root, width=width, height=height, bg=BG, highlightthickness=0)
+    canvas.pack(fill="both", expand=True)
+    scene = Scene(canvas, width, height)
+    canvas.bind("<Configure>", on_configure)
+
+    # Bind keyboard events
+    root.bind("<KeyPress>", on_key_press)
+    root.bind("<KeyRelease>", on_key_release)
+
+def on_configure(event):
+    """Lay the cluster out again once the window has settled at a new size"""
+    global resize_job
+    if resize_job is not None:
+        root.after_cancel(resize_job)
+    resize_job = root.after(RESIZE_SETTLE_MS, resize_scene, event.width, event.height)
+
+def resize_scene(width, height):
+    """Drop every canvas item and build the cluster again at a new size"""
+    global resize_job
+    resize_job = None
+    if (width, height) == (scene.width, scene.height):
+        return
+    canvas.delete("all")
+    reset_scene(width, height)
+    request_frame()
 
-canvas = tk.Canvas(root, width=W, height=H, bg=BG, highlightthickness=0)
-canvas.pack()
+def reset_scene(width=W, height=H):
+    """Start an empty scene on the canvas; the next render() lays the cluster out"""
+    global scene, drawn_version
+    scene = Scene(canvas, width, height)
+    for items in (speedo, tacho, center, turn_items, hud_items):
+        items.clear()
+    indicator_items.clear()
+    drawn_version = None
 
 # ================= STATE =================
-speed = rpm = 0
+# Vehicle state (speed, gear, warnings, held keys, ...) lives in Vehicle objects,
+# see VEHICLE; what's here belongs to the display
 disp_speed = disp_rpm = 0
-gear = "P"
-gear_index = 0  # 0=P, 1=R, 2=N, 3=D
-fuel = 100
-temp = 90
-odo = 42358
-trip = 156.8
-
-# Control states
-throttle = 0  # 0-100
-brake = 0     # 0-100
-engine_started = False
-
-# Warning states
-engine = absw = door = seatbelt = battery = oil_pressure = False
-left = right = hazard = parking_brake = high_beam = tpms = airbag = False
 blink_state = True
-blink_counter = 0
+BLINK_INTERVAL = 0.4  # Seconds per turn signal on/off phase
+last_blink_time = 0.0
+last_frame_time = None
 time_str = "14:23"
-outside_temp = 22
 
-# Key press tracking
-keys_pressed = set()
+can_tx_stats = {"sent": 0, "errors": 0}
 
-# Last CAN send times to avoid flooding
-last_can_send = {}
+# Time source for CAN rate limiting (headless mode swaps in simulated time)
+clock = time.time
 
 # ================= HELPERS =================
 def lerp(a, b, f=0.15):
     return a + (b - a) * f
 
-def send_can(msg_id, data, min_interval=0.05):
-    """Send CAN message with rate limiting"""
-    current_time = time.time()
-    if msg_id not in last_can_send or (current_time - last_can_send[msg_id]) >= min_interval:
-        msg = can.Message(arbitration_id=msg_id, data=data, is_extended_id=False)
-        try:
-            bus.send(msg)
-            last_can_send[msg_id] = current_time
-        except Exception as e:
-            print(f"CAN send error: {e}")
+def lerp_factor(f, k):
+    """Per-tick lerp factor f rescaled to a step k base ticks long"""
+    return 1 - (1 - f) ** k
 
-# ================= PHYSICS SIMULATION =================
-def update_vehicle_physics():
-    """Simulate realistic vehicle behavior with safety bounds"""
-    global speed, rpm, fuel, temp, throttle, brake
-    
-    # Clamp inputs to safe ranges
-    throttle = max(0, min(100, throttle))
-    brake = max(0, min(100, brake))
-    
-    if not engine_started:
-        # Engine off - everything decelerates
-        if speed > 0:
-            speed = max(0, speed - 2)
-        if rpm > 0:
-            rpm = max(0, rpm - 100)
-        return
-    
-    # Calculate target RPM based on throttle and gear
-    if gear == "P" or gear == "N":
-        # In Park/Neutral - RPM based only on throttle
-        target_rpm = 800 + (throttle * 60)  # Idle to 6800 RPM
-        rpm = lerp(rpm, target_rpm, 0.1)
-        # No speed change in P/N
-        if speed > 0:
-            speed = max(0, speed - 1.5)  # Coasting down
-    
-    elif gear == "R":
-        # Reverse gear
-        target_rpm = 800 + (throttle * 50)
-        rpm = lerp(rpm, target_rpm, 0.1)
-        target_speed = (throttle / 100.0) * 40  # Max 40 km/h reverse
-        if brake > 0:
-            speed = max(0, speed - brake * 0.3)
-        else:
-            speed = lerp(speed, target_speed, 0.05)
-    
-    elif gear == "D":
-        # Drive gear - realistic acceleration
-        if brake > 0:
-            # Braking
-            speed = max(0, speed - brake * 0.4)
-            rpm = max(800, rpm - 300)
-        else:
-            # Accelerating or coasting
-            if throttle > 0:
-                # Acceleration based on RPM and gear simulation
-                if speed < 60:
-                    # Low gear (1st-2nd) - faster acceleration
-                    speed += throttle * 0.15
-                    target_rpm = 800 + (speed * 80) + (throttle * 30)
-                elif speed < 120:
-                    # Mid gear (3rd-4th)
-                    speed += throttle * 0.08
-                    target_rpm = 2000 + (speed * 35) + (throttle * 25)
-                else:
-                    # High gear (5th-6th)
-                    speed += throttle * 0.04
-                    target_rpm = 2500 + (speed * 25) + (throttle * 20)
-                
-                target_rpm = min(7800, target_rpm)
-                rpm = lerp(rpm, target_rpm, 0.15)
-            else:
-                # Coasting - slow down gradually
-                speed = max(0, speed - 0.3)
-                # RPM follows speed when coasting
-                if speed > 0:
-                    target_rpm = 800 + (speed * 20)
-                    rpm = lerp(rpm, target_rpm, 0.1)
-                else:
-                    rpm = lerp(rpm, 800, 0.1)
-    
-    # Fuel consumption
-    if engine_started and throttle > 0:
-        consumption = (throttle / 100.0) * 0.002
-        fuel = max(0, fuel - consumption)
-    
-    # Engine temperature
-    if engine_started:
-        target_temp = 90 + (throttle / 100.0) * 15
-        temp = lerp(temp, target_temp, 0.01)
-    else:
-        temp = lerp(temp, outside_temp, 0.005)
-    
-    # Clamp values
-    speed = max(0, min(260, speed))
-    rpm = max(0, min(8000, rpm))
-    
-    # Send values over CAN
-    send_can(0x100, [int(speed)])
-    send_can(0x101, [int(rpm / 100)])
-    send_can(0x103, [int(fuel)])
-    send_can(0x104, [int(temp)])
+# ================= CAN SIGNALS =================
+# One row per signal. Raw values are read from bit `start` (`bits` wide,
+# little-endian unless big_endian, i.e. DBC @1 / @0 numbering), then
+# value = raw * scale + offset clamped to [minimum, maximum]. Enumerated
+# signals map the raw value through `values` instead (out-of-range raw values
+# pick the first entry).
+Signal = collections.namedtuple(
+    "Signal", "msg_id field start bits scale offset minimum maximum values signed big_endian",
+    defaults=(0, 8, 1, 0, None, None, None, False, False))
 
-# ================= KEYBOARD CONTROLS =================
-def on_key_press(event):
-    """Handle key press events"""
-    global throttle, brake, gear, gear_index, engine_started
-    global left, right, hazard, parking_brake, high_beam, door, seatbelt
-    global engine, battery, oil_pressure, absw, tpms, airbag
-    
-    key = event.keysym
-    keys_pressed.add(key)
-    
-    # Engine start/stop
-    if key == "e" or key == "E":
-        engine_started = not engine_started
-        engine = not engine_started  # Warning light when engine off
-        send_can(0x200, [1 if engine else 0])
-        if not engine_started:
-            play_warning_sound()
-    
-    # Gear shifting
-    if key == "g" or key == "G":
-        gear_index = (gear_index + 1) % 4
-        gear = ["P", "R", "N", "D"][gear_index]
-        send_can(0x102, [gear_index])
-    
-    # Turn signals
-    if key == "Left":
-        left = not left
-        if left:
-            right = False
-            play_turn_signal_sound()
-        send_can(0x300, [1 if left else 0])
-        send_can(0x301, [0])
-    
-    if key == "Right":
-        right = not right
-        if right:
-            left = False
-            play_turn_signal_sound()
-        send_can(0x301, [1 if right else 0])
-        send_can(0x300, [0])
-    
-    # Hazard lights
-    if key == "h" or key == "H":
-        hazard = not hazard
-        left = right = hazard
-        if hazard:
-            play_turn_signal_sound()
-        send_can(0x300, [1 if hazard else 0])
-        send_can(0x301, [1 if hazard else 0])
-    
-    # High beam
-    if key == "b" or key == "B":
-        high_beam = not high_beam
-        send_can(0x206, [1 if high_beam else 0])
-    
-    # Parking brake
-    if key == "p" or key == "P":
-        parking_brake = not parking_brake
-        if parking_brake:
-            play_warning_sound()
-        send_can(0x205, [1 if parking_brake else 0])
-    
-    # Door
-    if key == "d" or key == "D":
-        door = not door
-        if door:
-            play_warning_sound()
-        send_can(0x302, [1 if door else 0])
-    
-    # Seatbelt (use 't' key instead to avoid conflict)
-    if key == "t" or key == "T":
-        seatbelt = not seatbelt
-        if seatbelt:
-            play_warning_sound()
-        send_can(0x202, [1 if seatbelt else 0])
+ON_OFF = (False, True)
+GEARS = ("P", "R", "N", "D")
 
-def on_key_release(event):
-    """Handle key release events"""
-    keys_pressed.discard(event.keysym)
-
-def update_controls():
-    """Update throttle and brake based on held keys"""
-    global throttle, brake
-    
-    # Throttle (Up arrow or W)
-    if "Up" in keys_pressed or "w" in keys_pressed or "W" in keys_pressed:
-        throttle = min(100, throttle + 2)
-    else:
-        throttle = max(0, throttle - 3)
-    
-    # Brake (Down arrow or S - but not lowercase 's' to avoid conflict)
-    if "Down" in keys_pressed:
-        brake = min(100, brake + 3)
+# Inputs the dashboard decodes (see CAN_ID_MAP.md)
+CAN_SIGNALS = [
+    # Vehicle data (same encoding as what we send on 0x100-0x104)
+    Signal(0x110, "speed", minimum=0, maximum=260),
+    Signal(0x111, "rpm", scale=100, minimum=0, maximum=8000),
+    Signal(0x112, "gear", values=GEARS),
+    Signal(0x113, "fuel", minimum=0, maximum=100),
+    Signal(0x114, "temp", minimum=0, maximum=150),
+    # High resolution vehicle data
+    Signal(0x115, "speed", bits=16, scale=0.1, minimum=0, maximum=260),
+    Signal(0x116, "rpm", bits=16, minimum=0, maximum=8000),
+    # Warning indicators
+    Signal(0x200, "engine", values=ON_OFF),
+    Signal(0x201, "battery", values=ON_OFF),
+    Signal(0x202, "seatbelt", values=ON_OFF),
+    Signal(0x203, "absw", values=ON_OFF),
+    Signal(0x204, "oil_pressure", values=ON_OFF),
+    Signal(0x205, "parking_brake", values=ON_OFF),
+    Signal(0x206, "high_beam", values=ON_OFF),
+    Signal(0x207, "tpms", values=ON_OFF),
+    Signal(0x208, "airbag", values=ON_OFF),
+    # Turn signals and doors
+    Signal(0x300, "left", values=ON_OFF),
+    Signal(0x301, "right", values=ON_OFF),
+    Signal(0x302, "door", values=ON_OFF),
+]
+
+# Outputs the dashboard sends, encoded from the state field of the same name
+CAN_TX_SIGNALS = [
+    Signal(0x100, "speed", minimum=0, maximum=255),  # Single byte tops out at 255 km/h
+    Signal(0x101, "rpm", scale=100),
+    Signal(0x102, "gear", values=GEARS),
+    Signal(0x103, "fuel"),
+    Signal(0x104, "temp"),
+    Signal(0x200, "engine", values=ON_OFF),
+    Signal(0x201, "battery", values=ON_OFF),
+    Signal(0x202, "seatbelt", values=ON_OFF),
+    Signal(0x203, "absw", values=ON_OFF),
+    Signal(0x204, "oil_pressure", values=ON_OFF),
+    Signal(0x205, "parking_brake", values=ON_OFF),
+    Signal(0x206, "high_beam", values=ON_OFF),
+    Signal(0x207, "tpms", values=ON_OFF),
+    Signal(0x208, "airbag", values=ON_OFF),
+    Signal(0x300, "left", values=ON_OFF),
+    Signal(0x301, "right", values=ON_OFF),
+    Signal(0x302, "door", values=ON_OFF),
+]
+
+# Which powertrain frames to send (--powertrain): "legacy" = one byte per signal on
+# 0x100/0x101/0x103/0x104, "packed" = all four at full resolution on 0x105, "both"
+TX_POWERTRAIN_FRAMES = "legacy"
+LEGACY_POWERTRAIN_IDS = (0x100, 0x101, 0x103, 0x104)
+
+PACKED_TX_SIGNALS = [
+    Signal(0x105, "speed", start=0, bits=16, scale=0.01, minimum=0, maximum=655.35),
+    Signal(0x105, "rpm", start=16, bits=16, minimum=0),
+    Signal(0x105, "fuel", start=32, bits=8, scale=0.5, minimum=0, maximum=100),
+    Signal(0x105, "temp", start=40, bits=8, offset=-40, minimum=-40, maximum=215),
+    # Byte 6: rolling counter, byte 7: checksum (see TX_FRAME_GUARDS)
+]
+PACKED_FRAME_DLCS = {0x105: 8}
+
+INT_FORMATS = {8: "B", 16: "H", 32: "I", 64: "Q"}
+
+def signal_codec(sig):
+    """Raw value reader/writer for one signal and the frame length it needs"""
+    if not sig.big_endian and sig.start % 8 == 0 and sig.bits in INT_FORMATS:
+        # Byte aligned: a precompiled struct does it in one call
+        code = INT_FORMATS[sig.bits]
+        packer = struct.Struct("<" + (code.lower() if sig.signed else code))
+        first = sig.start // 8
+        unpack_from, pack_into = packer.unpack_from, packer.pack_into
+        def read(data):
+            return unpack_from(data, first)[0]
+        def write(buf, raw):
+            pack_into(buf, first, raw)
+        return read, write, first + packer.size
+
+    mask = (1 << sig.bits) - 1
+    sign_bit = 1 << (sig.bits - 1)
+    if sig.big_endian:
+        # DBC gives the MSB in sawtooth numbering; count from the frame's first bit instead
+        msb = (sig.start // 8) * 8 + 7 - sig.start % 8
+        size = (msb + sig.bits - 1) // 8 + 1
+        shift = size * 8 - msb - sig.bits
+        order = "big"
     else:
-        brake = max(0, brake - 4)
+        size = (sig.start + sig.bits - 1) // 8 + 1
+        shift = sig.start
+        order = "little"
+    signed = sig.signed
 
-# Bind keyboard events
-root.bind("<KeyPress>", on_key_press)
-root.bind("<KeyRelease>", on_key_release)
+    def read(data):
+        raw = (int.from_bytes(data[:size], order) >> shift) & mask
+        if signed and raw & sign_bit:
+            raw -= mask + 1
+        return raw
+    def write(buf, raw):
+        word = int.from_bytes(buf[:size], order) & ~(mask << shift)
+        buf[:size] = (word | ((raw & mask) << shift)).to_bytes(size, order)
+    return read, write, size
 
-# ================= SPEEDOMETER =================
-def draw_speedometer(cx, cy, r):
-    # Drop shadow for 3D effect
-    canvas.create_oval(cx-r+4, cy-r+4, cx+r+4, cy+r+4,
-                      outline="", fill="#000000", width=0)
-    
-    # Optimized chrome bezel - fewer rings for performance
-    chrome_rings = [
-        (r+10, "#0a0a0a", 4),
-        (r+6, "#2a2a2a", 3),
-        (r+2, "#3a3a3a", 2),
-    ]
-    for ring_r, color, width in chrome_rings:
-        canvas.create_oval(cx-ring_r, cy-ring_r, cx+ring_r, cy+ring_r,
-                          outline=color, width=width, fill="")
-    
-    # Main gauge background - deep black
-    canvas.create_oval(cx-r, cy-r, cx+r, cy+r,
-                      fill="#000000", outline="", width=0)
-    
-    # Inner shadow ring
-    canvas.create_oval(cx-r+3, cy-r+3, cx+r-3, cy+r-3,
-                      outline="#0a0a0a", width=2)
-    
-    # Optimized illuminated arc - every 2 degrees for performance
-    arc_width = 25
-    for i in range(140, -101, -2):  # Changed from -1 to -2 for better performance
-        angle_deg = i
-        norm = (140 - angle_deg) / 240.0
-        speed_val = norm * 260
-        
-        # Premium color gradient
-        if speed_val <= disp_speed:
-            if speed_val < 60:
-                # Blue zone
-                ratio = speed_val / 60
-                r_val = int(ratio * 30)
-                g_val = int(180 + ratio * 75)
-                b_val = 255
-                color = f"#{r_val:02x}{g_val:02x}{b_val:02x}"
-            elif speed_val < 120:
-                # Cyan to green
-                ratio = (speed_val - 60) / 60
-                r_val = int(30 + ratio * 30)
-                g_val = 255
-                b_val = int(255 - ratio * 155)
-                color = f"#{r_val:02x}{g_val:02x}{b_val:02x}"
-            elif speed_val < 180:
-                # Yellow to orange
-                ratio = (speed_val - 120) / 60
-                r_val = int(60 + ratio * 195)
-                g_val = int(255 - ratio * 100)
-                b_val = int(100 - ratio * 100)
-                color = f"#{r_val:02x}{g_val:02x}{b_val:02x}"
-            else:
-                # Red zone
-                ratio = min(1.0, (speed_val - 180) / 80)
-                color = f"#{255:02x}{int(155-ratio*155):02x}{0:02x}"
+def raw_limits(sig):
+    if sig.signed:
+        return -(1 << (sig.bits - 1)), (1 << (sig.bits - 1)) - 1
+    return 0, (1 << sig.bits) - 1
+
+def compile_signals(signals):
+    """Group a signal table into an ID -> decoder plan dispatch map"""
+    decoders = {}
+    for sig in signals:
+        read, _, end = signal_codec(sig)
+        lo = -math.inf if sig.minimum is None else sig.minimum
+        hi = math.inf if sig.maximum is None else sig.maximum
+        decoders.setdefault(sig.msg_id, []).append(
+            (read, end, sig.field, sig.scale, sig.offset, lo, hi, sig.values))
+    return {msg_id: tuple(plan) for msg_id, plan in decoders.items()}
+
+def compile_encoders(signals, dlcs=None):
+    """Group a signal table into ID -> (frame buffer, encoder plan)"""
+    plans = {}
+    sizes = {}
+    for sig in signals:
+        _, write, end = signal_codec(sig)
+        lo = -math.inf if sig.minimum is None else sig.minimum
+        hi = math.inf if sig.maximum is None else sig.maximum
+        raw_lo, raw_hi = raw_limits(sig)
+        plans.setdefault(sig.msg_id, []).append(
+            (write, sig.field, sig.scale, sig.offset, lo, hi, raw_lo, raw_hi, sig.values))
+        sizes[sig.msg_id] = max(sizes.get(sig.msg_id, 0), end)
+    dlcs = dlcs or {}
+    return {msg_id: (bytearray(max(dlcs.get(msg_id, 0), sizes[msg_id])), tuple(plan))
+            for msg_id, plan in plans.items()}
+
+def field_message_map(signals):
+    """State field -> the output IDs that carry it"""
+    fields = {}
+    for sig in signals:
+        ids = fields.setdefault(sig.field, [])
+        if sig.msg_id not in ids:
+            ids.append(sig.msg_id)
+    return fields
+
+can_decoders = compile_signals(CAN_SIGNALS)
+can_encoders = compile_encoders(CAN_TX_SIGNALS)
+field_messages = field_message_map(CAN_TX_SIGNALS)
+
+def set_powertrain_frames(mode):
+    """Switch the built-in output table between legacy, packed or both powertrain frames"""
+    global CAN_TX_SIGNALS, can_encoders, field_messages
+    signals = [sig for sig in CAN_TX_SIGNALS if sig.msg_id not in PACKED_FRAME_DLCS]
+    if mode == "packed":
+        signals = [sig for sig in signals if sig.msg_id not in LEGACY_POWERTRAIN_IDS]
+    if mode in ("packed", "both"):
+        signals += PACKED_TX_SIGNALS
+    CAN_TX_SIGNALS = signals
+    can_encoders = compile_encoders(signals, PACKED_FRAME_DLCS)
+    field_messages = field_message_map(signals)
+
+def decode_can_message(msg, id_offset=0):
+    """Map an input frame to a list of (state field, value) updates
+
+    id_offset is the receiving vehicle's, so each vehicle on a shared bus only
+    decodes its own IDs.
+    """
+    plan = can_decoders.get(msg.arbitration_id - id_offset)
+    if plan is None:
+        return None
+
+    data = msg.data
+    updates = []
+    for read, end, field, scale, offset, lo, hi, values in plan:
+        # Validate data length
+        if len(data) < end:
+            continue
+        raw = read(data)
+        if values is not None:
+            value = values[raw] if 0 <= raw < len(values) else values[0]
         else:
-            color = "#0d0d0d"
-        
-        rad = math.radians(angle_deg)
-        x1 = cx + math.cos(rad) * (r - arc_width - 2)
-        y1 = cy + math.sin(rad) * (r - arc_width - 2)
-        x2 = cx + math.cos(rad) * (r - 2)
-        y2 = cy + math.sin(rad) * (r - 2)
-        canvas.create_line(x1, y1, x2, y2, fill=color, width=4, capstyle="round")
-    
-    # Tick marks and numbers
-    for spd in range(0, 280, 20):
-        norm = spd / 260.0
-        angle_deg = 140 - (norm * 240)
-        rad = math.radians(angle_deg)
-        
-        if spd % 40 == 0:
-            # Major ticks with shadow
-            x1 = cx + math.cos(rad) * (r - arc_width - 4)
-            y1 = cy + math.sin(rad) * (r - arc_width - 4)
-            x2 = cx + math.cos(rad) * (r - arc_width - 20)
-            y2 = cy + math.sin(rad) * (r - arc_width - 20)
-            canvas.create_line(x1+1, y1+1, x2+1, y2+1, fill="#000000", width=4)
-            canvas.create_line(x1, y1, x2, y2, fill="#ffffff", width=3)
-            
-            # Numbers with shadow for depth
-            tx = cx + math.cos(rad) * (r - arc_width - 42)
-            ty = cy + math.sin(rad) * (r - arc_width - 42)
-            canvas.create_text(tx+1, ty+1, text=str(spd),
-                             fill="#000000", font=("Arial", 17, "bold"))
-            canvas.create_text(tx, ty, text=str(spd),
-                             fill="#f5f5f5", font=("Arial", 17, "bold"))
+            # Add bounds checking for safety
+            value = max(lo, min(hi, raw * scale + offset))
+        updates.append((field, value))
+    return updates or None
+
+def encode_message(msg_id, encoders=None, state=None):
+    """Pack a vehicle's state (the focused one by default) into the ID's frame buffer"""
+    buf, plan = (encoders or can_encoders)[msg_id]
+    if state is None:
+        state = vehicle
+    for write, field, scale, offset, lo, hi, raw_lo, raw_hi, values in plan:
+        value = getattr(state, field)
+        if values is not None:
+            raw = values.index(value) if value in values else 0
         else:
-            # Minor ticks
-            x1 = cx + math.cos(rad) * (r - arc_width - 4)
-            y1 = cy + math.sin(rad) * (r - arc_width - 4)
-            x2 = cx + math.cos(rad) * (r - arc_width - 12)
-            y2 = cy + math.sin(rad) * (r - arc_width - 12)
-            canvas.create_line(x1, y1, x2, y2, fill="#888888", width=2)
-    
-    # Premium needle with realistic appearance
-    norm = min(1.0, disp_speed / 260.0)
-    needle_angle = 140 - (norm * 240)
-    rad = math.radians(needle_angle)
-    
-    needle_length = r - 32
-    nx = cx + math.cos(rad) * needle_length
-    ny = cy + math.sin(rad) * needle_length
-    
-    # Needle shadow
-    canvas.create_line(cx+3, cy+3, nx+3, ny+3, fill="#000000", width=6, capstyle="round")
-    
-    # Optimized needle - fewer layers
-    if disp_speed > 100:
-        # Glow at high speed
-        canvas.create_line(cx, cy, nx, ny, fill="#ff6600", width=8)
-    
-    # Main needle body - simplified gradient
-    canvas.create_line(cx, cy, nx, ny, fill="#cc0000", width=5, capstyle="round")
-    canvas.create_line(cx, cy, nx, ny, fill="#ff0000", width=3, capstyle="round")
-    
-    # Needle center cap - metallic appearance
-    canvas.create_oval(cx-16, cy-16, cx+16, cy+16, fill="#1a1a1a", outline="#444444", width=2)
-    canvas.create_oval(cx-12, cy-12, cx+12, cy+12, fill="#2a2a2a", outline="#555555", width=1)
-    canvas.create_oval(cx-8, cy-8, cx+8, cy+8, fill="#3a3a3a", outline="")
-    canvas.create_oval(cx-4, cy-4, cx+4, cy+4, fill="#555555", outline="")
-    # Highlight for metallic effect
-    canvas.create_oval(cx-3, cy-6, cx+1, cy-2, fill="#888888", outline="")
-    
-    # Digital display with glow
-    speed_int = int(disp_speed)
-    
-    # Outer glow
-    canvas.create_text(cx+3, cy-17, text=str(speed_int),
-                      fill="#001a33", font=("Arial", 95, "bold"))
-    # Inner glow
-    canvas.create_text(cx+1, cy-19, text=str(speed_int),
-                      fill="#0088cc", font=("Arial", 93, "bold"))
-    # Main display
-    canvas.create_text(cx, cy-20, text=str(speed_int),
-                      fill="#00ffff", font=("Arial", 90, "bold"))
-    
-    # Unit label
-    canvas.create_text(cx, cy+42, text="km/h",
-                      fill="#a0a0a0", font=("Arial", 17))
-    
-    # Bottom label
-    canvas.create_text(cx, cy+r-46, text="SPEED",
-                      fill="#7a7a7a", font=("Arial", 12, "bold"))
+            # Truncate like int(), but don't let float error knock 0.29 / 0.01 down to 28
+            raw = int((max(lo, min(hi, value)) - offset) / scale + 1e-9)
+        write(buf, max(raw_lo, min(raw_hi, raw)))
+    return buf
 
-# ================= TACHOMETER =================
-def draw_tachometer(cx, cy, r):
-    # Drop shadow for 3D effect
-    canvas.create_oval(cx-r+4, cy-r+4, cx+r+4, cy+r+4,
-                      outline="", fill="#000000", width=0)
-    
-    # Optimized chrome bezel - fewer rings for performance
-    chrome_rings = [
-        (r+10, "#0a0a0a", 4),
-        (r+6, "#2a2a2a", 3),
-        (r+2, "#3a3a3a", 2),
-    ]
-    for ring_r, color, width in chrome_rings:
-        canvas.create_oval(cx-ring_r, cy-ring_r, cx+ring_r, cy+ring_r,
-                          outline=color, width=width, fill="")
-    
-    # Main gauge background - deep black
-    canvas.create_oval(cx-r, cy-r, cx+r, cy+r,
-                      fill="#000000", outline="", width=0)
-    
-    # Inner shadow ring
-    canvas.create_oval(cx-r+3, cy-r+3, cx+r-3, cy+r-3,
-                      outline="#0a0a0a", width=2)
-    
-    # Optimized illuminated arc - every 2 degrees for performance
-    arc_width = 25
-    for i in range(40, 281, 2):  # Changed from 1 to 2 for better performance
-        angle_deg = i
-        norm = (angle_deg - 40) / 240.0
-        rpm_val = norm * 8000
-        
-        # Premium color gradient matching RPM zones
-        if rpm_val <= disp_rpm:
-            if rpm_val < 2500:
-                # Green zone
-                ratio = rpm_val / 2500
-                r_val = int(ratio * 50)
-                g_val = 255
-                b_val = int(150 - ratio * 50)
-                color = f"#{r_val:02x}{g_val:02x}{b_val:02x}"
-            elif rpm_val < 5000:
-                # Yellow zone
-                ratio = (rpm_val - 2500) / 2500
-                r_val = int(50 + ratio * 205)
-                g_val = 255
-                b_val = int(100 - ratio * 100)
-                color = f"#{r_val:02x}{g_val:02x}{b_val:02x}"
-            elif rpm_val < 6500:
-                # Orange zone
-                ratio = (rpm_val - 5000) / 1500
-                r_val = 255
-                g_val = int(255 - ratio * 100)
-                b_val = 0
-                color = f"#{r_val:02x}{g_val:02x}{b_val:02x}"
-            else:
-                # Red zone
-                ratio = min(1.0, (rpm_val - 6500) / 1500)
-                r_val = 255
-                g_val = int(155 - ratio * 155)
-                b_val = 0
-                color = f"#{r_val:02x}{g_val:02x}{b_val:02x}"
+# ================= DBC IMPORT =================
+# Load signal tables from a DBC instead of the built-in ones (--dbc)
+DBC_FILE = None
+DBC_NODE = "Dashboard"  # Our node: we send its messages and decode the signals it receives
+DBC_CACHE = True        # Keep the parsed DBC in a pickled sidecar (<file>.pickle)
+DBC_CACHE_VERSION = 1
+
+# DBC signal name -> dashboard state field (names used by dashboard.dbc)
+DBC_BINDINGS = {
+    "VehicleSpeed": "speed", "EngineSpeed": "rpm", "GearPosition": "gear",
+    "FuelLevel": "fuel", "CoolantTemp": "temp",
+    "SpeedInput": "speed", "RpmInput": "rpm", "GearInput": "gear",
+    "FuelInput": "fuel", "TempInput": "temp",
+    "SpeedInputHiRes": "speed", "RpmInputHiRes": "rpm",
+    "CheckEngine": "engine", "BatteryWarning": "battery", "SeatbeltWarning": "seatbelt",
+    "AbsWarning": "absw", "OilPressureWarning": "oil_pressure",
+    "ParkingBrake": "parking_brake", "HighBeam": "high_beam", "TpmsWarning": "tpms",
+    "AirbagWarning": "airbag", "LeftTurn": "left", "RightTurn": "right", "DoorAjar": "door",
+}
+
+# Enumerated state fields: the raw signal value indexes these
+FIELD_VALUES = {
+    "gear": GEARS, "engine": ON_OFF, "battery": ON_OFF, "seatbelt": ON_OFF,
+    "absw": ON_OFF, "oil_pressure": ON_OFF, "parking_brake": ON_OFF,
+    "high_beam": ON_OFF, "tpms": ON_OFF, "airbag": ON_OFF,
+    "left": ON_OFF, "right": ON_OFF, "door": ON_OFF,
+}
+
+DBC_MESSAGE = re.compile(r"BO_\s+(\d+)\s+(\w+)\s*:\s*(\d+)\s+(\w+)")
+DBC_SIGNAL = re.compile(
+    r'SG_\s+(\w+)\s*(M|m\d+M?)?\s*:\s*(\d+)\|(\d+)@([01])([+-])\s*'
+    r'\(([^,]+),([^)]+)\)\s*\[([^|]*)\|([^\]]*)\]\s*"[^"]*"\s*(.*)')
+DBC_CYCLE_TIME = re.compile(r'BA_\s+"GenMsgCycleTime"\s+BO_\s+(\d+)\s+(\d+)\s*;')
+
+def parse_dbc(text):
+    """Messages, signals and cycle times from DBC text
+
+    Returns plain tuples (so the pickle cache doesn't depend on this script):
+    [(id, name, dlc, sender, cycle_ms, [(name, start, bits, big_endian, signed,
+    scale, offset, minimum, maximum, receivers), ...]), ...]
+    Multiplexed signals are skipped.
+    """
+    messages = []
+    cycles = {}
+    current = None
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("BO_ "):
+            m = DBC_MESSAGE.match(line)
+            current = None
+            if m:
+                current = [int(m.group(1)), m.group(2), int(m.group(3)), m.group(4), []]
+                messages.append(current)
+        elif line.startswith("SG_ ") and current is not None:
+            m = DBC_SIGNAL.match(line)
+            if not m or (m.group(2) or "").startswith("m"):
+                continue
+            minimum, maximum = float(m.group(9) or 0), float(m.group(10) or 0)
+            if minimum == maximum == 0:
+                minimum = maximum = None  # [0|0] means no range given
+            receivers = tuple(r for r in re.split(r"[\s,]+", m.group(11)) if r)
+            current[4].append((m.group(1), int(m.group(3)), int(m.group(4)),
+                               m.group(5) == "0", m.group(6) == "-",
+                               float(m.group(7)), float(m.group(8)),
+                               minimum, maximum, receivers))
         else:
-            color = "#0d0d0d"
-        
-        rad = math.radians(angle_deg)
-        x1 = cx + math.cos(rad) * (r - arc_width - 2)
-        y1 = cy + math.sin(rad) * (r - arc_width - 2)
-        x2 = cx + math.cos(rad) * (r - 2)
-        y2 = cy + math.sin(rad) * (r - 2)
-        canvas.create_line(x1, y1, x2, y2, fill=color, width=4, capstyle="round")
-    
-    # Redline marker - prominent red indicator
-    redline_norm = 6500 / 8000.0
-    redline_angle = 40 + (redline_norm * 240)
-    rad = math.radians(redline_angle)
-    x1 = cx + math.cos(rad) * (r - arc_width - 4)
-    y1 = cy + math.sin(rad) * (r - arc_width - 4)
-    x2 = cx + math.cos(rad) * (r - arc_width - 28)
-    y2 = cy + math.sin(rad) * (r - arc_width - 28)
-    canvas.create_line(x1+1, y1+1, x2+1, y2+1, fill="#330000", width=7)
-    canvas.create_line(x1, y1, x2, y2, fill="#ff0000", width=6)
-    
-    # Tick marks and numbers
+            m = DBC_CYCLE_TIME.match(line)
+            if m:
+                cycles[int(m.group(1))] = int(m.group(2))
+            if line and not line.startswith("SG_"):
+                current = None
+
+    return [(msg_id, name, dlc, sender, cycles.get(msg_id, 0), tuple(signals))
+            for msg_id, name, dlc, sender, signals in messages]
+
+def load_dbc(path):
+    """Parse a DBC, reusing the pickled sidecar while the file is unchanged"""
+    stat = os.stat(path)
+    key = (DBC_CACHE_VERSION, stat.st_mtime_ns, stat.st_size)
+    cache_path = path + ".pickle"
+    if DBC_CACHE:
+        try:
+            with open(cache_path, "rb") as f:
+                cached = pickle.load(f)
+            if cached["key"] == key:
+                return cached["messages"]
+        except Exception:
+            pass  # Missing or stale cache, parse the DBC
+
+    with open(path, encoding="latin-1") as f:
+        messages = parse_dbc(f.read())
+
+    if DBC_CACHE:
+        try:
+            with open(cache_path, "wb") as f:
+                pickle.dump({"key": key, "messages": messages}, f, pickle.HIGHEST_PROTOCOL)
+        except OSError:
+            pass  # Read-only location, just parse next time
+    return messages
+
+def dbc_signal_tables(messages, node=DBC_NODE, bindings=DBC_BINDINGS):
+    """Bound input and output Signal rows, DLCs and cycle times for our node"""
+    rx, tx = [], []
+    dlcs, cycle_times = {}, {}
+    for msg_id, name, dlc, sender, cycle_ms, signals in messages:
+        msg_id &= 0x1FFFFFFF  # Bit 31 only flags an extended ID
+        for sig_name, start, bits, big_endian, signed, scale, offset, lo, hi, receivers in signals:
+            field = bindings.get(sig_name)
+            if field is None:
+                continue
+            values = FIELD_VALUES.get(field)
+            sig = Signal(msg_id, field, start, bits, scale, offset,
+                         None if values else lo, None if values else hi,
+                         values, signed, big_endian)
+            if node in receivers:
+                rx.append(sig)
+            if sender == node:
+                tx.append(sig)
+                dlcs[msg_id] = dlc
+                cycle_times[msg_id] = cycle_ms / 1000 if cycle_ms else None
+    return rx, tx, dlcs, cycle_times
+
+def use_dbc(path):
+    """Replace the built-in signal tables with the ones bound from a DBC"""
+    global CAN_SIGNALS, CAN_TX_SIGNALS, TX_CYCLE_TIMES, can_decoders, can_encoders, field_messages
+    messages = load_dbc(path)
+    rx, tx, dlcs, cycle_times = dbc_signal_tables(messages)
+    CAN_SIGNALS, CAN_TX_SIGNALS, TX_CYCLE_TIMES = rx, tx, cycle_times
+    can_decoders = compile_signals(rx)
+    can_encoders = compile_encoders(tx, dlcs)
+    field_messages = field_message_map(tx)
+    for v in vehicles:
+        v.tx = TxScheduler(cycle_times, v.bus, v.id_offset)
+    print(f"✓ DBC {path}: {len(messages)} messages, "
+          f"{len(rx)} input / {len(tx)} output signals bound")
+
+# ================= CAN TRANSMIT =================
+CAN_BITRATE = 500000  # Only used for the bus load estimate
+
+# Set to True to hand the cyclic IDs to bus.send_periodic() (the socketcan
+# broadcast manager times them in the kernel; payloads are updated with modify_data)
+TX_PERIODIC_MODE = False
+
+# Cycle time per ID in seconds, None = sent on change only (see CAN_ID_MAP.md)
+TX_CYCLE_TIMES = {
+    0x100: 0.05,  # Speed
+    0x101: 0.05,  # RPM
+    0x102: None,  # Gear
+    0x103: 0.05,  # Fuel
+    0x104: 0.05,  # Temperature
+    0x105: 0.05,  # Packed powertrain (--powertrain packed/both)
+    0x200: None,  # Check engine
+    0x201: None,  # Battery
+    0x202: None,  # Seatbelt
+    0x203: None,  # ABS
+    0x204: None,  # Oil pressure
+    0x205: None,  # Parking brake
+    0x206: None,  # High beam
+    0x207: None,  # TPMS
+    0x208: None,  # Airbag
+    0x300: None,  # Left turn
+    0x301: None,  # Right turn
+    0x302: None,  # Door
+}
+
+# Frames protected by a rolling counter and checksum: ID -> (counter byte, checksum byte).
+# The counter advances on every transmitted frame; the checksum is the sum of all
+# other bytes modulo 256.
+TX_FRAME_GUARDS = {0x105: (6, 7)}
+
+def seal_frame(data, guard, count):
+    """Write the counter and checksum bytes into a frame payload"""
+    counter_at, checksum_at = guard
+    data[counter_at] = count & 0xFF
+    data[checksum_at] = 0
+    data[checksum_at] = sum(data) & 0xFF
+
+class TxStats:
+    """Achieved period and jitter for one ID (running mean/variance)"""
+    __slots__ = ("frames", "dlc", "last", "count", "mean", "m2", "max_period")
+
+    def __init__(self):
+        self.frames = 0
+        self.dlc = 0
+        self.last = None
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.max_period = 0.0
+
+    def record(self, now, dlc):
+        self.frames += 1
+        self.dlc = dlc
+        if self.last is not None:
+            period = now - self.last
+            self.count += 1
+            delta = period - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (period - self.mean)
+            self.max_period = max(self.max_period, period)
+        self.last = now
+
+    def jitter(self):
+        return math.sqrt(self.m2 / self.count) if self.count > 1 else 0.0
+
+class TxScheduler:
+    """Sends periodic IDs on their cycle and queued event frames, once per tick
+
+    Every ID owns one preallocated can.Message whose payload is updated in place.
+    IDs are kept as in the signal tables; frames go out with id_offset added, on
+    `bus` (None = the module-level bus).
+    """
+
+    def __init__(self, cycle_times, bus=None, id_offset=0):
+        self.cycle_times = dict(cycle_times)
+        self.bus = bus
+        self.id_offset = id_offset
+        self.messages = {}
+        self.next_due = {}  # Periodic IDs that have data, -> next send time
+        self.events = []    # IDs with an event-triggered send pending
+        self.batch = []
+        self.stats = {}
+        self.start_time = None
+        self.use_bus_periodic = False
+        self.tasks = {}     # Cyclic IDs timed by the bus -> send_periodic task
+        self.dirty = set()  # Cyclic task IDs whose payload changed since the last tick
+        self.counters = {}  # Guarded IDs -> rolling counter of the next frame
+        for msg_id in self.cycle_times:
+            self._message(msg_id)
+
+    def _message(self, msg_id):
+        msg = self.messages.get(msg_id)
+        if msg is None:
+            can_id = msg_id + self.id_offset
+            msg = can.Message(arbitration_id=can_id, data=bytearray(1), is_extended_id=can_id > 0x7FF)
+            self.messages[msg_id] = msg
+            self.stats[msg_id] = TxStats()
+            self.cycle_times.setdefault(msg_id, None)
+        return msg
+
+    def update(self, msg_id, data):
+        """Set the payload sent on the ID's next cycle"""
+        msg = self._message(msg_id)
+        guard = TX_FRAME_GUARDS.get(msg_id)
+        if guard is not None and len(data) == len(msg.data):
+            # Counter/checksum are filled in at send time; ignore them here
+            data = bytearray(data)
+            for i in guard:
+                data[i] = msg.data[i]
+        data = bytes(data)
+        if msg.data != data:
+            msg.data[:] = data
+            msg.dlc = len(data)
+            if msg_id in self.tasks:
+                self.dirty.add(msg_id)
+        if self.cycle_times[msg_id] is not None and msg_id not in self.next_due \
+                and msg_id not in self.tasks:
+            if self.use_bus_periodic and self._start_task(msg_id):
+                return
+            self.next_due[msg_id] = 0.0  # First frame goes out on the next tick
+
+    def _start_task(self, msg_id):
+        """Register a cyclic ID with bus.send_periodic; False if the bus can't"""
+        msg = self.messages[msg_id]
+        task_msg = can.Message(arbitration_id=msg.arbitration_id, data=self._sealed(msg_id, msg.data),
+                               is_extended_id=msg.is_extended_id)
+        try:
+            self.tasks[msg_id] = self._bus().send_periodic(task_msg, self.cycle_times[msg_id])
+            if recorder is not None:
+                recorder.record(clock(), task_msg, False)
+            return True
+        except Exception as e:
+            print(f"⚠ send_periodic unavailable for 0x{msg_id:03X} ({e}), timing it in Python")
+            self.use_bus_periodic = False
+            return False
+
+    def _bus(self):
+        return self.bus if self.bus is not None else bus
+
+    def _sealed(self, msg_id, data):
+        """Payload with the next counter/checksum applied, if the ID is guarded"""
+        guard = TX_FRAME_GUARDS.get(msg_id)
+        if guard is not None:
+            count = self.counters.get(msg_id, 0)
+            seal_frame(data, guard, count)
+            self.counters[msg_id] = (count + 1) & 0xFF
+        return bytes(data)
+
+    def stop(self):
+        """Stop any cyclic tasks running on the bus"""
+        for task in self.tasks.values():
+            try:
+                task.stop()
+            except Exception:
+                pass
+
+    def trigger(self, msg_id, data):
+        """Update the payload and send it on the next tick regardless of cycle"""
+        self.update(msg_id, data)
+        if msg_id not in self.events:
+            self.events.append(msg_id)
+
+    def tick(self, now):
+        """Send every due periodic frame plus pending event frames as one batch"""
+        if self.start_time is None:
+            self.start_time = now
+
+        # Cyclic tasks keep their own timing; only push changed payloads
+        # (the counter of a guarded ID then advances per update, not per frame).
+        # The recorder gets each payload once, when it is pushed.
+        for msg_id in self.dirty:
+            msg = self.messages[msg_id]
+            task_msg = can.Message(arbitration_id=msg.arbitration_id, data=self._sealed(msg_id, msg.data),
+                                   is_extended_id=msg.is_extended_id)
+            try:
+                self.tasks[msg_id].modify_data(task_msg)
+                if recorder is not None:
+                    recorder.record(now, task_msg, False)
+            except Exception as e:
+                can_tx_stats["errors"] += 1
+                print(f"CAN periodic update error: {e}")
+        self.dirty.clear()
+
+        batch = self.batch
+        batch.clear()
+        for msg_id, due in self.next_due.items():
+            if now >= due - 1e-6:  # Tolerate float drift between cycle and step sizes
+                batch.append(msg_id)
+                cycle = self.cycle_times[msg_id]
+                due = due + cycle if due else now + cycle
+                self.next_due[msg_id] = due if due > now else now + cycle  # Resync after a stall
+        for msg_id in self.events:
+            if msg_id not in batch:
+                batch.append(msg_id)
+        self.events.clear()
+
+        counters = self.counters
+        send = self._bus().send
+        for msg_id in batch:
+            msg = self.messages[msg_id]
+            guard = TX_FRAME_GUARDS.get(msg_id)
+            if guard is not None:
+                count = counters.get(msg_id, 0)
+                seal_frame(msg.data, guard, count)
+                counters[msg_id] = (count + 1) & 0xFF
+            try:
+                send(msg)
+                self.stats[msg_id].record(now, msg.dlc)
+                if recorder is not None:
+                    recorder.record(now, msg, False)
+                can_tx_stats["sent"] += 1
+            except Exception as e:
+                can_tx_stats["errors"] += 1
+                print(f"CAN send error: {e}")
+
+    def report(self, now):
+        """Per-ID achieved period/jitter and the estimated bus load"""
+        elapsed = now - self.start_time if self.start_time is not None else 0.0
+        if elapsed <= 0:
+            return "CAN tx: nothing sent"
+
+        lines = ["CAN tx:  ID    frames   rate Hz   period ms   jitter ms   max ms"]
+        bits = 0
+        for msg_id in sorted(self.stats):
+            stat = self.stats[msg_id]
+            if msg_id in self.tasks:
+                cycle = self.cycle_times[msg_id]
+                bits += elapsed / cycle * (47 + 8 * self.messages[msg_id].dlc)
+                lines.append(f"        {msg_id + self.id_offset:03X}   cyclic task on the bus "
+                             f"every {cycle * 1000:.1f} ms")
+                continue
+            if stat.frames == 0:
+                continue
+            # Standard frame: ~47 bits of overhead plus the payload, before stuffing
+            bits += stat.frames * (47 + 8 * stat.dlc)
+            period = f"{stat.mean * 1000:9.1f}" if stat.count else f"{'-':>9}"
+            lines.append(f"        {msg_id + self.id_offset:03X} {stat.frames:9d} {stat.frames / elapsed:9.1f}"
+                         f"   {period}   {stat.jitter() * 1000:9.2f} {stat.max_period * 1000:8.1f}")
+        load = bits / elapsed / CAN_BITRATE * 100
+        lines.append(f"        bus load ~{load:.2f}% of {CAN_BITRATE // 1000} kbit/s over {elapsed:.1f} s")
+        return "\n".join(lines)
+
+def send_can(msg_id, data):
+    """Event-triggered send of a state change by the focused vehicle (goes out on the next tick)"""
+    vehicle.tx.trigger(msg_id, data)
+
+# ================= PHYSICS SIMULATION =================
+# The tuning constants below are per base tick (the original 40 ms frame);
+# every step scales them by k = dt / BASE_TICK so behavior is rate-independent
+BASE_TICK = 0.04
+
+# ================= VEHICLE =================
+# Everything one simulated car owns: state, held keys, physics and its CAN
+# endpoints. The window shows and the keyboard drives the focused `vehicle`;
+# every vehicle in `vehicles` is stepped by the same loop (--vehicles N).
+VEHICLE_ID_STRIDE = 0x1000  # ID offset between vehicles sharing a channel (extended IDs)
+
+# Fields the cluster shows. Writing a new value to one gives it a new version,
+# so the window redraws only the widgets subscribed to what changed.
+DISPLAY_FIELDS = frozenset((
+    "speed", "rpm", "gear", "fuel", "temp", "odo", "trip", "engine_started",
+    "engine", "absw", "door", "seatbelt", "battery", "oil_pressure",
+    "left", "right", "hazard", "parking_brake", "high_beam", "tpms", "airbag",
+))
+
+class Vehicle:
+    """State, controls and physics of one simulated vehicle
+
+    bus None means the module-level bus; id_offset is added to every ID the
+    vehicle sends and subtracted from every ID it receives.
+    """
+    __slots__ = ("name", "bus", "id_offset", "tx", "version", "versions",
+                 "speed", "rpm", "prev_speed", "prev_rpm",
+                 "gear", "gear_index", "fuel", "temp", "odo", "trip", "outside_temp",
+                 "throttle", "brake", "engine_started",
+                 "engine", "absw", "door", "seatbelt", "battery", "oil_pressure",
+                 "left", "right", "hazard", "parking_brake", "high_beam", "tpms", "airbag",
+                 "keys_pressed")
+
+    def __init__(self, name="vehicle", bus=None, id_offset=0):
+        self.version = 0    # Bumped by every change to a DISPLAY_FIELDS field
+        self.versions = {}  # DISPLAY_FIELDS field -> version of its last change
+        self.name = name
+        self.bus = bus
+        self.id_offset = id_offset
+        self.tx = TxScheduler(TX_CYCLE_TIMES, bus, id_offset)
+
+        self.speed = self.rpm = 0
+        self.prev_speed = self.prev_rpm = 0  # State before the latest step, for interpolation
+        self.gear = "P"
+        self.gear_index = 0  # 0=P, 1=R, 2=N, 3=D
+        self.fuel = 100
+        self.temp = 90
+        self.odo = 42358
+        self.trip = 156.8
+        self.outside_temp = 22
+
+        # Control states
+        self.throttle = 0  # 0-100
+        self.brake = 0     # 0-100
+        self.engine_started = False
+
+        # Warning states
+        self.engine = self.absw = self.door = self.seatbelt = False
+        self.battery = self.oil_pressure = False
+        self.left = self.right = self.hazard = self.parking_brake = False
+        self.high_beam = self.tpms = self.airbag = False
+
+        # Key press tracking
+        self.keys_pressed = set()
+
+    def __repr__(self):
+        return f"<Vehicle {self.name} +0x{self.id_offset:X}>"
+
+    def __setattr__(self, name, value, _set=object.__setattr__, _fields=DISPLAY_FIELDS):
+        if name in _fields and getattr(self, name, None) != value:
+            version = self.version + 1
+            _set(self, "version", version)
+            self.versions[name] = version
+        _set(self, name, value)
+
+    def changes_since(self, version):
+        """DISPLAY_FIELDS fields given a new value after `version`"""
+        if version == self.version:
+            return []
+        return [name for name, changed in self.versions.items() if changed > version]
+
+    # ---- CAN output ----
+    def send_fields(self, *fields):
+        """Event-triggered send of the output frames carrying these state fields"""
+        for field in fields:
+            for msg_id in field_messages.get(field, ()):
+                self.tx.trigger(msg_id, encode_message(msg_id, state=self))
+
+    def publish(self, now):
+        """Refresh the payloads of the periodic output frames due at `now`
+
+        Frames timed in Python are only encoded on the tick that sends them;
+        bus-timed cyclic tasks are refreshed every step.
+        """
+        tx = self.tx
+        cycle_times = tx.cycle_times
+        next_due = tx.next_due
+        for msg_id in can_encoders:
+            if cycle_times.get(msg_id) is None:
+                continue
+            due = next_due.get(msg_id)
+            if due is not None and now < due - 1e-6:  # Same tolerance as TxScheduler.tick
+                continue
+            tx.update(msg_id, encode_message(msg_id, state=self))
+
+    def step(self, dt, now):
+        """Advance controls and physics by one fixed step and send what's due"""
+        self.prev_speed, self.prev_rpm = self.speed, self.rpm
+        self.update_controls(dt)
+        self.update_physics(dt)
+        self.publish(now)
+        self.tx.tick(now)
+
+    # ---- Physics (tuning constants are per BASE_TICK, see above) ----
+    def update_physics(self, dt=BASE_TICK):
+        """Simulate realistic vehicle behavior with safety bounds"""
+        k = dt / BASE_TICK
+
+        # Clamp inputs to safe ranges
+        throttle = self.throttle = max(0, min(100, self.throttle))
+        brake = self.brake = max(0, min(100, self.brake))
+        speed, rpm = self.speed, self.rpm
+
+        if not self.engine_started:
+            # Engine off - everything decelerates
+            if speed > 0:
+                self.speed = max(0, speed - 2 * k)
+            if rpm > 0:
+                self.rpm = max(0, rpm - 100 * k)
+            return
+
+        # Calculate target RPM based on throttle and gear
+        gear = self.gear
+        if gear == "P" or gear == "N":
+            # In Park/Neutral - RPM based only on throttle
+            target_rpm = 800 + (throttle * 60)  # Idle to 6800 RPM
+            rpm = lerp(rpm, target_rpm, lerp_factor(0.1, k))
+            # No speed change in P/N
+            if speed > 0:
+                speed = max(0, speed - 1.5 * k)  # Coasting down
+
+        elif gear == "R":
+            # Reverse gear
+            target_rpm = 800 + (throttle * 50)
+            rpm = lerp(rpm, target_rpm, lerp_factor(0.1, k))
+            target_speed = (throttle / 100.0) * 40  # Max 40 km/h reverse
+            if brake > 0:
+                speed = max(0, speed - brake * 0.3 * k)
+            else:
+                speed = lerp(speed, target_speed, lerp_factor(0.05, k))
+
+        elif gear == "D":
+            # Drive gear - realistic acceleration
+            if brake > 0:
+                # Braking
+                speed = max(0, speed - brake * 0.4 * k)
+                rpm = max(800, rpm - 300 * k)
+            else:
+                # Accelerating or coasting
+                if throttle > 0:
+                    # Acceleration based on RPM and gear simulation
+                    if speed < 60:
+                        # Low gear (1st-2nd) - faster acceleration
+                        speed += throttle * 0.15 * k
+                        target_rpm = 800 + (speed * 80) + (throttle * 30)
+                    elif speed < 120:
+                        # Mid gear (3rd-4th)
+                        speed += throttle * 0.08 * k
+                        target_rpm = 2000 + (speed * 35) + (throttle * 25)
+                    else:
+                        # High gear (5th-6th)
+                        speed += throttle * 0.04 * k
+                        target_rpm = 2500 + (speed * 25) + (throttle * 20)
+
+                    target_rpm = min(7800, target_rpm)
+                    rpm = lerp(rpm, target_rpm, lerp_factor(0.15, k))
+                else:
+                    # Coasting - slow down gradually
+                    speed = max(0, speed - 0.3 * k)
+                    # RPM follows speed when coasting
+                    if speed > 0:
+                        target_rpm = 800 + (speed * 20)
+                        rpm = lerp(rpm, target_rpm, lerp_factor(0.1, k))
+                    else:
+                        rpm = lerp(rpm, 800, lerp_factor(0.1, k))
+
+        # Fuel consumption
+        if self.engine_started and throttle > 0:
+            consumption = (throttle / 100.0) * 0.002 * k
+            self.fuel = max(0, self.fuel - consumption)
+
+        # Engine temperature
+        if self.engine_started:
+            target_temp = 90 + (throttle / 100.0) * 15
+            self.temp = lerp(self.temp, target_temp, lerp_factor(0.01, k))
+        else:
+            self.temp = lerp(self.temp, self.outside_temp, lerp_factor(0.005, k))
+
+        # Clamp values
+        self.speed = max(0, min(260, speed))
+        self.rpm = max(0, min(8000, rpm))
+
+    # ---- Controls ----
+    def press(self, key):
+        """Handle a key press"""
+        self.keys_pressed.add(key)
+
+        # Engine start/stop
+        if key == "e" or key == "E":
+            self.engine_started = not self.engine_started
+            self.engine = not self.engine_started  # Warning light when engine off
+            self.send_fields("engine")
+            if not self.engine_started:
+                play_warning_sound()
+
+        # Gear shifting
+        if key == "g" or key == "G":
+            self.gear_index = (self.gear_index + 1) % 4
+            self.gear = ["P", "R", "N", "D"][self.gear_index]
+            self.send_fields("gear")
+
+        # Turn signals
+        if key == "Left":
+            self.left = not self.left
+            if self.left:
+                self.right = False
+                play_turn_signal_sound()
+            self.send_fields("left", "right")
+
+        if key == "Right":
+            self.right = not self.right
+            if self.right:
+                self.left = False
+                play_turn_signal_sound()
+            self.send_fields("left", "right")
+
+        # Hazard lights
+        if key == "h" or key == "H":
+            self.hazard = not self.hazard
+            self.left = self.right = self.hazard
+            if self.hazard:
+                play_turn_signal_sound()
+            self.send_fields("left", "right")
+
+        # High beam
+        if key == "b" or key == "B":
+            self.high_beam = not self.high_beam
+            self.send_fields("high_beam")
+
+        # Parking brake
+        if key == "p" or key == "P":
+            self.parking_brake = not self.parking_brake
+            if self.parking_brake:
+                play_warning_sound()
+            self.send_fields("parking_brake")
+
+        # Door
+        if key == "d" or key == "D":
+            self.door = not self.door
+            if self.door:
+                play_warning_sound()
+            self.send_fields("door")
+
+        # Seatbelt (use 't' key instead to avoid conflict)
+        if key == "t" or key == "T":
+            self.seatbelt = not self.seatbelt
+            if self.seatbelt:
+                play_warning_sound()
+            self.send_fields("seatbelt")
+
+    def release(self, key):
+        """Handle a key release"""
+        self.keys_pressed.discard(key)
+
+    def update_controls(self, dt=BASE_TICK):
+        """Update throttle and brake based on held keys"""
+        k = dt / BASE_TICK
+        keys_pressed = self.keys_pressed
+
+        # Throttle (Up arrow or W)
+        if "Up" in keys_pressed or "w" in keys_pressed or "W" in keys_pressed:
+            self.throttle = min(100, self.throttle + 2 * k)
+        else:
+            self.throttle = max(0, self.throttle - 3 * k)
+
+        # Brake (Down arrow or S - but not lowercase 's' to avoid conflict)
+        if "Down" in keys_pressed:
+            self.brake = min(100, self.brake + 3 * k)
+        else:
+            self.brake = max(0, self.brake - 4 * k)
+
+vehicle = Vehicle()   # Shown in the window and driven by the keyboard
+vehicles = [vehicle]  # Everything the simulation loop steps
+
+def make_vehicles(buses, id_stride=None):
+    """One vehicle per entry of `buses` (repeats share a bus), focusing the first
+
+    Vehicles on the same bus are spaced id_stride apart in ID space; with the
+    default None that is VEHICLE_ID_STRIDE, or 0 when every bus has one vehicle.
+    """
+    global vehicle, vehicles
+    if id_stride is None:
+        id_stride = VEHICLE_ID_STRIDE if len(set(map(id, buses))) < len(buses) else 0
+    vehicles = []
+    for i, vehicle_bus in enumerate(buses):
+        sharing = sum(1 for v in vehicles if v.bus is vehicle_bus)
+        vehicles.append(Vehicle(f"vehicle {i + 1}", vehicle_bus, sharing * id_stride))
+    vehicle = vehicles[0]
+    return vehicles
+
+def vehicle_buses():
+    """Each distinct bus and the vehicles on it"""
+    groups = {}
+    for v in vehicles:
+        groups.setdefault(v.bus if v.bus is not None else bus, []).append(v)
+    groups.pop(None, None)  # --view-state opens no bus
+    return groups
+
+def focus_vehicle(index):
+    """Show and drive another vehicle in the window"""
+    global vehicle, drawn_version
+    vehicle.keys_pressed.clear()  # Don't leave the old one with a held throttle
+    vehicle = vehicles[index % len(vehicles)]
+    drawn_version = None
+    if root is not None:
+        root.title(f"Interactive Premium Instrument Cluster - {vehicle.name}")
+    print(f"Focused {vehicle.name} (IDs +0x{vehicle.id_offset:X})")
+
+# ================= KEYBOARD CONTROLS =================
+def on_key_press(event):
+    """Handle key press events (they drive the focused vehicle)"""
+    key = event.keysym
+
+    # Performance overlay
+    if key == "F2":
+        toggle_profile_hud()
+
+    # Next vehicle (--vehicles)
+    if key == "Tab" and len(vehicles) > 1:
+        focus_vehicle(vehicles.index(vehicle) + 1)
+
+    request_frame()
+    if state_view is not None:
+        return  # --view-state: the exporting process owns the controls
+    if physics_wakeup is not None:
+        physics_wakeup.set()  # Async runtime: don't let a resting physics task sleep on
+    vehicle.press(key)
+
+def on_key_release(event):
+    """Handle key release events"""
+    if state_view is None:
+        vehicle.release(event.keysym)
+
+# ================= SIMULATION LOOP =================
+# Physics runs at a fixed rate on real elapsed time, independent of the FPS
+PHYSICS_HZ = 100
+PHYSICS_DT = 1.0 / PHYSICS_HZ
+MAX_PHYSICS_STEPS = 25  # Catch-up limit after a stall, then the backlog is dropped
+
+physics_accumulator = 0.0
+last_physics_time = None
+
+def step_simulation(dt):
+    """Advance every vehicle by one fixed step, sending its CAN frames"""
+    now = clock()
+    if replaying or state_view is not None:
+        for v in vehicles:
+            v.prev_speed, v.prev_rpm = v.speed, v.rpm
+        if state_view is not None:
+            state_view.apply(vehicles)  # The exporting process drives the state
+        # else the log does
+    else:
+        for v in vehicles:
+            v.step(dt, now)
+        if recorder is not None:
+            recorder.record_state(now)
+    if state_export is not None:
+        state_export.publish(now)
+
+def advance_simulation(now):
+    """Run as many fixed steps as real time since the last call allows"""
+    global physics_accumulator, last_physics_time
+
+    if last_physics_time is None:
+        last_physics_time = now
+    physics_accumulator += now - last_physics_time
+    last_physics_time = now
+
+    steps = 0
+    while physics_accumulator >= PHYSICS_DT:
+        if steps >= MAX_PHYSICS_STEPS:
+            physics_accumulator = 0.0
+            break
+        step_simulation(PHYSICS_DT)
+        physics_accumulator -= PHYSICS_DT
+        steps += 1
+
+def interpolation_alpha(now):
+    """How far the display is between the previous and latest physics state"""
+    if last_physics_time is None:
+        return 1.0
+    return min(1.0, (physics_accumulator + now - last_physics_time) / PHYSICS_DT)
+
+def simulation_tick():
+    try:
+        advance_simulation(time.perf_counter())
+    except Exception as e:
+        print(f"Physics error: {e}")
+
+    try:
+        root.after(max(1, int(PHYSICS_DT * 1000)), simulation_tick)
+    except:
+        pass
+
+# ================= RETAINED SCENE =================
+# Set to True to print how many canvas items are touched per frame
+RENDER_STATS = False
+
+def scale_coords(coords, x0, y0, scale):
+    """Reference coordinates (flat, or one list for polygons) to pixels"""
+    if len(coords) == 1:
+        coords = coords[0]
+    return [x0 + c * scale if i % 2 == 0 else y0 + c * scale for i, c in enumerate(coords)]
+
+def scale_options(options, scale):
+    """Item options with line widths and font sizes scaled to pixels"""
+    if "width" not in options and "font" not in options:
+        return options
+    options = dict(options)
+    if "width" in options:
+        options["width"] = options["width"] * scale
+    font = options.get("font")
+    if font:
+        options["font"] = (font[0], max(1, round(font[1] * scale)), *font[2:])
+    return options
+
+class Scene:
+    """Canvas items created once and updated in place every frame
+
+    Callers work in reference (W x H) coordinates; each part of the cluster is
+    placed at its LAYOUT anchor and scaled to the canvas size.
+    """
+
+    def __init__(self, canvas, width=W, height=H):
+        self.canvas = canvas
+        self.width, self.height = width, height
+        self.scale = min(width / W, height / H)
+        # Each part's anchor in reference units, for the build and draw calls
+        self.points = {part: (u * W, v * H) for part, (u, v) in LAYOUT.items()}
+        self.origin = (0.0, 0.0)   # Pixel offset of the part being built
+        self.built = False
+        self.item_origins = {}     # item -> pixel offset of its part
+        self.applied_coords = {}   # item -> last coords sent to Tk
+        self.applied_options = {}  # item -> last options sent to Tk
+        self.touched = 0           # canvas calls made this frame
+        self.last_touched = 0
+        self.stats_frames = 0
+        self.stats_touched = 0
+        self.stats_time = time.time()
+
+    def place(self, part):
+        """Build the next items at a LAYOUT part's anchor"""
+        u, v = LAYOUT[part]
+        self.origin = (u * (self.width - W * self.scale), v * (self.height - H * self.scale))
+
+    def static(self, kind, *coords, **options):
+        """Create an item that never changes after the scene is built"""
+        return getattr(self.canvas, "create_" + kind)(
+            *scale_coords(coords, *self.origin, self.scale), tags="static",
+            **scale_options(options, self.scale))
+
+    def dynamic(self, kind, *coords, **options):
+        """Create an item that is updated in place with coords()/config()"""
+        item = getattr(self.canvas, "create_" + kind)(
+            *scale_coords(coords, *self.origin, self.scale), tags="dynamic",
+            **scale_options(options, self.scale))
+        self.item_origins[item] = self.origin
+        self.applied_coords[item] = coords
+        self.applied_options[item] = dict(options)
+        return item
+
+    def coords(self, item, *coords):
+        """Move an item, skipping the Tk call if nothing changed"""
+        if self.applied_coords[item] != coords:
+            self.canvas.coords(item, *scale_coords(coords, *self.item_origins[item], self.scale))
+            self.applied_coords[item] = coords
+            self.touched += 1
+
+    def config(self, item, **options):
+        """Reconfigure an item, sending only the options that changed"""
+        applied = self.applied_options[item]
+        changed = {k: v for k, v in options.items() if applied.get(k) != v}
+        if changed:
+            self.canvas.itemconfigure(item, **scale_options(changed, self.scale))
+            applied.update(changed)
+            self.touched += 1
+
+    def show(self, item, visible):
+        self.config(item, state="normal" if visible else "hidden")
+
+    def begin_frame(self):
+        self.touched = 0
+
+    def end_frame(self):
+        self.last_touched = self.touched
+        if not RENDER_STATS:
+            return
+        self.stats_frames += 1
+        self.stats_touched += self.touched
+        now = time.time()
+        if now - self.stats_time >= 5.0:
+            total_items = len(self.canvas.find_all())
+            print(f"Render: {self.stats_touched / self.stats_frames:.1f} items touched/frame "
+                  f"({total_items} items retained)")
+            self.stats_frames = self.stats_touched = 0
+            self.stats_time = now
+
+scene = None
+
+# Retained item handles for each part of the cluster
+speedo = {}
+tacho = {}
+center = {}
+indicator_items = []
+turn_items = {}
+
+# ================= WIDGET BINDINGS =================
+# Everything but the needles subscribes to the vehicle fields it shows and is
+# redrawn only on frames where one of them changed (see Vehicle.changes_since).
+# Pseudo-fields: "blink" is the turn signal phase; a widget with no fields is
+# only drawn when the whole cluster is.
+widget_subscriptions = {}  # field -> [draw(vehicle), ...]
+widgets = []               # Every subscribed draw, in build order
+
+def subscribe(draw, *fields):
+    """Call draw(vehicle) on frames where any of `fields` changed"""
+    widgets.append(draw)
+    for field in fields:
+        widget_subscriptions.setdefault(field, []).append(draw)
+
+def changed_widgets(changed):
+    """Widgets subscribed to any of the changed fields, or all of them for None"""
+    if changed is None:
+        return widgets
+    subscriptions = widget_subscriptions
+    return list(dict.fromkeys(draw for field in changed for draw in subscriptions.get(field, ())))
+
+def draw_widgets(v, dirty):
+    for draw in dirty:
+        draw(v)
+
+# ================= GAUGE GEOMETRY =================
+# Set to True to time cached arc geometry against per-frame trig at startup
+BENCHMARK_GAUGES = False
+
+UNLIT_ARC_COLOR = "#0d0d0d"
+
+def speed_arc_color(speed_val):
+    """Premium color gradient for a lit speedometer segment"""
+    if speed_val < 60:
+        # Blue zone
+        ratio = speed_val / 60
+        r_val = int(ratio * 30)
+        g_val = int(180 + ratio * 75)
+        b_val = 255
+        return f"#{r_val:02x}{g_val:02x}{b_val:02x}"
+    elif speed_val < 120:
+        # Cyan to green
+        ratio = (speed_val - 60) / 60
+        r_val = int(30 + ratio * 30)
+        g_val = 255
+        b_val = int(255 - ratio * 155)
+        return f"#{r_val:02x}{g_val:02x}{b_val:02x}"
+    elif speed_val < 180:
+        # Yellow to orange
+        ratio = (speed_val - 120) / 60
+        r_val = int(60 + ratio * 195)
+        g_val = int(255 - ratio * 100)
+        b_val = int(100 - ratio * 100)
+        return f"#{r_val:02x}{g_val:02x}{b_val:02x}"
+    else:
+        # Red zone
+        ratio = min(1.0, (speed_val - 180) / 80)
+        return f"#{255:02x}{int(155-ratio*155):02x}{0:02x}"
+
+def rpm_arc_color(rpm_val):
+    """Premium color gradient matching RPM zones"""
+    if rpm_val < 2500:
+        # Green zone
+        ratio = rpm_val / 2500
+        r_val = int(ratio * 50)
+        g_val = 255
+        b_val = int(150 - ratio * 50)
+    elif rpm_val < 5000:
+        # Yellow zone
+        ratio = (rpm_val - 2500) / 2500
+        r_val = int(50 + ratio * 205)
+        g_val = 255
+        b_val = int(100 - ratio * 100)
+    elif rpm_val < 6500:
+        # Orange zone
+        ratio = (rpm_val - 5000) / 1500
+        r_val = 255
+        g_val = int(255 - ratio * 100)
+        b_val = 0
+    else:
+        # Red zone
+        ratio = min(1.0, (rpm_val - 6500) / 1500)
+        r_val = 255
+        g_val = int(155 - ratio * 155)
+        b_val = 0
+    return f"#{r_val:02x}{g_val:02x}{b_val:02x}"
+
+class GaugeGeometry:
+    """Arc segment endpoints and lit colors for one gauge, computed once"""
+
+    def __init__(self, cx, cy, r, start_deg, step_deg, max_value, color_fn, arc_width=25):
+        self.segments = []  # (x1, y1, x2, y2) per segment
+        self.values = []    # gauge value at which each segment lights up
+        self.colors = []    # lit color per segment
+
+        for i in range(240 // abs(step_deg) + 1):
+            angle_deg = start_deg + i * step_deg
+            value = abs(angle_deg - start_deg) / 240.0 * max_value
+            rad = math.radians(angle_deg)
+            x1 = cx + math.cos(rad) * (r - arc_width - 2)
+            y1 = cy + math.sin(rad) * (r - arc_width - 2)
+            x2 = cx + math.cos(rad) * (r - 2)
+            y2 = cy + math.sin(rad) * (r - 2)
+            self.segments.append((x1, y1, x2, y2))
+            self.values.append(value)
+            self.colors.append(color_fn(value))
+
+    def lit_count(self, value):
+        """Number of segments lit at this value (segments light in order)"""
+        return bisect.bisect_right(self.values, value)
+
+# (start angle, step, full-scale value, color function) for each gauge arc
+GAUGE_ARCS = {
+    "speed": (140, -2, 260, speed_arc_color),
+    "rpm": (40, 2, 8000, rpm_arc_color),
+}
+
+gauge_geometry_cache = {}
+
+def get_gauge_geometry(kind, cx, cy, r):
+    """Cached GaugeGeometry for a gauge kind at a given position and size"""
+    key = (kind, cx, cy, r)
+    geometry = gauge_geometry_cache.get(key)
+    if geometry is None:
+        start_deg, step_deg, max_value, color_fn = GAUGE_ARCS[kind]
+        geometry = GaugeGeometry(cx, cy, r, start_deg, step_deg, max_value, color_fn)
+        gauge_geometry_cache[key] = geometry
+    return geometry
+
+def draw_gauge_arc(items, value):
+    """Recolor only the segments between the previous and the new lit count"""
+    geometry = items["geometry"]
+    lit = geometry.lit_count(value)
+    old_lit = items["lit"]
+    if lit == old_lit:
+        return
+
+    segments = items["arc"]
+    colors = geometry.colors
+    if items["baked"]:
+        # The unlit arc is part of the face image, lit segments are shown over it
+        for i in range(min(lit, old_lit), max(lit, old_lit)):
+            scene.show(segments[i], i < lit)
+    else:
+        for i in range(min(lit, old_lit), max(lit, old_lit)):
+            scene.config(segments[i], fill=colors[i] if i < lit else UNLIT_ARC_COLOR)
+    items["lit"] = lit
+
+def benchmark_gauge_geometry(frames=500, report=True):
+    """Compare per-frame arc trig and colors against the cached geometry"""
+    values = [(i * 7.3) % 260 for i in range(frames)]
+
+    start = time.perf_counter()
+    for value in values:
+        # What draw_speedometer used to do every frame
+        geometry = GaugeGeometry(350, 400, 240, *GAUGE_ARCS["speed"])
+        [geometry.colors[i] if geometry.values[i] <= value else UNLIT_ARC_COLOR
+         for i in range(len(geometry.segments))]
+    per_frame = (time.perf_counter() - start) / frames
+
+    geometry = get_gauge_geometry("speed", 350, 400, 240)
+    start = time.perf_counter()
+    for value in values:
+        geometry.colors[:geometry.lit_count(value)]
+    cached = (time.perf_counter() - start) / frames
+
+    if report:
+        print(f"Gauge arc: per-frame trig {per_frame * 1e6:.1f} us/frame, "
+              f"cached {cached * 1e6:.2f} us/frame ({per_frame / cached:.0f}x)")
+    return {"per_frame_trig_us": per_frame * 1e6, "cached_us": cached * 1e6,
+            "speedup": per_frame / cached}
+
+# ================= GAUGE FACES =================
+# Set to True to draw each gauge's static face (bezel, ticks, numerals, unlit arc)
+# as one pre-rendered image instead of ~150 canvas items. Pillow rasterizes the
+# whole face if it's installed; without it Tk does, and the numerals and labels
+# stay canvas text. Faces are kept on disk keyed by gauge size and look.
+GAUGE_FACE_CACHE = False
+GAUGE_FACE_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".face-cache")
+GAUGE_FACE_VERSION = 1
+GAUGE_FACE_MARGIN = 14      # Pixels around the gauge radius for the bezel and shadow
+GAUGE_FACE_SUPERSAMPLE = 2  # Pillow draws at N x size and scales down for smooth edges
+
+# Where the arc segments go in a face's shape list (between bezel and ticks)
+FACE_ARC = ("arc", (), {})
+
+# TrueType files tried for the canvas "Arial" fonts, regular and bold
+FACE_FONT_FILES = {
+    False: ("arial.ttf", "Arial.ttf", "LiberationSans-Regular.ttf", "DejaVuSans.ttf"),
+    True: ("arialbd.ttf", "Arial Bold.ttf", "LiberationSans-Bold.ttf", "DejaVuSans-Bold.ttf"),
+}
+
+def tk_point_scaling():
+    """Pixels per point Tk uses for font sizes"""
+    try:
+        return float(root.tk.call("tk", "scaling"))
+    except Exception:
+        return 96 / 72
+
+@functools.lru_cache(maxsize=None)
+def face_font(pixels, bold):
+    """Pillow font closest to the canvas font, or None if none is installed"""
+    for name in FACE_FONT_FILES[bold]:
+        try:
+            return ImageFont.truetype(name, pixels)
+        except OSError:
+            pass
+    return None
+
+def rasterize_face_pil(shapes, size, scaling):
+    """PNG bytes of a face drawn with Pillow, and whether its text is in it"""
+    ss = GAUGE_FACE_SUPERSAMPLE
+    fonts = {}
+    for shape_kind, coords, options in shapes:
+        if shape_kind == "text":
+            family, points, *style = options["font"]
+            fonts[options["font"]] = face_font(round(points * scaling * ss), "bold" in style)
+    text = None not in fonts.values()  # All or nothing, so text never mixes renderers
+
+    image = Image.new("RGB", (size * ss, size * ss), BG)
+    draw = ImageDraw.Draw(image)
+    for shape_kind, coords, options in shapes:
+        coords = [c * ss for c in coords]
+        if shape_kind == "oval":
+            x1, y1, x2, y2 = coords
+            if options.get("fill"):
+                draw.ellipse(coords, fill=options["fill"])
+            # Tk centers the outline on the oval, Pillow draws it inside
+            width = options.get("width", 1) * ss
+            if options.get("outline", "black") and width:
+                h = width / 2
+                draw.ellipse((x1 - h, y1 - h, x2 + h, y2 + h),
+                             outline=options.get("outline", "black"), width=round(width))
+        elif shape_kind == "line":
+            width = options.get("width", 1) * ss
+            draw.line(coords, fill=options["fill"], width=round(width))
+            if options.get("capstyle") == "round":
+                h = width / 2
+                for x, y in (coords[:2], coords[2:]):
+                    draw.ellipse((x - h, y - h, x + h, y + h), fill=options["fill"])
+        elif shape_kind == "text" and text:
+            draw.text(coords, options["text"], fill=options["fill"],
+                      font=fonts[options["font"]], anchor="mm")
+
+    out = io.BytesIO()
+    image.resize((size, size), Image.LANCZOS).save(out, "PNG")
+    return out.getvalue(), text
+
+def rasterize_face_tk(shapes, size):
+    """Face as a Tk PhotoImage drawn pixel by pixel, without its text"""
+    import tkinter as tk
+    rows = [[BG] * size for _ in range(size)]
+
+    def span(cx, half):
+        """Columns whose pixel centers lie within half of cx"""
+        return (min(size, max(0, math.ceil(cx - half - 0.5))),
+                min(size, max(0, math.floor(cx + half - 0.5) + 1)))
+
+    def disk(cx, cy, radius, color, hole=0.0):
+        for y in range(max(0, math.floor(cy - radius)), min(size, math.ceil(cy + radius) + 1)):
+            dy = y + 0.5 - cy
+            if abs(dy) > radius:
+                continue
+            x1, x2 = span(cx, math.sqrt(radius * radius - dy * dy))
+            runs = [(x1, x2)]
+            if hole > abs(dy):
+                h1, h2 = span(cx, math.sqrt(hole * hole - dy * dy))
+                runs = [(x1, max(x1, h1)), (min(x2, h2), x2)]
+            row = rows[y]
+            for a, b in runs:
+                if b > a:
+                    row[a:b] = [color] * (b - a)
+
+    def line(x1, y1, x2, y2, color, width, round_caps):
+        h = width / 2
+        dx, dy = x2 - x1, y2 - y1
+        length2 = dx * dx + dy * dy or 1e-9
+        for y in range(max(0, math.floor(min(y1, y2) - h)), min(size, math.ceil(max(y1, y2) + h) + 1)):
+            row = rows[y]
+            py = y + 0.5
+            for x in range(max(0, math.floor(min(x1, x2) - h)), min(size, math.ceil(max(x1, x2) + h) + 1)):
+                px = x + 0.5
+                t = ((px - x1) * dx + (py - y1) * dy) / length2
+                if not round_caps and not 0.0 <= t <= 1.0:
+                    continue
+                t = min(1.0, max(0.0, t))
+                ex, ey = x1 + t * dx - px, y1 + t * dy - py
+                if ex * ex + ey * ey <= h * h:
+                    row[x] = color
+
+    for shape_kind, coords, options in shapes:
+        if shape_kind == "oval":
+            x1, y1, x2, y2 = coords
+            cx, cy, radius = (x1 + x2) / 2, (y1 + y2) / 2, (x2 - x1) / 2
+            if options.get("fill"):
+                disk(cx, cy, radius, options["fill"])
+            width = options.get("width", 1)
+            if options.get("outline", "black") and width:
+                disk(cx, cy, radius + width / 2, options.get("outline", "black"),
+                     hole=radius - width / 2)
+        elif shape_kind == "line":
+            line(*coords, options["fill"], options.get("width", 1),
+                 options.get("capstyle") == "round")
+
+    photo = tk.PhotoImage(width=size, height=size)
+    photo.put(" ".join("{" + " ".join(row) + "}" for row in rows))
+    return photo
+
+def load_gauge_face(kind, face, r, scale):
+    """(PhotoImage, text included) for a gauge face drawn at `scale` pixels per
+    reference unit, rasterized only on a cache miss"""
+    import tkinter as tk
+    half = math.ceil((r + GAUGE_FACE_MARGIN) * scale)
+    size = 2 * half
+    scaling = tk_point_scaling()
+    center = half / scale
+    shapes = []
+    for shape in face(center, center, r):
+        if shape is FACE_ARC:
+            # The unlit arc is baked in, lit segments are drawn over it
+            shapes += [("line", segment, dict(fill=UNLIT_ARC_COLOR, width=4, capstyle="round"))
+                       for segment in GaugeGeometry(center, center, r, *GAUGE_ARCS[kind]).segments]
+        else:
+            shapes.append(shape)
+    shapes = [(shape_kind, tuple(scale_coords(coords, 0.0, 0.0, scale)), scale_options(options, scale))
+              for shape_kind, coords, options in shapes]
+    look = hashlib.sha1(repr((GAUGE_FACE_VERSION, BG, round(scaling, 3), shapes))
+                        .encode()).hexdigest()[:12]
+    base = os.path.join(GAUGE_FACE_CACHE_DIR, f"{kind}-{size}px-{look}")
+
+    for suffix, text in (("full", True), ("shapes", False)):
+        try:
+            return tk.PhotoImage(file=f"{base}-{suffix}.png"), text
+        except tk.TclError:
+            pass  # Not cached yet (or unreadable)
+
+    try:
+        os.makedirs(GAUGE_FACE_CACHE_DIR, exist_ok=True)
+    except OSError:
+        pass
+    if Image is not None:
+        png, text = rasterize_face_pil(shapes, size, scaling)
+        try:
+            with open(f"{base}-{'full' if text else 'shapes'}.png", "wb") as f:
+                f.write(png)
+        except OSError:
+            pass  # Read-only location, rasterize again next time
+        return tk.PhotoImage(data=base64.b64encode(png)), text
+
+    photo = rasterize_face_tk(shapes, size)
+    try:
+        photo.write(f"{base}-shapes.png", format="png")
+    except tk.TclError:
+        pass
+    return photo, False
+
+def build_gauge(items, kind, face, cx, cy, r):
+    """A gauge's static face and arc segments, the face as one image when cached"""
+    geometry = items["geometry"] = get_gauge_geometry(kind, cx, cy, r)
+    items["lit"] = 0
+
+    image = None
+    if GAUGE_FACE_CACHE:
+        try:
+            image = load_gauge_face(kind, face, r, scene.scale)
+        except Exception as e:
+            print(f"Gauge face cache unavailable, drawing the {kind} face as items: {e}")
+    items["baked"] = image is not None
+
+    if image is not None:
+        photo, text = image
+        items["face"] = photo  # Tk drops images nothing references
+        scene.static("image", cx, cy, image=photo, anchor="center")
+
+    for shape in face(cx, cy, r):
+        if shape is FACE_ARC:
+            if image is None:
+                items["arc"] = [scene.dynamic("line", *segment, fill=UNLIT_ARC_COLOR,
+                                              width=4, capstyle="round")
+                                for segment in geometry.segments]
+            else:
+                # Lit colors up front, segments are only shown and hidden
+                items["arc"] = [scene.dynamic("line", *segment, fill=color, width=4,
+                                              capstyle="round", state="hidden")
+                                for segment, color in zip(geometry.segments, geometry.colors)]
+        elif image is None or (shape[0] == "text" and not text):
+            shape_kind, coords, options = shape
+            scene.static(shape_kind, *coords, **options)
+
+# ================= SPEEDOMETER =================
+def gauge_bezel(cx, cy, r):
+    """Static bezel, background and shadow shared by both gauges"""
+    shapes = []
+
+    # Drop shadow for 3D effect
+    shapes.append(("oval", (cx-r+4, cy-r+4, cx+r+4, cy+r+4),
+                   dict(outline="", fill="#000000", width=0)))
+
+    # Optimized chrome bezel - fewer rings for performance
+    chrome_rings = [
+        (r+10, "#0a0a0a", 4),
+        (r+6, "#2a2a2a", 3),
+        (r+2, "#3a3a3a", 2),
+    ]
+    for ring_r, color, width in chrome_rings:
+        shapes.append(("oval", (cx-ring_r, cy-ring_r, cx+ring_r, cy+ring_r),
+                       dict(outline=color, width=width, fill="")))
+
+    # Main gauge background - deep black
+    shapes.append(("oval", (cx-r, cy-r, cx+r, cy+r),
+                   dict(fill="#000000", outline="", width=0)))
+
+    # Inner shadow ring
+    shapes.append(("oval", (cx-r+3, cy-r+3, cx+r-3, cy+r-3),
+                   dict(outline="#0a0a0a", width=2)))
+    return shapes
+
+def build_needle_cap(cx, cy):
+    """Needle center cap - metallic appearance"""
+    scene.static("oval", cx-16, cy-16, cx+16, cy+16, fill="#1a1a1a", outline="#444444", width=2)
+    scene.static("oval", cx-12, cy-12, cx+12, cy+12, fill="#2a2a2a", outline="#555555", width=1)
+    scene.static("oval", cx-8, cy-8, cx+8, cy+8, fill="#3a3a3a", outline="")
+    scene.static("oval", cx-4, cy-4, cx+4, cy+4, fill="#555555", outline="")
+    # Highlight for metallic effect
+    scene.static("oval", cx-3, cy-6, cx+1, cy-2, fill="#888888", outline="")
+
+def speedometer_face(cx, cy, r):
+    """Everything on the speedometer that never moves, back to front"""
+    shapes = gauge_bezel(cx, cy, r)
+
+    # Optimized illuminated arc - every 2 degrees for performance
+    arc_width = 25
+    shapes.append(FACE_ARC)
+
+    # Tick marks and numbers
+    for spd in range(0, 280, 20):
+        norm = spd / 260.0
+        angle_deg = 140 - (norm * 240)
+        rad = math.radians(angle_deg)
+
+        if spd % 40 == 0:
+            # Major ticks with shadow
+            x1 = cx + math.cos(rad) * (r - arc_width - 4)
+            y1 = cy + math.sin(rad) * (r - arc_width - 4)
+            x2 = cx + math.cos(rad) * (r - arc_width - 20)
+            y2 = cy + math.sin(rad) * (r - arc_width - 20)
+            shapes.append(("line", (x1+1, y1+1, x2+1, y2+1), dict(fill="#000000", width=4)))
+            shapes.append(("line", (x1, y1, x2, y2), dict(fill="#ffffff", width=3)))
+
+            # Numbers with shadow for depth
+            tx = cx + math.cos(rad) * (r - arc_width - 42)
+            ty = cy + math.sin(rad) * (r - arc_width - 42)
+            shapes.append(("text", (tx+1, ty+1), dict(text=str(spd),
+                           fill="#000000", font=("Arial", 17, "bold"))))
+            shapes.append(("text", (tx, ty), dict(text=str(spd),
+                           fill="#f5f5f5", font=("Arial", 17, "bold"))))
+        else:
+            # Minor ticks
+            x1 = cx + math.cos(rad) * (r - arc_width - 4)
+            y1 = cy + math.sin(rad) * (r - arc_width - 4)
+            x2 = cx + math.cos(rad) * (r - arc_width - 12)
+            y2 = cy + math.sin(rad) * (r - arc_width - 12)
+            shapes.append(("line", (x1, y1, x2, y2), dict(fill="#888888", width=2)))
+
+    # Unit label
+    shapes.append(("text", (cx, cy+42), dict(text="km/h",
+                   fill="#a0a0a0", font=("Arial", 17))))
+
+    # Bottom label
+    shapes.append(("text", (cx, cy+r-46), dict(text="SPEED",
+                   fill="#7a7a7a", font=("Arial", 12, "bold"))))
+    return shapes
+
+def build_speedometer(cx, cy, r):
+    build_gauge(speedo, "speed", speedometer_face, cx, cy, r)
+
+    # Premium needle - created at rest, moved by draw_speedometer()
+    speedo["needle_shadow"] = scene.dynamic("line", cx+3, cy+3, cx+3, cy+3,
+                                            fill="#000000", width=6, capstyle="round")
+    # Glow at high speed
+    speedo["needle_glow"] = scene.dynamic("line", cx, cy, cx, cy, fill="#ff6600", width=8,
+                                          state="hidden")
+    # Main needle body - simplified gradient
+    speedo["needle_body"] = scene.dynamic("line", cx, cy, cx, cy, fill="#cc0000", width=5,
+                                          capstyle="round")
+    speedo["needle_core"] = scene.dynamic("line", cx, cy, cx, cy, fill="#ff0000", width=3,
+                                          capstyle="round")
+
+    build_needle_cap(cx, cy)
+
+    # Digital display with glow
+    speedo["digits"] = [
+        # Outer glow
+        scene.dynamic("text", cx+3, cy-17, text="0",
+                      fill="#001a33", font=("Arial", 95, "bold")),
+        # Inner glow
+        scene.dynamic("text", cx+1, cy-19, text="0",
+                      fill="#0088cc", font=("Arial", 93, "bold")),
+        # Main display
+        scene.dynamic("text", cx, cy-20, text="0",
+                      fill="#00ffff", font=("Arial", 90, "bold")),
+    ]
+
+def draw_speedometer(cx, cy, r):
+    # Light the arc up to the current speed
+    draw_gauge_arc(speedo, disp_speed)
+
+    # Premium needle with realistic appearance
+    norm = min(1.0, disp_speed / 260.0)
+    needle_angle = 140 - (norm * 240)
+    rad = math.radians(needle_angle)
+
+    needle_length = r - 32
+    nx = cx + math.cos(rad) * needle_length
+    ny = cy + math.sin(rad) * needle_length
+
+    scene.coords(speedo["needle_shadow"], cx+3, cy+3, nx+3, ny+3)
+    scene.show(speedo["needle_glow"], disp_speed > 100)
+    if disp_speed > 100:
+        scene.coords(speedo["needle_glow"], cx, cy, nx, ny)
+    scene.coords(speedo["needle_body"], cx, cy, nx, ny)
+    scene.coords(speedo["needle_core"], cx, cy, nx, ny)
+
+    # Digital display
+    speed_text = str(int(disp_speed))
+    for item in speedo["digits"]:
+        scene.config(item, text=speed_text)
+
+# ================= TACHOMETER =================
+def tachometer_face(cx, cy, r):
+    """Everything on the tachometer that never moves, back to front"""
+    shapes = gauge_bezel(cx, cy, r)
+
+    # Optimized illuminated arc - every 2 degrees for performance
+    arc_width = 25
+    shapes.append(FACE_ARC)
+
+    # Redline marker - prominent red indicator
+    redline_norm = 6500 / 8000.0
+    redline_angle = 40 + (redline_norm * 240)
+    rad = math.radians(redline_angle)
+    x1 = cx + math.cos(rad) * (r - arc_width - 4)
+    y1 = cy + math.sin(rad) * (r - arc_width - 4)
+    x2 = cx + math.cos(rad) * (r - arc_width - 28)
+    y2 = cy + math.sin(rad) * (r - arc_width - 28)
+    shapes.append(("line", (x1+1, y1+1, x2+1, y2+1), dict(fill="#330000", width=7)))
+    shapes.append(("line", (x1, y1, x2, y2), dict(fill="#ff0000", width=6)))
+
+    # Tick marks and numbers
     for i in range(0, 9):
         rpm_val = i * 1000
         norm = rpm_val / 8000.0
         angle_deg = 40 + (norm * 240)
         rad = math.radians(angle_deg)
-        
+
         # Color coding for redline zone
         is_redline = rpm_val >= 7000
         tick_color = "#ff9999" if is_redline else "#ffffff"
         text_color = "#ffaaaa" if is_redline else "#f5f5f5"
-        
+
         # Major ticks with shadow
         x1 = cx + math.cos(rad) * (r - arc_width - 4)
         y1 = cy + math.sin(rad) * (r - arc_width - 4)
         x2 = cx + math.cos(rad) * (r - arc_width - 20)
         y2 = cy + math.sin(rad) * (r - arc_width - 20)
-        canvas.create_line(x1+1, y1+1, x2+1, y2+1, fill="#000000", width=4)
-        canvas.create_line(x1, y1, x2, y2, fill=tick_color, width=3)
-        
+        shapes.append(("line", (x1+1, y1+1, x2+1, y2+1), dict(fill="#000000", width=4)))
+        shapes.append(("line", (x1, y1, x2, y2), dict(fill=tick_color, width=3)))
+
         # Numbers with shadow for depth
         tx = cx + math.cos(rad) * (r - arc_width - 42)
         ty = cy + math.sin(rad) * (r - arc_width - 42)
-        canvas.create_text(tx+1, ty+1, text=str(i),
-                         fill="#000000", font=("Arial", 17, "bold"))
-        canvas.create_text(tx, ty, text=str(i),
-                         fill=text_color, font=("Arial", 17, "bold"))
-    
+        shapes.append(("text", (tx+1, ty+1), dict(text=str(i),
+                       fill="#000000", font=("Arial", 17, "bold"))))
+        shapes.append(("text", (tx, ty), dict(text=str(i),
+                       fill=text_color, font=("Arial", 17, "bold"))))
+
     # Minor ticks (500 RPM intervals)
     for i in range(0, 16):
         rpm_val = i * 500
@@ -803,323 +2230,406 @@ def draw_tachometer(cx, cy, r):
             norm = rpm_val / 8000.0
             angle_deg = 40 + (norm * 240)
             rad = math.radians(angle_deg)
-            
+
             x1 = cx + math.cos(rad) * (r - arc_width - 4)
             y1 = cy + math.sin(rad) * (r - arc_width - 4)
             x2 = cx + math.cos(rad) * (r - arc_width - 12)
             y2 = cy + math.sin(rad) * (r - arc_width - 12)
-            canvas.create_line(x1, y1, x2, y2, fill="#888888", width=2)
-    
+            shapes.append(("line", (x1, y1, x2, y2), dict(fill="#888888", width=2)))
+
+    # Unit label
+    shapes.append(("text", (cx, cy+34), dict(text="RPM",
+                   fill="#a0a0a0", font=("Arial", 15))))
+
+    # Bottom label
+    shapes.append(("text", (cx, cy+r-46), dict(text="ENGINE",
+                   fill="#7a7a7a", font=("Arial", 12, "bold"))))
+    return shapes
+
+def build_tachometer(cx, cy, r):
+    build_gauge(tacho, "rpm", tachometer_face, cx, cy, r)
+
+    # Premium needle - created at rest, moved by draw_tachometer()
+    tacho["needle_shadow"] = scene.dynamic("line", cx+3, cy+3, cx+3, cy+3,
+                                           fill="#000000", width=6, capstyle="round")
+    # Conditional glow (orange at high RPM, red at redline)
+    tacho["needle_glow"] = scene.dynamic("line", cx, cy, cx, cy, fill="#ff8800", width=8,
+                                         state="hidden")
+    tacho["needle_body"] = scene.dynamic("line", cx, cy, cx, cy, fill="#00cc66", width=5,
+                                         capstyle="round")
+    tacho["needle_core"] = scene.dynamic("line", cx, cy, cx, cy, fill="#00ff88", width=3,
+                                         capstyle="round")
+
+    build_needle_cap(cx, cy)
+
+    # Digital display with glow
+    tacho["digits"] = [
+        # Outer glow
+        scene.dynamic("text", cx+3, cy-15, text="0",
+                      fill="#003320", font=("Arial", 75, "bold")),
+        # Inner glow
+        scene.dynamic("text", cx+1, cy-17, text="0",
+                      fill="#00cc66", font=("Arial", 73, "bold")),
+        # Main display
+        scene.dynamic("text", cx, cy-18, text="0",
+                      fill="#00ff88", font=("Arial", 70, "bold")),
+    ]
+
+def draw_tachometer(cx, cy, r):
+    # Light the arc up to the current RPM
+    draw_gauge_arc(tacho, disp_rpm)
+
     # Premium needle with realistic appearance
     norm = min(1.0, disp_rpm / 8000.0)
     needle_angle = 40 + (norm * 240)
     rad = math.radians(needle_angle)
-    
+
     needle_length = r - 32
     nx = cx + math.cos(rad) * needle_length
     ny = cy + math.sin(rad) * needle_length
-    
-    # Needle shadow
-    canvas.create_line(cx+3, cy+3, nx+3, ny+3, fill="#000000", width=6, capstyle="round")
-    
+
+    scene.coords(tacho["needle_shadow"], cx+3, cy+3, nx+3, ny+3)
+
     # Optimized needle with conditional glow
     if disp_rpm > 6500:
-        # Redline glow
-        canvas.create_line(cx, cy, nx, ny, fill="#ff0000", width=10)
-        # Red needle
-        canvas.create_line(cx, cy, nx, ny, fill="#cc0000", width=5, capstyle="round")
-        canvas.create_line(cx, cy, nx, ny, fill="#ff0000", width=3, capstyle="round")
+        # Redline glow, red needle
+        scene.config(tacho["needle_glow"], fill="#ff0000", width=10, state="normal")
+        body_color, core_color = "#cc0000", "#ff0000"
     elif disp_rpm > 5000:
-        # High RPM glow
-        canvas.create_line(cx, cy, nx, ny, fill="#ff8800", width=8)
-        # Green needle
-        canvas.create_line(cx, cy, nx, ny, fill="#00cc66", width=5, capstyle="round")
-        canvas.create_line(cx, cy, nx, ny, fill="#00ff88", width=3, capstyle="round")
+        # High RPM glow, green needle
+        scene.config(tacho["needle_glow"], fill="#ff8800", width=8, state="normal")
+        body_color, core_color = "#00cc66", "#00ff88"
     else:
         # Normal - green needle only
-        canvas.create_line(cx, cy, nx, ny, fill="#00cc66", width=5, capstyle="round")
-        canvas.create_line(cx, cy, nx, ny, fill="#00ff88", width=3, capstyle="round")
-    
-    # Needle center cap - metallic appearance
-    canvas.create_oval(cx-16, cy-16, cx+16, cy+16, fill="#1a1a1a", outline="#444444", width=2)
-    canvas.create_oval(cx-12, cy-12, cx+12, cy+12, fill="#2a2a2a", outline="#555555", width=1)
-    canvas.create_oval(cx-8, cy-8, cx+8, cy+8, fill="#3a3a3a", outline="")
-    canvas.create_oval(cx-4, cy-4, cx+4, cy+4, fill="#555555", outline="")
-    # Highlight for metallic effect
-    canvas.create_oval(cx-3, cy-6, cx+1, cy-2, fill="#888888", outline="")
-    
+        scene.show(tacho["needle_glow"], False)
+        body_color, core_color = "#00cc66", "#00ff88"
+
+    if disp_rpm > 5000:
+        scene.coords(tacho["needle_glow"], cx, cy, nx, ny)
+    scene.coords(tacho["needle_body"], cx, cy, nx, ny)
+    scene.config(tacho["needle_body"], fill=body_color)
+    scene.coords(tacho["needle_core"], cx, cy, nx, ny)
+    scene.config(tacho["needle_core"], fill=core_color)
+
     # Digital display with glow
     rpm_display = int(disp_rpm)
     display_color = "#ff3333" if rpm_display > 6500 else "#00ff88"
     shadow_color = "#330000" if rpm_display > 6500 else "#003320"
     glow_color = "#ff6666" if rpm_display > 6500 else "#00cc66"
-    
-    # Outer glow
-    canvas.create_text(cx+3, cy-15, text=str(rpm_display),
-                      fill=shadow_color, font=("Arial", 75, "bold"))
-    # Inner glow
-    canvas.create_text(cx+1, cy-17, text=str(rpm_display),
-                      fill=glow_color, font=("Arial", 73, "bold"))
-    # Main display
-    canvas.create_text(cx, cy-18, text=str(rpm_display),
-                      fill=display_color, font=("Arial", 70, "bold"))
-    
-    # Unit label
-    canvas.create_text(cx, cy+34, text="RPM",
-                      fill="#a0a0a0", font=("Arial", 15))
-    
-    # Bottom label
-    canvas.create_text(cx, cy+r-46, text="ENGINE",
-                      fill="#7a7a7a", font=("Arial", 12, "bold"))
+    rpm_text = str(rpm_display)
+
+    outer, inner, main = tacho["digits"]
+    scene.config(outer, text=rpm_text, fill=shadow_color)
+    scene.config(inner, text=rpm_text, fill=glow_color)
+    scene.config(main, text=rpm_text, fill=display_color)
 
 # ================= CENTER DISPLAY =================
-def draw_center_display(cx, cy):
+# Gear display configurations
+GEAR_CONFIGS = {
+    "P": ("#999999", "#1a1a1a", "#2a2a2a"),
+    "R": ("#ff3333", "#330000", "#ff3333"),
+    "N": ("#ffdd00", "#332a00", "#ffdd00"),
+    "D": ("#00ff88", "#003322", "#00ff88")
+}
+
+def build_center_display(cx, cy):
     # Top info bar - clean design
-    canvas.create_rectangle(cx-200, 25, cx+200, 65,
-                           fill="#0a0a0a", outline="#2a2a2a", width=2)
-    
+    scene.static("rectangle", cx-200, 25, cx+200, 65,
+                 fill="#0a0a0a", outline="#2a2a2a", width=2)
+
     # Time display
-    canvas.create_text(cx-120, 45, text=time_str,
-                      fill="#ffffff", font=("Arial", 22, "bold"))
-    
+    center["time"] = scene.dynamic("text", cx-120, 45, text=time_str,
+                                   fill="#ffffff", font=("Arial", 22, "bold"))
+    subscribe(draw_clock)
+
     # Engine status
-    engine_status = "ENGINE ON" if engine_started else "ENGINE OFF"
-    status_color = "#00ff88" if engine_started else "#ff3333"
-    canvas.create_text(cx+120, 45, text=engine_status,
-                      fill=status_color, font=("Arial", 14, "bold"))
-    
-    # Gear display configurations
-    gear_configs = {
-        "P": ("#999999", "#1a1a1a", "#2a2a2a"),
-        "R": ("#ff3333", "#330000", "#ff3333"),
-        "N": ("#ffdd00", "#332a00", "#ffdd00"),
-        "D": ("#00ff88", "#003322", "#00ff88")
-    }
-    text_color, bg_color, border_color = gear_configs.get(gear, ("#ffffff", "#0a0a0a", "#2a2a2a"))
-    
+    center["engine_status"] = scene.dynamic("text", cx+120, 45, text="ENGINE OFF",
+                                            fill="#ff3333", font=("Arial", 14, "bold"))
+    subscribe(draw_engine_status, "engine_started")
+
     gear_size = 140
     gear_y = cy - 140
-    
+
     # Outer border for active gears
-    if gear in ["D", "R", "N"]:
-        canvas.create_rectangle(cx-gear_size/2-5, gear_y-gear_size/2-5,
-                              cx+gear_size/2+5, gear_y+gear_size/2+5,
-                              fill="", outline=border_color, width=2)
-    
+    center["gear_border"] = scene.dynamic("rectangle", cx-gear_size/2-5, gear_y-gear_size/2-5,
+                                          cx+gear_size/2+5, gear_y+gear_size/2+5,
+                                          fill="", outline="#2a2a2a", width=2, state="hidden")
+
     # Main gear box
-    canvas.create_rectangle(cx-gear_size/2, gear_y-gear_size/2,
-                          cx+gear_size/2, gear_y+gear_size/2,
-                          fill=bg_color, outline=border_color, width=3)
-    
+    center["gear_box"] = scene.dynamic("rectangle", cx-gear_size/2, gear_y-gear_size/2,
+                                       cx+gear_size/2, gear_y+gear_size/2,
+                                       fill="#1a1a1a", outline="#2a2a2a", width=3)
+
     # Gear letter
-    canvas.create_text(cx, gear_y, text=gear,
-                      fill=text_color, font=("Arial", 95, "bold"))
-    
+    center["gear_text"] = scene.dynamic("text", cx, gear_y, text="P",
+                                        fill="#999999", font=("Arial", 95, "bold"))
+    subscribe(draw_gear, "gear")
+
     # Drive mode indicator
     mode_y = gear_y + 95
-    canvas.create_rectangle(cx-65, mode_y-15, cx+65, mode_y+15,
-                           fill="#1a0a00", outline="#ff6600", width=2)
-    canvas.create_text(cx, mode_y, text="⚡ SPORT",
-                      fill="#ff8800", font=("Arial", 14, "bold"))
-    
+    scene.static("rectangle", cx-65, mode_y-15, cx+65, mode_y+15,
+                 fill="#1a0a00", outline="#ff6600", width=2)
+    scene.static("text", cx, mode_y, text="⚡ SPORT",
+                 fill="#ff8800", font=("Arial", 14, "bold"))
+
     # Odometer - simple and clean
     odo_y = cy + 20
-    canvas.create_text(cx, odo_y, text=f"ODO",
-                      fill="#4a4a4a", font=("Arial", 11, "bold"))
-    canvas.create_text(cx, odo_y+22, text=f"{odo:,}",
-                      fill="#ffffff", font=("Arial", 18, "bold"))
-    canvas.create_text(cx+65, odo_y+22, text="km",
-                      fill="#6b7280", font=("Arial", 12))
-    
+    scene.static("text", cx, odo_y, text=f"ODO",
+                 fill="#4a4a4a", font=("Arial", 11, "bold"))
+    center["odo"] = scene.dynamic("text", cx, odo_y+22, text=f"{vehicle.odo:,}",
+                                  fill="#ffffff", font=("Arial", 18, "bold"))
+    scene.static("text", cx+65, odo_y+22, text="km",
+                 fill="#6b7280", font=("Arial", 12))
+
     # Trip meter
-    canvas.create_text(cx, odo_y+48, text=f"TRIP  {trip:.1f} km",
-                      fill="#6b7280", font=("Arial", 13))
-    
+    center["trip"] = scene.dynamic("text", cx, odo_y+48, text=f"TRIP  {vehicle.trip:.1f} km",
+                                   fill="#6b7280", font=("Arial", 13))
+    subscribe(draw_odometer, "odo", "trip")
+
     # Fuel gauge - clean bars
     fuel_y = cy + 105
     bar_w, bar_h = 240, 18
-    
-    canvas.create_text(cx-bar_w/2-25, fuel_y+1, text="⛽",
-                      fill="#888888", font=("Arial", 18))
-    
-    canvas.create_rectangle(cx-bar_w/2, fuel_y-bar_h/2,
-                          cx+bar_w/2, fuel_y+bar_h/2,
-                          outline="#2a2a2a", width=2, fill="#0a0a0a")
-    
+
+    scene.static("text", cx-bar_w/2-25, fuel_y+1, text="⛽",
+                 fill="#888888", font=("Arial", 18))
+
+    scene.static("rectangle", cx-bar_w/2, fuel_y-bar_h/2,
+                 cx+bar_w/2, fuel_y+bar_h/2,
+                 outline="#2a2a2a", width=2, fill="#0a0a0a")
+
     # Fuel segments
     segments = 10
     seg_w = (bar_w - 8) / segments
+    center["fuel_segments"] = []
     for i in range(segments):
-        if (i + 1) * 10 <= fuel:
-            if fuel < 20:
-                seg_color = "#ff3333"
-            elif fuel < 40:
-                seg_color = "#ffaa00"
-            else:
-                seg_color = "#00ff88"
-            
-            x1 = cx - bar_w/2 + 4 + i * seg_w
-            canvas.create_rectangle(x1, fuel_y-bar_h/2+4,
-                                  x1+seg_w-2, fuel_y+bar_h/2-4,
-                                  fill=seg_color, outline="")
-    
-    fuel_color = "#ff3333" if fuel < 20 else "#ffaa00" if fuel < 40 else "#00ff88"
-    canvas.create_text(cx+bar_w/2+30, fuel_y+1, text=f"{int(fuel)}%",
-                      fill=fuel_color, font=("Arial", 12, "bold"))
-    
+        x1 = cx - bar_w/2 + 4 + i * seg_w
+        center["fuel_segments"].append(
+            scene.dynamic("rectangle", x1, fuel_y-bar_h/2+4,
+                          x1+seg_w-2, fuel_y+bar_h/2-4,
+                          fill="#00ff88", outline="", state="hidden"))
+
+    center["fuel_text"] = scene.dynamic("text", cx+bar_w/2+30, fuel_y+1, text="",
+                                        fill="#00ff88", font=("Arial", 12, "bold"))
+    subscribe(draw_fuel, "fuel")
+
     # Temperature gauge - clean
     temp_y = fuel_y + 40
-    canvas.create_text(cx-bar_w/2-25, temp_y+1, text="🌡",
-                      fill="#888888", font=("Arial", 18))
-    
-    canvas.create_rectangle(cx-bar_w/2, temp_y-bar_h/2,
-                          cx+bar_w/2, temp_y+bar_h/2,
-                          outline="#2a2a2a", width=2, fill="#0a0a0a")
-    
-    # Temperature fill
+    scene.static("text", cx-bar_w/2-25, temp_y+1, text="🌡",
+                 fill="#888888", font=("Arial", 18))
+
+    scene.static("rectangle", cx-bar_w/2, temp_y-bar_h/2,
+                 cx+bar_w/2, temp_y+bar_h/2,
+                 outline="#2a2a2a", width=2, fill="#0a0a0a")
+
+    # Temperature fill - width follows the temperature
+    center["temp_bar"] = (cx-bar_w/2+4, temp_y-bar_h/2+4, temp_y+bar_h/2-4, bar_w-8)
+    center["temp_fill"] = scene.dynamic("rectangle", cx-bar_w/2+4, temp_y-bar_h/2+4,
+                                        cx-bar_w/2+4, temp_y+bar_h/2-4,
+                                        fill="#00aaff", outline="", state="hidden")
+
+    center["temp_text"] = scene.dynamic("text", cx+bar_w/2+35, temp_y+1, text="",
+                                        fill="#00aaff", font=("Arial", 12, "bold"))
+    subscribe(draw_temperature, "temp")
+
+def draw_clock(v):
+    scene.config(center["time"], text=time_str)
+
+def draw_engine_status(v):
+    engine_status = "ENGINE ON" if v.engine_started else "ENGINE OFF"
+    status_color = "#00ff88" if v.engine_started else "#ff3333"
+    scene.config(center["engine_status"], text=engine_status, fill=status_color)
+
+def draw_gear(v):
+    gear = v.gear
+    text_color, bg_color, border_color = GEAR_CONFIGS.get(gear, ("#ffffff", "#0a0a0a", "#2a2a2a"))
+    scene.show(center["gear_border"], gear in ["D", "R", "N"])
+    scene.config(center["gear_border"], outline=border_color)
+    scene.config(center["gear_box"], fill=bg_color, outline=border_color)
+    scene.config(center["gear_text"], text=gear, fill=text_color)
+
+def draw_odometer(v):
+    scene.config(center["odo"], text=f"{v.odo:,}")
+    scene.config(center["trip"], text=f"TRIP  {v.trip:.1f} km")
+
+def draw_fuel(v):
+    fuel = v.fuel
+    fuel_color = "#ff3333" if fuel < 20 else "#ffaa00" if fuel < 40 else "#00ff88"
+    for i, segment in enumerate(center["fuel_segments"]):
+        lit = (i + 1) * 10 <= fuel
+        scene.show(segment, lit)
+        if lit:
+            scene.config(segment, fill=fuel_color)
+    scene.config(center["fuel_text"], text=f"{int(fuel)}%", fill=fuel_color)
+
+def draw_temperature(v):
+    temp = v.temp
+    x1, y1, y2, bar_w = center["temp_bar"]
     temp_norm = max(0, min(1, (temp - 60) / 60))
-    temp_w = (bar_w - 8) * temp_norm
-    
+    temp_w = bar_w * temp_norm
+
     if temp > 105:
         temp_color = "#ff3333"
     elif temp > 95:
         temp_color = "#ffaa00"
     else:
         temp_color = "#00aaff"
-    
+
+    scene.show(center["temp_fill"], temp_w > 0)
     if temp_w > 0:
-        canvas.create_rectangle(cx-bar_w/2+4, temp_y-bar_h/2+4,
-                              cx-bar_w/2+4+temp_w, temp_y+bar_h/2-4,
-                              fill=temp_color, outline="")
-    
-    canvas.create_text(cx+bar_w/2+35, temp_y+1, text=f"{int(temp)}°",
-                      fill=temp_color, font=("Arial", 12, "bold"))
+        scene.coords(center["temp_fill"], x1, y1, x1+temp_w, y2)
+        scene.config(center["temp_fill"], fill=temp_color)
+
+    scene.config(center["temp_text"], text=f"{int(temp)}°", fill=temp_color)
 
 # ================= WARNING INDICATORS =================
-def draw_indicator_light(x, y, symbol, active, color, label, size=26):
-    if active:
-        # Multiple glow rings for premium effect
-        canvas.create_oval(x-size-6, y-size-6, x+size+6, y+size+6,
-                          fill="", outline=color, width=2)
-        canvas.create_oval(x-size-3, y-size-3, x+size+3, y+size+3,
-                          fill="", outline=color, width=1)
-        
+# (symbol, color, label, vehicle field lighting it) for each lamp, left to right
+INDICATORS = [
+    ("!", "#ff0000", "CHECK", "engine"),
+    ("🔋", "#ff0000", "BATT", "battery"),
+    ("🛢", "#ffaa00", "OIL", "oil_pressure"),
+    ("ABS", "#ffaa00", "", "absw"),
+    ("(P)", "#ff0000", "BRAKE", "parking_brake"),
+    ("⚠", "#ff0000", "BAG", "airbag"),
+    ("💺", "#ff0000", "BELT", "seatbelt"),
+    ("🚪", "#ff6600", "DOOR", "door"),
+    ("TPMS", "#ffaa00", "", "tpms"),
+    ("☀", "#0099ff", "HIGH", "high_beam"),
+    ("❄", "#0099ff", "", None),  # Not wired up yet, always off
+    ("⚙", "#4a4a4a", "SVC", None),
+]
+
+def build_indicator_light(x, y, symbol, color, label, size=26):
+    """Create both the lit and the recessed look; draw_indicator_light() picks one"""
+    lamp = {"color": color}
+
+    # Multiple glow rings for premium effect
+    lamp["active"] = [
+        scene.dynamic("oval", x-size-6, y-size-6, x+size+6, y+size+6,
+                      fill="", outline=color, width=2, state="hidden"),
+        scene.dynamic("oval", x-size-3, y-size-3, x+size+3, y+size+3,
+                      fill="", outline=color, width=1, state="hidden"),
         # Main indicator body
-        canvas.create_oval(x-size, y-size, x+size, y+size,
-                          fill=color, outline="")
-        
+        scene.dynamic("oval", x-size, y-size, x+size, y+size,
+                      fill=color, outline="", state="hidden"),
         # Bright center for glass dome effect
-        canvas.create_oval(x-size//2, y-size//2, x+size//2, y+size//2,
-                          fill=color, outline="")
-        
+        scene.dynamic("oval", x-size//2, y-size//2, x+size//2, y+size//2,
+                      fill=color, outline="", state="hidden"),
         # Glass highlight
-        canvas.create_arc(x-size+4, y-size+4, x+size-4, y+size-4,
-                         start=45, extent=90, fill="", outline="#ffffff",
-                         width=2, style="arc")
-        
-        symbol_color = "#000000"
-        label_color = color
-    else:
-        # Inactive - recessed look
-        canvas.create_oval(x-size, y-size, x+size, y+size,
-                          fill="#0f0f0f", outline="#2a2a2a", width=2)
-        canvas.create_oval(x-size+2, y-size+2, x+size-2, y+size-2,
-                          fill="#0a0a0a", outline="#151515", width=1)
-        symbol_color = "#2a2a2a"
-        label_color = "#2a2a2a"
-    
+        scene.dynamic("arc", x-size+4, y-size+4, x+size-4, y+size-4,
+                      start=45, extent=90, fill="", outline="#ffffff",
+                      width=2, style="arc", state="hidden"),
+    ]
+
+    # Inactive - recessed look
+    lamp["inactive"] = [
+        scene.dynamic("oval", x-size, y-size, x+size, y+size,
+                      fill="#0f0f0f", outline="#2a2a2a", width=2),
+        scene.dynamic("oval", x-size+2, y-size+2, x+size-2, y+size-2,
+                      fill="#0a0a0a", outline="#151515", width=1),
+    ]
+
     # Symbol with shadow
-    canvas.create_text(x+1, y+1, text=symbol,
-                      fill="#000000", font=("Arial", 15, "bold"))
-    canvas.create_text(x, y, text=symbol,
-                      fill=symbol_color, font=("Arial", 15, "bold"))
-    
+    scene.static("text", x+1, y+1, text=symbol,
+                 fill="#000000", font=("Arial", 15, "bold"))
+    lamp["symbol"] = scene.dynamic("text", x, y, text=symbol,
+                                   fill="#2a2a2a", font=("Arial", 15, "bold"))
+
+    lamp["label"] = None
     if label:
-        canvas.create_text(x, y+size+11, text=label,
-                          fill=label_color, font=("Arial", 7, "bold"))
+        lamp["label"] = scene.dynamic("text", x, y+size+11, text=label,
+                                      fill="#2a2a2a", font=("Arial", 7, "bold"))
+    return lamp
+
+def draw_indicator_light(lamp, active):
+    for item in lamp["active"]:
+        scene.show(item, active)
+    for item in lamp["inactive"]:
+        scene.show(item, not active)
+
+    scene.config(lamp["symbol"], fill="#000000" if active else "#2a2a2a")
+    if lamp["label"] is not None:
+        scene.config(lamp["label"], fill=lamp["color"] if active else "#2a2a2a")
 
-def draw_all_indicators():
-    indicator_y = 730
+def build_all_indicators():
+    start_x, indicator_y = scene.points["indicators"]
     spacing = 70
-    start_x = 250
-    
-    indicators = [
-        ("!", engine, "#ff0000", "CHECK"),
-        ("🔋", battery, "#ff0000", "BATT"),
-        ("🛢", oil_pressure, "#ffaa00", "OIL"),
-        ("ABS", absw, "#ffaa00", ""),
-        ("(P)", parking_brake, "#ff0000", "BRAKE"),
-        ("⚠", airbag, "#ff0000", "BAG"),
-        ("💺", seatbelt, "#ff0000", "BELT"),
-        ("🚪", door, "#ff6600", "DOOR"),
-        ("TPMS", tpms, "#ffaa00", ""),
-        ("☀", high_beam, "#0099ff", "HIGH"),
-        ("❄", False, "#0099ff", ""),
-        ("⚙", False, "#4a4a4a", "SVC"),
-    ]
-    
-    for i, (symbol, active, color, label) in enumerate(indicators):
+
+    for i, (symbol, color, label, field) in enumerate(INDICATORS):
         x = start_x + (i * spacing)
-        draw_indicator_light(x, indicator_y, symbol, active, color, label)
+        lamp = build_indicator_light(x, indicator_y, symbol, color, label)
+        indicator_items.append(lamp)
+        fields = (field,) if field is not None else ()
+        subscribe(functools.partial(draw_indicator_field, lamp, field), *fields)
+
+def draw_indicator_field(lamp, field, v):
+    draw_indicator_light(lamp, field is not None and getattr(v, field))
 
 # ================= TURN SIGNALS =================
-def draw_turn_signals():
-    signal_y = 400
+def build_turn_signals():
     arrow_size = 40
-    
-    if (left or hazard) and blink_state:
-        x_pos = 120
-        
-        points = [
-            x_pos-arrow_size, signal_y,
-            x_pos, signal_y-arrow_size//2,
-            x_pos, signal_y-arrow_size//4,
-            x_pos+arrow_size//2, signal_y-arrow_size//4,
-            x_pos+arrow_size//2, signal_y+arrow_size//4,
-            x_pos, signal_y+arrow_size//4,
-            x_pos, signal_y+arrow_size//2
-        ]
-        
-        # Glow layers
-        points_glow = [p-2 if i % 2 == 0 else p for i, p in enumerate(points)]
-        canvas.create_polygon(points_glow, fill="#00aa00", outline="")
-        points_glow2 = [p-1 if i % 2 == 0 else p for i, p in enumerate(points)]
-        canvas.create_polygon(points_glow2, fill="#00ff00", outline="")
-        
+
+    scene.place("left_turn")
+    x_pos, signal_y = scene.points["left_turn"]
+    points = [
+        x_pos-arrow_size, signal_y,
+        x_pos, signal_y-arrow_size//2,
+        x_pos, signal_y-arrow_size//4,
+        x_pos+arrow_size//2, signal_y-arrow_size//4,
+        x_pos+arrow_size//2, signal_y+arrow_size//4,
+        x_pos, signal_y+arrow_size//4,
+        x_pos, signal_y+arrow_size//2
+    ]
+
+    # Glow layers
+    points_glow = [p-2 if i % 2 == 0 else p for i, p in enumerate(points)]
+    points_glow2 = [p-1 if i % 2 == 0 else p for i, p in enumerate(points)]
+    turn_items["left"] = [
+        scene.dynamic("polygon", points_glow, fill="#00aa00", outline="", state="hidden"),
+        scene.dynamic("polygon", points_glow2, fill="#00ff00", outline="", state="hidden"),
         # Main arrow
-        canvas.create_polygon(points, fill="#00ff00", outline="")
-    
-    if (right or hazard) and blink_state:
-        x_pos = 1480
-        
-        points = [
-            x_pos+arrow_size, signal_y,
-            x_pos, signal_y-arrow_size//2,
-            x_pos, signal_y-arrow_size//4,
-            x_pos-arrow_size//2, signal_y-arrow_size//4,
-            x_pos-arrow_size//2, signal_y+arrow_size//4,
-            x_pos, signal_y+arrow_size//4,
-            x_pos, signal_y+arrow_size//2
-        ]
-        
-        # Glow layers
-        points_glow = [p+2 if i % 2 == 0 else p for i, p in enumerate(points)]
-        canvas.create_polygon(points_glow, fill="#00aa00", outline="")
-        points_glow2 = [p+1 if i % 2 == 0 else p for i, p in enumerate(points)]
-        canvas.create_polygon(points_glow2, fill="#00ff00", outline="")
-        
+        scene.dynamic("polygon", points, fill="#00ff00", outline="", state="hidden"),
+    ]
+
+    scene.place("right_turn")
+    x_pos, signal_y = scene.points["right_turn"]
+    points = [
+        x_pos+arrow_size, signal_y,
+        x_pos, signal_y-arrow_size//2,
+        x_pos, signal_y-arrow_size//4,
+        x_pos-arrow_size//2, signal_y-arrow_size//4,
+        x_pos-arrow_size//2, signal_y+arrow_size//4,
+        x_pos, signal_y+arrow_size//4,
+        x_pos, signal_y+arrow_size//2
+    ]
+
+    # Glow layers
+    points_glow = [p+2 if i % 2 == 0 else p for i, p in enumerate(points)]
+    points_glow2 = [p+1 if i % 2 == 0 else p for i, p in enumerate(points)]
+    turn_items["right"] = [
+        scene.dynamic("polygon", points_glow, fill="#00aa00", outline="", state="hidden"),
+        scene.dynamic("polygon", points_glow2, fill="#00ff00", outline="", state="hidden"),
         # Main arrow
-        canvas.create_polygon(points, fill="#00ff00", outline="")
+        scene.dynamic("polygon", points, fill="#00ff00", outline="", state="hidden"),
+    ]
+    subscribe(draw_turn_signals, "left", "right", "hazard", "blink")
+
+def draw_turn_signals(v):
+    left_on = (v.left or v.hazard) and blink_state
+    right_on = (v.right or v.hazard) and blink_state
+
+    for item in turn_items["left"]:
+        scene.show(item, left_on)
+    for item in turn_items["right"]:
+        scene.show(item, right_on)
 
 # ================= CONTROLS DISPLAY =================
-def draw_controls_help():
+def build_controls_help():
     """Display keyboard controls on screen"""
-    help_x = W - 200
-    help_y = 100
-    
-    canvas.create_text(help_x, help_y, text="CONTROLS",
-                      fill="#6b7280", font=("Arial", 12, "bold"))
-    
+    help_x, help_y = scene.points["controls"]
+
+    scene.static("text", help_x, help_y, text="CONTROLS",
+                 fill="#6b7280", font=("Arial", 12, "bold"))
+
     controls = [
         "E - Engine On/Off",
         "G - Change Gear",
@@ -1133,138 +2643,1954 @@ def draw_controls_help():
         "D - Door",
         "T - Seatbelt"
     ]
-    
+
     for i, text in enumerate(controls):
-        canvas.create_text(help_x, help_y + 25 + i*20, text=text,
-                          fill="#4a4a4a", font=("Arial", 9))
+        scene.static("text", help_x, help_y + 25 + i*20, text=text,
+                     fill="#4a4a4a", font=("Arial", 9))
+
+# ================= PROFILER =================
+# Change to True to time every stage from startup (--profile-out also turns it on,
+# F2 turns it on and shows the overlay)
+PROFILE = False
+PROFILE_SUB_BUCKETS = 8      # Histogram buckets per power of two (~12% resolution)
+PROFILE_HUD_INTERVAL = 0.5   # Seconds between overlay text updates
+
+# Module functions timed when profiling (looked up by name, so call sites stay as they are)
+PROFILE_STAGES = (
+    "render", "apply_can_updates", "play_engine_sound",
+    "draw_speedometer", "draw_tachometer", "draw_widgets", "poll_can",
+)
+
+# Methods timed when profiling, across every instance: (class name, method, stage)
+PROFILE_METHODS = (
+    ("Vehicle", "update_controls", "update_controls"),
+    ("Vehicle", "update_physics", "update_vehicle_physics"),
+    ("Vehicle", "publish", "publish_vehicle_signals"),
+    ("TxScheduler", "tick", "can tx tick"),
+    ("CanRxListener", "on_message_received", "can rx (thread)"),
+)
+
+class StageTimes:
+    """Log-scale histogram of durations in ns; recording never allocates"""
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = array.array("Q", bytes(8 * 65 * PROFILE_SUB_BUCKETS))
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, ns):
+        bits = ns.bit_length()
+        if bits > 4:
+            # Leading bit picks the octave, the next three bits the sub-bucket
+            bucket = bits * PROFILE_SUB_BUCKETS + ((ns >> (bits - 4)) & 7)
+        else:
+            bucket = max(ns, 0)
+        self.counts[bucket] += 1
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+
+    def percentile(self, q):
+        """Approximate q-quantile in ns (middle of the bucket it falls in)"""
+        if not self.count:
+            return 0
+        target = q * self.count
+        seen = 0
+        for bucket, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= target:
+                if bucket < 5 * PROFILE_SUB_BUCKETS:
+                    return bucket
+                bits, sub = divmod(bucket, PROFILE_SUB_BUCKETS)
+                return (16 + 2 * sub + 1) << (bits - 5)
+        return self.max
+
+    def summary(self):
+        ms = 1e-6
+        return {"count": self.count,
+                "mean_ms": self.total / self.count * ms if self.count else 0.0,
+                "p50_ms": self.percentile(0.5) * ms, "p90_ms": self.percentile(0.9) * ms,
+                "p99_ms": self.percentile(0.99) * ms, "max_ms": self.max * ms}
+
+def timed(fn, times):
+    """Wrap a function so every call's duration lands in `times`"""
+    record = times.record
+    perf_counter_ns = time.perf_counter_ns
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = perf_counter_ns()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            record(perf_counter_ns() - start)
+    return wrapper
+
+class Profiler:
+    """Per-stage timings plus the frame interval, and the overlay that shows them"""
+
+    def __init__(self):
+        self.stages = {}
+        self.start = time.perf_counter()
+        self.last_frame = None
+        self.hud_visible = False
+        self.hud_time = 0.0
+        self.hud_counts = (0, 0)
+
+    def stage(self, name):
+        times = self.stages.get(name)
+        if times is None:
+            times = self.stages[name] = StageTimes()
+        return times
+
+    def frame(self):
+        """Mark the start of a rendered frame"""
+        now = time.perf_counter_ns()
+        if self.last_frame is not None:
+            self.stages["frame interval"].record(now - self.last_frame)
+        self.last_frame = now
+
+    def summary(self):
+        return {
+            "duration_s": time.perf_counter() - self.start,
+            "stages": {name: times.summary() for name, times in self.stages.items() if times.count},
+            "can": {"tx_sent": can_tx_stats["sent"], "tx_errors": can_tx_stats["errors"],
+                    **{"rx_" + k: v for k, v in can_rx_stats.items()}},
+            "canvas_items": len(canvas.find_all()) if canvas is not None else None,
+            "frames": dict(render_counts),
+        }
+
+profiler = None
+hud_items = {}
+
+def enable_profiler():
+    """Start timing the PROFILE_STAGES, the PROFILE_METHODS and the audio mixer"""
+    global profiler
+    if profiler is not None:
+        return profiler
+    profiler = Profiler()
+    profiler.stage("frame interval")
+    module = globals()
+    for name in PROFILE_STAGES:
+        module[name] = timed(module[name], profiler.stage(name))
+    for class_name, name, stage in PROFILE_METHODS:
+        cls = module[class_name]
+        setattr(cls, name, timed(getattr(cls, name), profiler.stage(stage)))
+    if mixer is not None:
+        mixer.render = timed(mixer.render, profiler.stage("audio mix (thread)"))
+    return profiler
+
+def write_profile(path):
+    with open(path, "w") as f:
+        json.dump(profiler.summary(), f, indent=2)
+    print(f"Profile written to {path}")
+
+def toggle_profile_hud():
+    enable_profiler().hud_visible = not profiler.hud_visible
+
+def build_profile_hud():
+    hud_items["panel"] = scene.dynamic("rectangle", 10, 10, 430, 150, fill="#000000",
+                                       outline="#00ff88", state="hidden")
+    hud_items["text"] = scene.dynamic("text", 20, 18, text="", anchor="nw", fill="#00ff88",
+                                      font=("Consolas", 10), state="hidden")
+
+def draw_profile_hud():
+    visible = profiler is not None and profiler.hud_visible
+    scene.show(hud_items["panel"], visible)
+    scene.show(hud_items["text"], visible)
+    if not visible:
+        return
+
+    now = time.perf_counter()
+    if now - profiler.hud_time < PROFILE_HUD_INTERVAL:
+        return
+    elapsed = now - profiler.hud_time
+    rx, tx = can_rx_stats["received"], can_tx_stats["sent"]
+    rx_rate = (rx - profiler.hud_counts[0]) / elapsed
+    tx_rate = (tx - profiler.hud_counts[1]) / elapsed
+    profiler.hud_time = now
+    profiler.hud_counts = (rx, tx)
+
+    ms = 1e-6
+    frame = profiler.stages["render"]
+    interval = profiler.stages["frame interval"]
+    lines = [
+        f"frame    p50 {frame.percentile(0.5) * ms:6.2f} ms   p99 {frame.percentile(0.99) * ms:6.2f} ms",
+        f"interval p50 {interval.percentile(0.5) * ms:6.2f} ms   p99 {interval.percentile(0.99) * ms:6.2f} ms",
+        f"canvas   {len(canvas.find_all())} items, {scene.last_touched} touched",
+        f"CAN      rx {rx_rate:7.0f}/s   tx {tx_rate:7.0f}/s",
+    ]
+    # Most expensive stages by total time
+    busiest = sorted((t.total, name) for name, t in profiler.stages.items()
+                     if name not in ("render", "frame interval") and t.count)
+    for total, name in reversed(busiest[-4:]):
+        t = profiler.stages[name]
+        lines.append(f"{name[:22]:22} {t.total / t.count * ms:6.3f} ms avg")
+    scene.config(hud_items["text"], text="\n".join(lines))
+
+# ================= RENDER =================
+# Display rate only - lowering it does not change physics or CAN traffic
+RENDER_FPS = 25                # Fixed rate when ADAPTIVE_FRAME_RATE is off
+ADAPTIVE_FRAME_RATE = True     # Change to False to always render at RENDER_FPS
+RENDER_FPS_ACTIVE = 60         # While anything on the cluster is changing
+RENDER_FPS_IDLE = 5            # Once nothing has changed for RENDER_IDLE_AFTER seconds
+RENDER_IDLE_AFTER = 1.0
+RENDER_SPEED_EPSILON = 0.05    # km/h of needle movement worth a redraw
+RENDER_RPM_EPSILON = 2.0       # rpm of needle movement worth a redraw
+
+render_job = None
+drawn_version = None  # Shown vehicle's version at the last drawn frame, None redraws all
+drawn_speed = drawn_rpm = 0.0
+last_change_time = 0.0
+render_counts = {"drawn": 0, "skipped": 0}
+
+def request_frame():
+    """Render promptly (e.g. after a key press) instead of waiting out an idle frame"""
+    global render_job
+    if frame_wakeup is not None:
+        frame_wakeup.set()  # Async runtime: wake the render task
+        return
+    if root is None or render_job is None:
+        return
+    try:
+        root.after_cancel(render_job)
+        render_job = root.after(1, render_tick)
+    except:
+        pass
+
+def build_scene():
+    """Create every canvas item once, in back-to-front order"""
+    widgets.clear()
+    widget_subscriptions.clear()
+    points = scene.points
+    scene.place("speedometer")
+    build_speedometer(*points["speedometer"], GAUGE_RADIUS)
+    scene.place("tachometer")
+    build_tachometer(*points["tachometer"], GAUGE_RADIUS)
+    scene.place("center")
+    build_center_display(*points["center"])
+    scene.place("indicators")
+    build_all_indicators()
+    build_turn_signals()
+    scene.place("controls")
+    build_controls_help()
+    scene.place("profile_hud")
+    build_profile_hud()
+    scene.built = True
+
+def render():
+    """Draw a frame if anything visible changed; returns seconds until the next one"""
+    global disp_speed, disp_rpm, blink_state, last_blink_time, last_frame_time
+    global drawn_version, drawn_speed, drawn_rpm, last_change_time
+
+    frame_start = time.perf_counter()
+    try:
+        if profiler is not None:
+            profiler.frame()
+
+        # Pick up the newest CAN values once per frame
+        apply_can_updates()
+        v = vehicle
+
+        now = time.perf_counter()
+        frame_k = (now - last_frame_time) / BASE_TICK if last_frame_time else 1.0
+        last_frame_time = now
 
-# ================= RENDER =================
-def render():
-    global disp_speed, disp_rpm, blink_state, blink_counter, last_turn_signal_blink
+        # Engine sound follows the vehicle (mixed in the background)
+        if AUDIO_ENABLED:
+            play_engine_sound(v.rpm, v.throttle)
+
+        # Interpolate between the last two physics states
+        alpha = interpolation_alpha(now)
+        shown_speed = lerp(v.prev_speed, v.speed, alpha)
+        shown_rpm = lerp(v.prev_rpm, v.rpm, alpha)
 
-    try:
-        # Update controls
-        update_controls()
-        
-        # Update physics simulation
-        update_vehicle_physics()
-        
-        # Play engine sound (silently in background)
-        if AUDIO_ENABLED and engine_started and rpm > 500:
-            play_engine_sound(rpm, throttle)
-        
         # Smooth display values with bounds checking
-        disp_speed = max(0, min(260, lerp(disp_speed, speed)))
-        disp_rpm = max(0, min(8000, lerp(disp_rpm, rpm)))
-        
-        blink_counter += 1
-        if blink_counter >= 10:
+        smoothing = lerp_factor(0.15, frame_k)
+        disp_speed = max(0, min(260, lerp(disp_speed, shown_speed, smoothing)))
+        disp_rpm = max(0, min(8000, lerp(disp_rpm, shown_rpm, smoothing)))
+
+        blinked = False
+        if now - last_blink_time >= BLINK_INTERVAL:
             blink_state = not blink_state
-            blink_counter = 0
-            
+            last_blink_time = now
+            blinked = v.left or v.right or v.hazard
+
             # Turn signal sound on state change
-            if AUDIO_ENABLED and blink_state and (left or right):
+            if AUDIO_ENABLED and blink_state and (v.left or v.right):
                 play_turn_signal_sound()
 
-        canvas.delete("all")
-        
-        # Draw all components with error handling
-        draw_speedometer(350, 400, 240)
-        draw_tachometer(1250, 400, 240)
-        draw_center_display(800, 400)
-        draw_all_indicators()
-        draw_turn_signals()
-        draw_controls_help()
-        
+        if not scene.built:
+            build_scene()
+            drawn_version = None
+
+        # Widgets showing a field written since the last drawn frame (all of
+        # them after a rebuild or focus change). Skip the frame entirely if
+        # there are none and the needles didn't move.
+        changed = None if drawn_version is None else v.changes_since(drawn_version)
+        dirty = changed_widgets(changed)
+        needles = (changed is None
+                   or abs(disp_speed - drawn_speed) >= RENDER_SPEED_EPSILON
+                   or abs(disp_rpm - drawn_rpm) >= RENDER_RPM_EPSILON)
+        if needles or dirty or blinked or (profiler is not None and profiler.hud_visible):
+            scene.begin_frame()
+            if needles:
+                points = scene.points
+                draw_speedometer(*points["speedometer"], GAUGE_RADIUS)
+                draw_tachometer(*points["tachometer"], GAUGE_RADIUS)
+                drawn_speed, drawn_rpm = disp_speed, disp_rpm
+            draw_widgets(v, dirty)
+
+            # Blinking alone doesn't count as activity, the blink deadline schedules those frames
+            active = changed is None or scene.touched > 0
+            if blinked and changed is not None:
+                draw_widgets(v, changed_widgets(("blink",)))
+            draw_profile_hud()
+            scene.end_frame()
+
+            drawn_version = v.version
+            if active:
+                last_change_time = now
+            render_counts["drawn"] += 1
+        else:
+            render_counts["skipped"] += 1
+
     except Exception as e:
         print(f"Render error: {e}")
         # Continue rendering even if there's an error
-    
-    # Schedule next frame (40ms = 25 FPS for stability)
+
+    # Time to the next frame, minus the time this one took
+    fps = RENDER_FPS
+    if ADAPTIVE_FRAME_RATE:
+        idle = frame_start - last_change_time >= RENDER_IDLE_AFTER
+        fps = RENDER_FPS_IDLE if idle else RENDER_FPS_ACTIVE
+    next_frame = frame_start + 1.0 / fps
+    if vehicle.left or vehicle.right or vehicle.hazard:
+        next_frame = min(next_frame, last_blink_time + BLINK_INTERVAL)  # Don't blink late
+    return next_frame - time.perf_counter()
+
+def render_tick():
+    """Draw a frame and schedule the next one on the Tk loop"""
+    global render_job
+    delay = render()
     try:
-        root.after(40, render)
+        render_job = root.after(max(1, math.ceil(delay * 1000)), render_tick)
     except:
         pass
 
 # ================= CAN RECEIVER =================
-def read_can():
-    """Listen for external CAN messages with rate limiting"""
-    global speed, rpm, gear, fuel, temp
-    global engine, absw, door, left, right, seatbelt
-    global battery, oil_pressure, parking_brake, high_beam, tpms, airbag
+# Set to False to poll the bus from the Tk loop instead of a receive thread
+CAN_RX_THREAD = True
+CAN_RX_QUEUE_SIZE = 4096  # Decoded updates held between frames
 
-    try:
-        # Process up to 10 messages per cycle to prevent overwhelming
-        for _ in range(10):
-            msg = bus.recv(timeout=0.0001)
-            if msg:
-                # Validate data length
-                if len(msg.data) > 0:
-                    d = msg.data[0]
-                    # Only accept external messages (not our own echoes)
-                    # Add bounds checking for safety
-                    if msg.arbitration_id == 0x110:
-                        speed = max(0, min(260, d))
-                    elif msg.arbitration_id == 0x111:
-                        rpm = max(0, min(8000, d * 100))
-                    elif msg.arbitration_id == 0x112: 
-                        gear_idx = d if d < 4 else 0
-                        gear = ["P","R","N","D"][gear_idx]
-                    elif msg.arbitration_id == 0x113:
-                        fuel = max(0, min(100, d))
-                    elif msg.arbitration_id == 0x114:
-                        temp = max(0, min(150, d))
-            else:
-                break  # No more messages, exit loop
-    except Exception as e:
+can_rx_stats = {"received": 0, "decoded": 0, "coalesced": 0, "dropped": 0}
+rx_listeners = []  # One per bus
+rx_notifiers = []
+
+def apply_can_update(v, field, value):
+    """Write a decoded signal into a vehicle's state"""
+    setattr(v, field, value)
+
+class CanRxListener(can.Listener):
+    """Drains a bus on the Notifier thread into a bounded update queue
+
+    Each frame is decoded for every vehicle on the bus (with its ID offset);
+    queued updates are (vehicle, field, value).
+    """
+
+    def __init__(self, fleet=None, maxlen=CAN_RX_QUEUE_SIZE):
+        self.vehicles = fleet if fleet is not None else [vehicle]
+        # deque append/popleft are atomic, so no lock is needed between threads
+        self.queue = collections.deque(maxlen=maxlen)
+
+    def on_message_received(self, msg):
+        can_rx_stats["received"] += 1
+        if recorder is not None:
+            recorder.record(clock(), msg, True)
+        queue = self.queue
+        decoded = False
+        for v in self.vehicles:
+            updates = decode_can_message(msg, v.id_offset)
+            if updates is None:
+                continue
+            decoded = True
+            for field, value in updates:
+                if len(queue) == queue.maxlen:
+                    can_rx_stats["dropped"] += 1  # Oldest update is evicted
+                queue.append((v, field, value))
+        if decoded:
+            can_rx_stats["decoded"] += 1
+
+    def on_error(self, exc):
         pass  # Silently handle CAN errors
 
+def apply_can_updates():
+    """Apply the newest value per signal received since the last frame"""
+    for listener in rx_listeners:
+        latest = {}
+        drained = 0
+        queue = listener.queue
+        while True:
+            try:
+                v, field, value = queue.popleft()
+            except IndexError:
+                break
+            latest[v, field] = value
+            drained += 1
+
+        can_rx_stats["coalesced"] += drained - len(latest)
+        for (v, field), value in latest.items():
+            apply_can_update(v, field, value)
+
+def start_can_receiver():
+    """Receive on a background thread per bus at line rate"""
+    for rx_bus, fleet in vehicle_buses().items():
+        listener = CanRxListener(fleet)
+        rx_listeners.append(listener)
+        rx_notifiers.append(can.Notifier(rx_bus, [listener]))
+
+def stop_can_receiver():
+    for notifier in rx_notifiers:
+        notifier.stop()
+    print(f"CAN rx: {can_rx_stats['received']} received, "
+          f"{can_rx_stats['coalesced']} coalesced, {can_rx_stats['dropped']} dropped")
+
+def receive_frame(msg, fleet):
+    """Decode a frame for every vehicle on its bus and apply it right away;
+    True if any of them took it"""
+    can_rx_stats["received"] += 1
+    if recorder is not None:
+        recorder.record(clock(), msg, True)
+    decoded = False
+    for v in fleet:
+        updates = decode_can_message(msg, v.id_offset)
+        if updates is not None:
+            decoded = True
+            for field, value in updates:
+                apply_can_update(v, field, value)
+    if decoded:
+        can_rx_stats["decoded"] += 1
+    return decoded
+
+def poll_can(max_messages=10):
+    """Decode and apply whatever input frames are waiting on each bus"""
+    for rx_bus, fleet in vehicle_buses().items():
+        try:
+            # Process a bounded number of messages per call to prevent overwhelming
+            for _ in range(max_messages):
+                msg = rx_bus.recv(timeout=0.0001)
+                if msg:
+                    receive_frame(msg, fleet)
+                else:
+                    break  # No more messages, exit loop
+        except Exception as e:
+            pass  # Silently handle CAN errors
+
+def read_can():
+    """Poll for external CAN messages from the Tk loop (CAN_RX_THREAD = False)"""
+    poll_can()
+
     # Schedule next CAN read
     try:
         root.after(5, read_can)
     except:
         pass
 
-# ================= START =================
-print("=== Interactive Dashboard Started ===")
-if AUDIO_ENABLED:
-    print("✓ Audio enabled - Engine and indicator sounds active")
-else:
-    print("ℹ Audio disabled for optimal performance")
-    if not ENABLE_AUDIO_ATTEMPT:
-        print("  To enable audio: Edit main-dash.py and set ENABLE_AUDIO_ATTEMPT = True")
-print("")
-print("Controls:")
-print("  E - Engine Start/Stop")
-print("  G - Change Gear (P→R→N→D)")
-print("  ↑/W - Accelerate")
-print("  ↓ - Brake")
-print("  ← - Left Turn Signal")
-print("  → - Right Turn Signal")
-print("  H - Hazard Lights")
-print("  B - High Beam")
-print("  P - Parking Brake")
-print("  D - Door Open/Close")
-print("  T - Seatbelt Toggle")
-print("")
-print("CAN Messages being sent on vcan0:")
-print("  0x100 - Speed")
-print("  0x101 - RPM")
-print("  0x102 - Gear")
-print("  0x103 - Fuel")
-print("  0x104 - Temperature")
-print("  0x200-0x208 - Warning Indicators")
-print("  0x300-0x302 - Turn Signals & Door")
-print("")
-print("Use 'candump vcan0' to monitor CAN traffic")
-
-render()
-read_can()
-root.mainloop()
-
-# Cleanup audio on exit
-if AUDIO_ENABLED:
+# ================= RECORDER =================
+# Built-in capture of every sent/received frame plus physics snapshots (--record).
+# Frames go into a preallocated ring of fixed-size records; a background thread
+# writes them out with can.Logger (.blf, .asc, .log, ...), so memory stays at
+# RECORDER_CAPACITY records however long the run is.
+RECORDER_CAPACITY = 65536      # Records held in memory (24 bytes each)
+RECORDER_FLUSH_INTERVAL = 0.5  # Seconds between writer passes
+RECORDER_STATE_INTERVAL = 0.1  # Seconds between physics snapshots
+RECORDER_STATE_ID = 0x7F0      # Snapshots are logged as frames with this ID...
+RECORDER_STATE_CHANNEL = 1     # ...on their own channel (shows as channel 2 in ASC/BLF)
+
+# timestamp, arbitration id, dlc, flags (1 = extended, 2 = received), channel, data
+RECORD = struct.Struct("<dIBBBx8s")
+RECORD_EXTENDED = 1
+RECORD_RX = 2
+
+# Snapshot payload layout (same resolution as the packed powertrain frame)
+RECORDER_STATE_SIGNALS = [
+    Signal(RECORDER_STATE_ID, "speed", start=0, bits=16, scale=0.01, minimum=0, maximum=655.35),
+    Signal(RECORDER_STATE_ID, "rpm", start=16, bits=16, minimum=0),
+    Signal(RECORDER_STATE_ID, "fuel", start=32, bits=8, scale=0.5, minimum=0, maximum=100),
+    Signal(RECORDER_STATE_ID, "temp", start=40, bits=8, offset=-40, minimum=-40, maximum=215),
+    Signal(RECORDER_STATE_ID, "throttle", start=48, bits=8, minimum=0, maximum=100),
+    Signal(RECORDER_STATE_ID, "brake", start=56, bits=8, minimum=0, maximum=100),
+]
+recorder_state_encoders = compile_encoders(RECORDER_STATE_SIGNALS)
+
+recorder = None
+
+class Recorder:
+    """Ring buffer of binary frame records drained to a log file by a writer thread"""
+
+    def __init__(self, path, capacity=RECORDER_CAPACITY, flush_interval=RECORDER_FLUSH_INTERVAL):
+        self.path = path
+        self.capacity = capacity
+        self.ring = bytearray(capacity * RECORD.size)
+        self.written = 0   # Records ever put in the ring
+        self.flushed = 0   # Records handed to the logger (or lost)
+        self.dropped = 0   # Overwritten before the writer got to them
+        self.last_state = None
+        self.lock = threading.Lock()
+        self.logger = can.Logger(path)
+        self.flush_interval = flush_interval
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="recorder", daemon=True)
+        self.thread.start()
+
+    def record(self, timestamp, msg, rx):
+        """Copy one frame into the ring (no allocation; callable from any thread)"""
+        flags = (RECORD_EXTENDED if msg.is_extended_id else 0) | (RECORD_RX if rx else 0)
+        with self.lock:
+            RECORD.pack_into(self.ring, (self.written % self.capacity) * RECORD.size,
+                             timestamp, msg.arbitration_id, msg.dlc, flags, 0, msg.data)
+            self.written += 1
+
+    def record_state(self, timestamp):
+        """Snapshot the physics state at most every RECORDER_STATE_INTERVAL"""
+        if self.last_state is not None and timestamp - self.last_state < RECORDER_STATE_INTERVAL:
+            return
+        self.last_state = timestamp
+        data = encode_message(RECORDER_STATE_ID, recorder_state_encoders)
+        with self.lock:
+            RECORD.pack_into(self.ring, (self.written % self.capacity) * RECORD.size,
+                             timestamp, RECORDER_STATE_ID, len(data), 0, RECORDER_STATE_CHANNEL, data)
+            self.written += 1
+
+    def _run(self):
+        while not self.stopping.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """Hand everything recorded since the last pass to the logger"""
+        size = RECORD.size
+        with self.lock:
+            end = self.written
+            start = max(self.flushed, end - self.capacity)
+            self.dropped += start - self.flushed
+            first = (start % self.capacity) * size
+            last = (end % self.capacity) * size
+            if end - start == self.capacity or (end > start and last <= first):
+                chunk = self.ring[first:] + self.ring[:last]  # Wrapped around
+            else:
+                chunk = self.ring[first:last]
+        self.flushed = end
+
+        for offset in range(0, len(chunk), size):
+            timestamp, msg_id, dlc, flags, channel, data = RECORD.unpack_from(chunk, offset)
+            self.logger.on_message_received(can.Message(
+                timestamp=timestamp, arbitration_id=msg_id, data=data[:dlc], dlc=dlc,
+                is_extended_id=bool(flags & RECORD_EXTENDED), is_rx=bool(flags & RECORD_RX),
+                channel=channel))
+
+    def close(self):
+        self.stopping.set()
+        self.thread.join()
+        self.flush()
+        self.logger.stop()
+        print(f"Recorder: {self.flushed - self.dropped} records written to {self.path}, "
+              f"{self.dropped} dropped ({self.capacity * RECORD.size // 1024} KiB ring)")
+
+def start_recorder(path):
+    global recorder
+    recorder = Recorder(path)
+
+def stop_recorder():
+    global recorder
+    if recorder is not None:
+        recorder.close()
+        recorder = None
+
+# ================= STATE EXPORT =================
+# Live vehicle state published into a memory-mapped file (--export-state) for
+# other processes: bench tools, loggers, a second display (--view-state). Each
+# vehicle has a fixed-size record guarded by a seqlock: the writer makes the
+# sequence odd, updates the record and makes it even again; a reader retries
+# until it sees the same even sequence before and after its copy. Readers never
+# block the writer. Put the file on /dev/shm to keep it out of the page cache.
+STATE_MAGIC = b"DASHSTAT"
+STATE_LAYOUT_VERSION = 1
+STATE_HEADER = struct.Struct("<8sIIII")  # magic, layout version, vehicles, record size, writer pid
+STATE_READ_RETRIES = 1000  # Give up on a snapshot after this many torn reads
+
+# Doubles after the sequence number and Vehicle.version, in record order. timestamp
+# is wall time; clock is simulation time (they differ headless with --time-scale).
+# disp_speed/disp_rpm are the smoothed needles of the vehicle in the window, NaN
+# for the others and without a window.
+STATE_VALUES = ("timestamp", "clock", "speed", "rpm", "disp_speed", "disp_rpm",
+                "fuel", "temp", "odo", "trip", "outside_temp", "throttle", "brake")
+# Bit n of the flags word
+STATE_FLAGS = ("engine_started", "engine", "absw", "door", "seatbelt", "battery",
+               "oil_pressure", "left", "right", "hazard", "parking_brake",
+               "high_beam", "tpms", "airbag")
+# What --view-state copies into its own vehicles
+STATE_MIRRORED = ("speed", "rpm", "fuel", "temp", "odo", "trip", "outside_temp",
+                  "throttle", "brake") + STATE_FLAGS
+# sequence, version, values, flags, id_offset, gear
+STATE_RECORD = struct.Struct(f"<QQ{len(STATE_VALUES)}dII1s7x")
+STATE_SEQUENCE = struct.Struct("<Q")
+
+VehicleState = collections.namedtuple(
+    "VehicleState", ("version",) + STATE_VALUES + ("id_offset", "gear") + STATE_FLAGS)
+
+state_export = None  # StateExporter while --export-state is on
+state_view = None    # StateReader driving the vehicles with --view-state
+
+class StateExporter:
+    """Writer side: one seqlocked record per vehicle in a shared mapping"""
+
+    def __init__(self, path, fleet):
+        self.path = path
+        self.fleet = list(fleet)
+        self.sequences = [0] * len(self.fleet)
+        size = STATE_HEADER.size + len(self.fleet) * STATE_RECORD.size
+        # Resized in place rather than truncated, so readers of a previous run
+        # with as many vehicles keep a valid mapping
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            os.ftruncate(fd, size)
+            self.map = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        # Carry on from the sequence numbers a previous run left behind: restarting
+        # at 0 could repeat a number a reader saw before a torn copy
+        for index in range(len(self.fleet)):
+            sequence = STATE_SEQUENCE.unpack_from(self.map, STATE_HEADER.size + index * STATE_RECORD.size)[0]
+            self.sequences[index] = sequence + (sequence & 1)  # Odd if that run died mid-update
+        for index, v in enumerate(self.fleet):
+            self.publish_vehicle(index, v, clock(), math.nan, math.nan)
+        # Magic last, so a reader never trusts a half-initialized file
+        STATE_HEADER.pack_into(self.map, 0, STATE_MAGIC, STATE_LAYOUT_VERSION,
+                               len(self.fleet), STATE_RECORD.size, os.getpid())
+
+    def publish(self, now):
+        """Copy every vehicle's current state into its record"""
+        shown = vehicle if root is not None else None
+        for index, v in enumerate(self.fleet):
+            if v is shown:
+                self.publish_vehicle(index, v, now, disp_speed, disp_rpm)
+            else:
+                self.publish_vehicle(index, v, now, math.nan, math.nan)
+
+    def publish_vehicle(self, index, v, now, shown_speed, shown_rpm,
+                        _pack=STATE_RECORD.pack_into, _seq=STATE_SEQUENCE.pack_into):
+        offset = STATE_HEADER.size + index * STATE_RECORD.size
+        flags = 0
+        for bit, name in enumerate(STATE_FLAGS):
+            if getattr(v, name):
+                flags |= 1 << bit
+        sequence = self.sequences[index] + 1
+        _seq(self.map, offset, sequence)  # Odd: update in progress
+        _pack(self.map, offset, sequence, v.version, time.time(), now, v.speed, v.rpm,
+              shown_speed, shown_rpm, v.fuel, v.temp, v.odo, v.trip, v.outside_temp,
+              v.throttle, v.brake, flags, v.id_offset, v.gear.encode())
+        sequence += 1
+        _seq(self.map, offset, sequence)
+        self.sequences[index] = sequence
+
+    def close(self):
+        self.map.close()
+
+class StateReader:
+    """Reader side: consistent snapshots of an --export-state file, lock-free"""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < STATE_HEADER.size:
+                raise ValueError(f"{path}: not a dashboard state file")
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, layout, self.count, record_size, self.pid = STATE_HEADER.unpack_from(self.map, 0)
+        if magic != STATE_MAGIC:
+            raise ValueError(f"{path}: not a dashboard state file")
+        if layout != STATE_LAYOUT_VERSION or record_size != STATE_RECORD.size:
+            raise ValueError(f"{path}: state layout {layout} ({record_size} byte records), "
+                             f"expected {STATE_LAYOUT_VERSION} ({STATE_RECORD.size})")
+        if self.count < 1:
+            raise ValueError(f"{path}: exports no vehicles")
+        if len(self.map) < STATE_HEADER.size + self.count * STATE_RECORD.size:
+            raise ValueError(f"{path}: truncated, expected {self.count} records")
+        self.path = path
+        self.applied = [None] * self.count  # Sequence last applied to each vehicle
+
+    def sequence(self, index):
+        """Bumped twice per update; cheap change check before taking a snapshot"""
+        return STATE_SEQUENCE.unpack_from(self.map, STATE_HEADER.size + index * STATE_RECORD.size)[0]
+
+    def read(self, index):
+        """(sequence, raw record fields) read consistently, or None if the writer kept interfering"""
+        offset = STATE_HEADER.size + index * STATE_RECORD.size
+        for _ in range(STATE_READ_RETRIES):
+            record = STATE_RECORD.unpack_from(self.map, offset)
+            if not record[0] & 1 and STATE_SEQUENCE.unpack_from(self.map, offset)[0] == record[0]:
+                return record
+            time.sleep(0)  # Let the writer finish
+        return None
+
+    def snapshot(self, index=0):
+        """VehicleState of vehicle `index`, or None if no consistent copy could be read"""
+        record = self.read(index)
+        return None if record is None else self.state(record)
+
+    @staticmethod
+    def state(record):
+        flags = record[-3]
+        return VehicleState(*record[1:-3], record[-2], record[-1].decode(),
+                            *(bool(flags >> bit & 1) for bit in range(len(STATE_FLAGS))))
+
+    def apply(self, fleet):
+        """Mirror the exported state into local vehicles whose record changed since the last call"""
+        for index, v in enumerate(fleet[:self.count]):
+            if self.sequence(index) == self.applied[index]:
+                continue
+            record = self.read(index)
+            if record is None:
+                continue
+            self.applied[index] = record[0]
+            state = self.state(record)
+            for name in STATE_MIRRORED:
+                setattr(v, name, getattr(state, name))
+            if state.gear in GEARS:
+                v.gear, v.gear_index = state.gear, GEARS.index(state.gear)
+
+    def close(self):
+        self.map.close()
+
+def start_state_export(path):
+    global state_export
+    state_export = StateExporter(path, vehicles)
+    print(f"Exporting state of {len(vehicles)} vehicle{'s' if len(vehicles) > 1 else ''} to {path} "
+          f"({STATE_RECORD.size} byte records)")
+
+def stop_state_export():
+    global state_export
+    if state_export is not None:
+        state_export.close()
+        state_export = None
+
+def open_state_view(path):
+    """Show another process's --export-state file; no bus, physics is paused"""
+    global state_view
     try:
-        audio.terminate()
-    except:
-        pass
\ No newline at end of file
+        state_view = StateReader(path)
+    except (OSError, ValueError) as e:
+        raise SystemExit(f"⚠ Can't view exported state: {e}")
+    make_vehicles([None] * state_view.count)
+    print(f"Viewing {path}: {state_view.count} vehicle{'s' if state_view.count > 1 else ''} "
+          f"exported by pid {state_view.pid}")
+
+# ================= REPLAY =================
+# Play a recorded drive (.log candump, .asc, .blf, ...) into the dashboard through
+# the normal receive path (--replay). Frames are streamed from the file; a
+# memory-mapped sidecar index (<file>.idx) of timestamps makes seeking a bisect.
+REPLAY_INDEX_MAGIC = b"DASHIDX1"
+REPLAY_INDEX_HEADER = struct.Struct("<8sqqq")  # magic, source mtime_ns, source size, frames
+
+replaying = False
+
+class ReplayIndex:
+    """Timestamp of every frame in a log, plus line offsets for candump .log files
+
+    The index is written once next to the log and memory-mapped afterwards, so
+    opening a multi-gigabyte log doesn't re-read it or hold it in memory.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.map = None
+        stat = os.stat(path)
+        key = (REPLAY_INDEX_MAGIC, stat.st_mtime_ns, stat.st_size)
+        index_path = path + ".idx"
+        try:
+            self._map(index_path, key)
+        except (OSError, ValueError, struct.error):
+            timestamps, offsets = self._scan()
+            try:
+                with open(index_path + ".tmp", "wb") as f:
+                    f.write(REPLAY_INDEX_HEADER.pack(*key, len(timestamps)))
+                    timestamps.tofile(f)
+                    offsets.tofile(f)
+                os.replace(index_path + ".tmp", index_path)
+                self._map(index_path, key)
+            except OSError:
+                self.timestamps, self.offsets = timestamps, offsets  # Read-only location
+
+    def _map(self, index_path, key):
+        with open(index_path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, mtime, size, count = REPLAY_INDEX_HEADER.unpack_from(self.map)
+            if (magic, mtime, size) != key:
+                raise ValueError("stale index")
+            if count < 0 or len(self.map) < REPLAY_INDEX_HEADER.size + 16 * count:
+                raise ValueError("truncated index")
+        except (ValueError, struct.error):
+            self.map.close()
+            self.map = None
+            raise
+        body = memoryview(self.map)[REPLAY_INDEX_HEADER.size:]
+        self.timestamps = body[:count * 8].cast("d")
+        self.offsets = body[count * 8:count * 16].cast("q")
+
+    def _scan(self):
+        """One streaming pass over the log"""
+        timestamps = array.array("d")
+        offsets = array.array("q")
+        if self.path.endswith(".log"):
+            # candump lines are self-contained, so remember where each one starts
+            offset = 0
+            with open(self.path, "rb") as f:
+                for line in f:
+                    if line.startswith(b"("):
+                        timestamps.append(float(line[1:line.index(b")")]))
+                        offsets.append(offset)
+                    offset += len(line)
+        else:
+            for msg in can.LogReader(self.path):
+                timestamps.append(msg.timestamp)
+                offsets.append(-1)
+        return timestamps, offsets
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def find(self, timestamp):
+        """Position of the first frame at or after `timestamp`"""
+        return bisect.bisect_left(self.timestamps, timestamp)
+
+    def frames(self, first=0):
+        """Lazily read frames from position `first` on; close() the generator to
+        release the file"""
+        if first >= len(self):
+            return
+        offset = self.offsets[first]
+        if offset >= 0:
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                yield from can.io.CanutilsLogReader(io.TextIOWrapper(f))
+        else:
+            # No offsets for ASC (its header sets the timestamp base) or BLF (frames
+            # sit in compressed containers): these are read front to back up to `first`
+            with can.LogReader(self.path) as reader:
+                yield from itertools.islice(reader, first, None)
+
+    def close(self):
+        if self.map is not None:
+            self.timestamps.release()
+            self.offsets.release()
+            self.map.close()
+            self.map = None
+
+class ReplayBus(can.BusABC):
+    """A bus that receives the frames of a log file at their recorded pace
+
+    speed is a multiple of real time; 0 replays as fast as frames are read.
+    Anything sent is dropped.
+    """
+
+    def __init__(self, path, speed=1.0, start=0.0, **kwargs):
+        self.index = ReplayIndex(path)
+        self.channel_info = f"replay of {path}"
+        self.speed = speed
+        self.finished = False
+        self.pending = None
+        self.frames = None
+        super().__init__(channel=path, **kwargs)
+        self.seek(start)
+
+    def seek(self, seconds):
+        """Continue from `seconds` into the log"""
+        first = self.index.find(self.index.timestamps[0] + seconds) if len(self.index) else 0
+        if self.frames is not None:
+            self.frames.close()
+        self.frames = self.index.frames(first)
+        self.log_start = self.index.timestamps[first] if first < len(self.index) else 0.0
+        self.origin = time.perf_counter()
+        self.pending = None
+        self.finished = first >= len(self.index)
+
+    def _recv_internal(self, timeout):
+        msg = self.pending
+        if msg is None:
+            msg = next(self.frames, None)
+            if msg is None:
+                self.finished = True
+                if timeout:
+                    time.sleep(timeout)
+                return None, False
+
+        if self.speed > 0:
+            wait = self.origin + (msg.timestamp - self.log_start) / self.speed - time.perf_counter()
+            if wait > 0:
+                if timeout is not None and wait > timeout:
+                    self.pending = msg  # Not due yet, hand it out on a later call
+                    time.sleep(timeout)
+                    return None, False
+                time.sleep(wait)
+        self.pending = None
+        return msg, False
+
+    def send(self, msg, timeout=None):
+        pass  # Replay is receive-only
+
+    def shutdown(self):
+        super().shutdown()
+        self.frames.close()  # Releases the log; next() on it now returns None
+        self.index.close()
+
+def replay_signals():
+    """Inputs plus everything the dashboard itself sends, so its own recordings play back"""
+    inputs = {sig.msg_id for sig in CAN_SIGNALS}
+    outputs = {}
+    for sig in CAN_TX_SIGNALS + PACKED_TX_SIGNALS + RECORDER_STATE_SIGNALS:
+        if sig.msg_id not in inputs:
+            outputs[sig.msg_id, sig.field] = sig
+    return CAN_SIGNALS + list(outputs.values())
+
+def open_replay(path, speed=1.0, start=0.0):
+    """Use a log file as the bus; physics is paused so the log drives the gauges"""
+    global bus, can_decoders, replaying
+    can_decoders = compile_signals(replay_signals())
+    bus = ReplayBus(path, speed=speed, start=start,
+                    can_filters=can_input_filters() if CAN_RX_FILTERS else None)
+    replaying = True
+    print(f"Replaying {path}: {len(bus.index)} frames at "
+          f"{'max speed' if speed <= 0 else f'{speed:g}x'}")
+    return bus
+
+def run_replay(args):
+    """Replay without Tk; at --replay-speed 0 this benchmarks the receive/decode path"""
+    open_replay(args.replay, args.replay_speed, args.replay_start)
+    if args.record:
+        start_recorder(args.record)
+    if args.export_state:
+        start_state_export(args.export_state)
+    if PROFILE or args.profile_out:
+        enable_profiler()
+    start = time.perf_counter()
+    try:
+        while not bus.finished:
+            poll_can(max_messages=1000)
+            if state_export is not None:
+                state_export.publish(clock())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        bus.shutdown()
+        stop_recorder()
+        stop_state_export()
+    elapsed = time.perf_counter() - start
+    received = can_rx_stats["received"]
+    print(f"Replay: {received} frames ({can_rx_stats['decoded']} decoded) in {elapsed:.2f} s, "
+          f"{received / max(elapsed, 1e-9):.0f} frames/s, "
+          f"speed {vehicle.speed:.0f} km/h, rpm {vehicle.rpm:.0f}, gear {vehicle.gear}")
+    if args.profile_out:
+        write_profile(args.profile_out)
+
+# ================= HEADLESS MODE =================
+class KeyEvent:
+    """Stand-in for a Tk key event when inputs come from a script"""
+
+    def __init__(self, keysym):
+        self.keysym = keysym
+
+class SimClock:
+    """Simulated wall clock, advanced by the headless loop"""
+
+    def __init__(self, start):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, dt):
+        self.now += dt
+
+class LogSink:
+    """Bus stand-in that writes sent frames to a python-can log file"""
+
+    def __init__(self, path):
+        self.logger = can.Logger(path)
+
+    def send(self, msg, timeout=None):
+        msg.timestamp = clock()
+        msg.is_rx = False  # Loggers mark frames Rx unless told otherwise
+        self.logger.on_message_received(msg)
+
+    def recv(self, timeout=None):
+        return None
+
+    def shutdown(self):
+        self.logger.stop()
+
+def open_log_sink(path):
+    global bus
+    bus = LogSink(path)
+    return bus
+
+def open_vehicle_buses(args):
+    """Open every --channel (comma-separated) and spread --vehicles over them
+
+    Vehicles that share a channel are --id-stride apart in ID space.
+    """
+    global bus
+    channels = args.channel.split(",")
+    count = max(1, args.vehicles)
+    assigned = [channels[i % len(channels)] for i in range(count)]
+    id_stride = args.id_stride
+    if id_stride is None:
+        id_stride = VEHICLE_ID_STRIDE if len(channels) < count else 0
+    buses = {}
+    for channel in channels:
+        sharing = assigned.count(channel)
+        buses[channel] = open_bus(channel, args.interface, args.receive_own,
+                                  [i * id_stride for i in range(sharing)])
+    bus = buses[channels[0]]
+    make_vehicles([buses[channel] for channel in assigned], id_stride)
+
+def close_vehicle_buses():
+    for v in vehicles:
+        v.tx.stop()
+    for vehicle_bus in vehicle_buses():
+        vehicle_bus.shutdown()
+
+def load_input_script(stream):
+    """Parse '<seconds> <press|release|tap> <keysym>' lines, sorted by time"""
+    events = []
+    for line_no, line in enumerate(stream, 1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        parts = line.split()
+        if len(parts) != 3 or parts[1] not in ("press", "release", "tap"):
+            raise ValueError(f"line {line_no}: expected '<seconds> <press|release|tap> <key>'")
+        events.append((float(parts[0]), parts[1], parts[2]))
+    events.sort(key=lambda event: event[0])
+    return events
+
+def apply_input_event(action, key, fleet=None):
+    """Scripted inputs drive every vehicle unless told otherwise"""
+    for v in fleet if fleet is not None else vehicles:
+        if action in ("press", "tap"):
+            v.press(key)
+        if action in ("release", "tap"):
+            v.release(key)
+
+def run_headless(args):
+    """Run controls, physics and CAN I/O without Tk, optionally faster than real time"""
+    global clock
+
+    events = []
+    if args.script:
+        if args.script == "-":
+            events = load_input_script(sys.stdin)
+        else:
+            with open(args.script) as f:
+                events = load_input_script(f)
+
+    duration = args.duration
+    if duration is None:
+        duration = events[-1][0] + 1.0 if events else 60.0
+
+    if args.log_out:
+        make_vehicles([open_log_sink(args.log_out)] * max(1, args.vehicles), args.id_stride)
+    else:
+        open_vehicle_buses(args)
+
+    sim_clock = SimClock(time.time())
+    clock = sim_clock
+    if args.record:
+        start_recorder(args.record)
+    if args.export_state:
+        start_state_export(args.export_state)
+
+    # Bus-timed cyclic frames only make sense when simulated time is real time
+    if TX_PERIODIC_MODE or args.tx_periodic:
+        if args.time_scale == 1.0 and not args.log_out:
+            for v in vehicles:
+                v.tx.use_bus_periodic = True
+        else:
+            print("⚠ Periodic send mode needs --time-scale 1 on a real bus, timing frames in Python")
+
+    if PROFILE or args.profile_out:
+        enable_profiler()
+
+    steps = int(duration / PHYSICS_DT)
+    next_event = 0
+    simulated = 0.0
+    real_start = time.perf_counter()
+
+    print(f"Headless: {len(vehicles)} vehicle{'s' if len(vehicles) > 1 else ''}, "
+          f"{duration:.1f} s simulated at "
+          f"{'max speed' if args.time_scale <= 0 else f'{args.time_scale:g}x'}")
+
+    try:
+        for step in range(steps):
+            sim_seconds = step * PHYSICS_DT
+
+            # Scripted inputs due by now
+            while next_event < len(events) and events[next_event][0] <= sim_seconds:
+                _, action, key = events[next_event]
+                apply_input_event(action, key)
+                next_event += 1
+
+            poll_can(max_messages=100)
+            step_simulation(PHYSICS_DT)
+            sim_clock.advance(PHYSICS_DT)
+            simulated += PHYSICS_DT
+
+            if args.time_scale > 0:
+                delay = real_start + (step + 1) * PHYSICS_DT / args.time_scale - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        close_vehicle_buses()
+        stop_recorder()
+        stop_state_export()
+
+    elapsed = time.perf_counter() - real_start
+    print(f"Headless: {simulated:.1f} s simulated in {elapsed:.2f} s "
+          f"({simulated / max(elapsed, 1e-9):.0f}x real time), {can_tx_stats['sent']} frames sent "
+          f"({can_tx_stats['sent'] / max(elapsed, 1e-9):.0f} frames/s)")
+    for v in vehicles:
+        print(f"  {v.name} (IDs +0x{v.id_offset:X}): speed {v.speed:.0f} km/h, "
+              f"rpm {v.rpm:.0f}, fuel {v.fuel:.1f}%")
+    print(vehicle.tx.report(clock()))
+    if args.profile_out:
+        write_profile(args.profile_out)
+
+# ================= FLEET =================
+# --fleet: hundreds of vehicles for gateway/IDS load tests. Vehicles are split into
+# batches, one per worker process (one worker per core by default); each worker
+# steps its batch on a simulated clock like headless mode, with drivers in place of
+# the keyboard. Fleet vehicles only transmit.
+FLEET_STAGGER = 1.0          # Vehicles start within this many seconds of each other
+FLEET_REPORT_INTERVAL = 5.0  # Real seconds between per-worker progress lines
+FLEET_LOOP_SCRIPT = True     # Change to False to let scripted vehicles stop at the end
+
+# Keeps worker sockets from receiving the fleet's own traffic (an empty filter
+# list would let everything in)
+FLEET_RX_FILTERS = [{"can_id": 0x1FFFFFFF, "can_mask": 0x1FFFFFFF, "extended": True}]
+
+class FleetVehicle(Vehicle):
+    """A vehicle nothing displays: plain attribute writes, no change versions"""
+    __slots__ = ()
+    __setattr__ = object.__setattr__
+
+class RandomDriver:
+    """Randomized driving through the same keys as the keyboard
+
+    Starts the engine, shifts into D, then alternates accelerating, coasting and
+    braking, with the odd indicator or body switch toggled in between.
+    """
+    __slots__ = ("vehicle", "random", "next_change")
+
+    def __init__(self, vehicle, seed=None, start=0.0):
+        self.vehicle = vehicle
+        self.random = random.Random(seed)
+        self.next_change = start
+
+    def tap(self, key):
+        self.vehicle.press(key)
+        self.vehicle.release(key)
+
+    def update(self, now):
+        if now < self.next_change:
+            return
+        v = self.vehicle
+        rng = self.random
+
+        if not v.engine_started:
+            self.tap("e")
+            self.next_change = now + rng.uniform(0.5, 2.0)
+            return
+        if v.gear != "D":
+            self.tap("g")
+            self.next_change = now + rng.uniform(0.2, 0.6)
+            return
+
+        # Braking gets likelier the faster we go
+        phase = rng.random()
+        brake_chance = 0.15 + v.speed / 400
+        if phase < brake_chance:
+            v.release("Up")
+            v.press("Down")
+            duration = rng.uniform(0.5, 3.0)
+        elif phase < brake_chance + 0.3:
+            v.release("Up")
+            v.release("Down")
+            duration = rng.uniform(2.0, 10.0)
+        else:
+            v.release("Down")
+            v.press("Up")
+            duration = rng.uniform(1.0, 8.0)
+
+        if rng.random() < 0.2:
+            self.tap(rng.choice(("Left", "Right")))
+        if rng.random() < 0.02:
+            self.tap(rng.choice(("h", "b", "d", "t", "p")))
+        self.next_change = now + duration
+
+class ScriptDriver:
+    """Plays a headless input script on one vehicle from `start`, optionally looped"""
+    __slots__ = ("vehicle", "events", "next_event", "base", "length", "loop")
+
+    def __init__(self, vehicle, events, start=0.0, loop=FLEET_LOOP_SCRIPT):
+        self.vehicle = vehicle
+        self.events = events
+        self.next_event = 0
+        self.base = start
+        self.length = events[-1][0] + 1.0 if events else 0.0
+        self.loop = loop
+
+    def update(self, now):
+        events = self.events
+        while True:
+            if self.next_event == len(events):
+                if not (self.loop and events):
+                    return
+                self.next_event = 0
+                self.base += self.length
+            at, action, key = events[self.next_event]
+            if self.base + at > now:
+                return
+            apply_input_event(action, key, (self.vehicle,))
+            self.next_event += 1
+
+def fleet_log_path(path, worker):
+    """drive.blf -> drive-w3.blf"""
+    stem, ext = os.path.splitext(path)
+    return f"{stem}-w{worker}{ext}"
+
+def init_fleet_worker(powertrain, dbc):
+    """Spawned workers re-import the module, so redo the signal table setup
+    (forked ones inherit it)"""
+    if __name__ != "__main__":
+        if powertrain != "legacy":
+            set_powertrain_frames(powertrain)
+        if dbc:
+            use_dbc(dbc)
+
+def run_fleet_worker(job):
+    """Step one batch of vehicles; returns its frame counts"""
+    global bus, clock, vehicle, vehicles
+    worker = job["worker"]
+    if job["log"]:
+        bus = LogSink(job["output"])
+    else:
+        bus = can.interface.Bus(channel=job["output"], interface=job["interface"],
+                                can_filters=FLEET_RX_FILTERS)
+    sim_clock = SimClock(time.time())
+    clock = sim_clock
+    # A pool process runs several jobs; count this one's frames only
+    can_tx_stats["sent"] = can_tx_stats["errors"] = 0
+
+    rng = random.Random(job["seed"])
+    pending = []
+    for i, id_offset in enumerate(job["offsets"]):
+        v = FleetVehicle(f"vehicle {job['first'] + i + 1}", bus, id_offset)
+        start = rng.uniform(0.0, FLEET_STAGGER)
+        if job["events"] is not None:
+            driver = ScriptDriver(v, job["events"], start)
+        else:
+            driver = RandomDriver(v, rng.getrandbits(32), start)
+        pending.append((start, i, driver))
+    pending.sort(reverse=True)  # Latest start last in, so pop() hands out the next one
+    vehicle = pending[-1][2].vehicle
+    vehicles = []
+    drivers = []
+
+    steps = int(job["duration"] / PHYSICS_DT)
+    time_scale = job["time_scale"]
+    simulated = 0.0
+    real_start = last_report = time.perf_counter()
+    reported_frames = 0
+    try:
+        for step in range(steps):
+            sim_seconds = step * PHYSICS_DT
+
+            # Vehicles join at their staggered start so their cycles don't all line up
+            while pending and pending[-1][0] <= sim_seconds:
+                driver = pending.pop()[2]
+                drivers.append(driver)
+                vehicles.append(driver.vehicle)
+            for driver in drivers:
+                driver.update(sim_seconds)
+
+            step_simulation(PHYSICS_DT)
+            sim_clock.advance(PHYSICS_DT)
+            simulated += PHYSICS_DT
+
+            now = time.perf_counter()
+            if time_scale > 0:
+                delay = real_start + (step + 1) * PHYSICS_DT / time_scale - now
+                if delay > 0:
+                    time.sleep(delay)
+            if now - last_report >= FLEET_REPORT_INTERVAL:
+                sent = can_tx_stats["sent"]
+                print(f"Fleet worker {worker}: {(sent - reported_frames) / (now - last_report):.0f} "
+                      f"frames/s, {len(vehicles)} vehicles, "
+                      f"{simulated / (now - real_start):.2f}x real time", flush=True)
+                reported_frames, last_report = sent, now
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for v in vehicles:
+            v.tx.stop()
+        bus.shutdown()
+
+    return {"worker": worker, "vehicles": len(job["offsets"]), "output": job["output"],
+            "frames": can_tx_stats["sent"], "errors": can_tx_stats["errors"],
+            "simulated": simulated, "elapsed": time.perf_counter() - real_start}
+
+def run_fleet(args):
+    """Spread --vehicles over a process pool and report frames/s per worker"""
+    events = None
+    if args.script:
+        if args.script == "-":
+            events = load_input_script(sys.stdin)
+        else:
+            with open(args.script) as f:
+                events = load_input_script(f)
+
+    duration = args.duration
+    if duration is None:
+        duration = events[-1][0] + 1.0 if events else 60.0
+    count = max(1, args.vehicles)
+    workers = max(1, min(args.workers or os.cpu_count() or 1, count))
+    channels = args.channel.split(",")
+    id_stride = VEHICLE_ID_STRIDE if args.id_stride is None else args.id_stride
+    seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+
+    # Contiguous batches; IDs are offset per vehicle so nothing collides on a
+    # channel (log files share one numbering so they can be merged)
+    jobs = []
+    first = 0
+    on_output = collections.Counter()
+    for worker in range(workers):
+        batch = count // workers + (worker < count % workers)
+        if args.log_out:
+            output, key = fleet_log_path(args.log_out, worker), None
+        else:
+            output = key = channels[worker % len(channels)]
+        offsets = [(on_output[key] + i) * id_stride for i in range(batch)]
+        on_output[key] += batch
+        jobs.append({"worker": worker, "first": first, "offsets": offsets, "output": output,
+                     "log": bool(args.log_out), "interface": args.interface,
+                     "events": events, "seed": seed + worker,
+                     "duration": duration, "time_scale": args.time_scale})
+        first += batch
+
+    print(f"Fleet: {count} vehicles on {workers} worker{'s' if workers > 1 else ''}, "
+          f"{'scripted' if events is not None else f'random drivers (seed {seed})'}, "
+          f"{duration:.1f} s simulated at "
+          f"{'max speed' if args.time_scale <= 0 else f'{args.time_scale:g}x'}", flush=True)
+
+    results = []
+    with concurrent.futures.ProcessPoolExecutor(
+            workers, initializer=init_fleet_worker,
+            initargs=(args.powertrain, args.dbc)) as pool:
+        futures = [pool.submit(run_fleet_worker, job) for job in jobs]
+        for future in futures:
+            while True:
+                try:
+                    results.append(future.result())
+                    break
+                except KeyboardInterrupt:
+                    pass  # Workers stop on the same Ctrl+C and still report
+
+    total_rate = 0.0
+    for result in results:
+        rate = result["frames"] / max(result["elapsed"], 1e-9)
+        total_rate += rate
+        print(f"Fleet worker {result['worker']}: {result['vehicles']} vehicles -> {result['output']}, "
+              f"{result['frames']} frames in {result['elapsed']:.2f} s, {rate:.0f} frames/s, "
+              f"{result['simulated'] / max(result['elapsed'], 1e-9):.2f}x real time"
+              + (f", {result['errors']} send errors" if result["errors"] else ""))
+    print(f"Fleet: {sum(result['frames'] for result in results)} frames, "
+          f"{total_rate:.0f} frames/s across {len(results)} workers")
+
+# ================= BENCHMARKS =================
+# --benchmark: time the hot paths on a virtual bus and a stub canvas (no display
+# or CAN hardware needed) and emit JSON so runs can be compared between versions
+BENCHMARK_CHANNEL = "dash-benchmark"
+BENCHMARK_REPEAT = 3  # Best of N runs per measurement
+BENCHMARK_RX_RATES = (1000, 5000, 20000)  # Offered frames/s for the paced receive test
+BENCHMARK_RESOLUTIONS = ((1280, 480), (1600, 800), (1920, 720), (3840, 1600))
+
+class NullCanvas:
+    """Canvas stand-in that only counts calls"""
+
+    def __init__(self):
+        self.items = 0
+        self.calls = 0
+
+    def _create(self, *coords, **options):
+        self.items += 1
+        self.calls += 1
+        return self.items
+
+    create_arc = create_line = create_oval = create_polygon = _create
+    create_rectangle = create_text = create_image = _create
+
+    def coords(self, item, *coords):
+        self.calls += 1
+
+    def itemconfigure(self, item, **options):
+        self.calls += 1
+
+    def delete(self, *tags):
+        self.items = 0
+        self.calls += 1
+
+    def find_all(self):
+        return range(1, self.items + 1)
+
+def best_time(fn, repeat=BENCHMARK_REPEAT):
+    """Fastest of `repeat` runs, in seconds"""
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def render_moving(frames, frame_interval=None):
+    """Render frames with both needles sweeping; with frame_interval, each frame
+    smooths the needles as if that long had passed, so every frame draws"""
+    global last_frame_time
+    v = vehicle
+    for i in range(frames):
+        v.speed = v.prev_speed = (i * 0.37) % 260
+        v.rpm = v.prev_rpm = (i * 11.3) % 8000
+        if frame_interval is not None:
+            last_frame_time = time.perf_counter() - frame_interval
+        render()
+
+def benchmark_render(frames=2000):
+    """Full render() pipeline against a stub canvas, moving and idle"""
+    global canvas
+    canvas = NullCanvas()
+    reset_scene()
+    render()  # Builds the scene
+
+    def moving():
+        render_moving(frames, 1.0 / RENDER_FPS_ACTIVE)
+
+    def idle():
+        for _ in range(frames):
+            render()
+
+    calls, drawn, skipped = canvas.calls, render_counts["drawn"], render_counts["skipped"]
+    moving_time = best_time(moving)
+    calls_per_frame = (canvas.calls - calls) / (frames * BENCHMARK_REPEAT)
+    moving_drawn = render_counts["drawn"] - drawn
+    moving_skipped = render_counts["skipped"] - skipped
+    idle_time = best_time(idle)
+    return {"frames_per_s": frames / moving_time, "ms_per_frame": moving_time / frames * 1e3,
+            "drawn_frames": moving_drawn, "skipped_frames": moving_skipped,
+            "idle_frames_per_s": frames / idle_time,
+            "canvas_items": canvas.items, "canvas_calls_per_frame": calls_per_frame}
+
+def benchmark_resolutions(frames=1000):
+    """Layout and moving-frame cost at each BENCHMARK_RESOLUTIONS window size;
+    frames should cost the same at every size, only the layout is redone"""
+    global canvas
+    results = {}
+    for width, height in BENCHMARK_RESOLUTIONS:
+        canvas = NullCanvas()
+        reset_scene(width, height)
+        start = time.perf_counter()
+        render()  # Lays the cluster out for this size
+        layout = time.perf_counter() - start
+
+        calls, drawn = canvas.calls, render_counts["drawn"]
+        moving_time = best_time(lambda: render_moving(frames, 1.0 / RENDER_FPS_ACTIVE))
+        results[f"{width}x{height}"] = {
+            "ms_per_frame": moving_time / frames * 1e3, "layout_ms": layout * 1e3,
+            "drawn_frames": render_counts["drawn"] - drawn,
+            "canvas_calls_per_frame": (canvas.calls - calls) / (frames * BENCHMARK_REPEAT)}
+    per_frame = [result["ms_per_frame"] for result in results.values()]
+    results["max_over_min_frame_cost"] = max(per_frame) / min(per_frame)
+    return results
+
+def benchmark_physics(steps=20000):
+    """Physics alone, and whole simulation steps including CAN publish/send"""
+    global clock
+    clock = SimClock(0.0)
+    v = vehicle
+    v.engine_started, v.gear, v.gear_index = True, "D", 3
+    v.keys_pressed.add("Up")
+
+    def physics():
+        for _ in range(steps):
+            v.update_controls(PHYSICS_DT)
+            v.update_physics(PHYSICS_DT)
+
+    def simulation():
+        for _ in range(steps):
+            step_simulation(PHYSICS_DT)
+            clock.advance(PHYSICS_DT)
+
+    physics_time = best_time(physics)
+    sent = can_tx_stats["sent"]
+    simulation_time = best_time(simulation)
+    v.keys_pressed.discard("Up")
+    return {"physics_ticks_per_s": steps / physics_time,
+            "simulation_steps_per_s": steps / simulation_time,
+            "realtime_factor": steps * PHYSICS_DT / simulation_time,
+            "frames_sent_per_step": (can_tx_stats["sent"] - sent) / (steps * BENCHMARK_REPEAT)}
+
+def benchmark_input_frames(count):
+    """A reproducible mix of every decoded input ID plus some traffic we ignore"""
+    ids = sorted(can_decoders) + [0x555]
+    return [can.Message(arbitration_id=ids[i % len(ids)], data=bytes([(i * 7) % 4, i % 256]),
+                        is_extended_id=False) for i in range(count)]
+
+def benchmark_decode(peer, frames=20000):
+    """read_can's poll path at several queue depths, the receive-thread path,
+    and paced input rates through the Notifier"""
+    results = {}
+    messages = benchmark_input_frames(frames)
+
+    for depth in (1, 10, 100, 1000):
+        polled = 0.0
+        can_rx_stats["received"] = 0
+        for first in range(0, frames, depth):
+            for msg in messages[first:first + depth]:
+                peer.send(msg)
+            start = time.perf_counter()
+            poll_can(max_messages=depth)
+            polled += time.perf_counter() - start
+        results[f"poll_depth_{depth}_frames_per_s"] = can_rx_stats["received"] / polled
+
+    listener = CanRxListener(maxlen=frames)
+    def decode():
+        listener.queue.clear()
+        for msg in messages:
+            listener.on_message_received(msg)
+    results["listener_frames_per_s"] = frames / best_time(decode)
+
+    for rate in BENCHMARK_RX_RATES:
+        rx_listeners[:] = [CanRxListener()]
+        notifier = can.Notifier(bus, rx_listeners, timeout=0.01)
+        for key in can_rx_stats:
+            can_rx_stats[key] = 0
+        duration = 0.5
+        count = int(rate * duration)
+        cpu = time.process_time()
+        start = time.perf_counter()
+        for i, msg in enumerate(benchmark_input_frames(count)):
+            delay = start + i / rate - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            peer.send(msg)
+            if i % 100 == 0:
+                apply_can_updates()  # A frame's worth of draining
+        offered = count / (time.perf_counter() - start)
+        time.sleep(0.05)
+        notifier.stop()
+        apply_can_updates()
+        received = can_rx_stats["received"]
+        results[f"paced_{rate}"] = {
+            "offered_frames_per_s": offered, "received": received, "sent": count,
+            "dropped": can_rx_stats["dropped"],
+            "process_cpu_us_per_frame": (time.process_time() - cpu) / max(received, 1) * 1e6}
+    rx_listeners.clear()
+    return results
+
+def benchmark_send(peer, frames=20000):
+    """send_can events through the transmit scheduler onto the virtual bus"""
+    global clock
+    clock = SimClock(0.0)
+
+    def send():
+        for i in range(frames):
+            send_can(0x200 + i % 9, [i & 1])
+            vehicle.tx.tick(i * PHYSICS_DT)
+        while peer.recv(0) is not None:
+            pass
+
+    sent = can_tx_stats["sent"]
+    elapsed = best_time(send)
+    per_run = (can_tx_stats["sent"] - sent) / BENCHMARK_REPEAT
+    return {"frames_per_s": per_run / elapsed, "frames": per_run}
+
+def benchmark_audio():
+    """Engine synthesis (NumPy and pure Python) and the mixer"""
+    global np
+    results = {}
+    samples = SAMPLE_RATE
+
+    numpy_module = np
+    variants = [("numpy", numpy_module), ("python", None)] if numpy_module is not None \
+        else [("python", None)]
+    for name, module in variants:
+        np = module
+        results[f"synth_{name}_samples_per_s"] = samples / best_time(
+            lambda: synth_engine(110.0, 0.4, samples))
+    np = numpy_module
+
+    audio_mixer = AudioMixer()
+    audio_mixer.set_engine(3000, 50, True)
+    blocks = 200
+    mix_time = best_time(lambda: [audio_mixer.render(AUDIO_BLOCK_FRAMES) for _ in range(blocks)])
+    results["mixer_samples_per_s"] = blocks * AUDIO_BLOCK_FRAMES / mix_time
+    results["mixer_realtime_factor"] = blocks * AUDIO_BLOCK_FRAMES / SAMPLE_RATE / mix_time
+
+    # What play_engine_sound drives: a new engine setting before every block
+    rpms = [800 + (i * 37) % 7000 for i in range(blocks)]
+
+    def sweep():
+        for rpm_value in rpms:
+            audio_mixer.set_engine(rpm_value, 50, True)
+            audio_mixer.render(AUDIO_BLOCK_FRAMES)
+
+    results["mixer_engine_sweep_samples_per_s"] = blocks * AUDIO_BLOCK_FRAMES / best_time(sweep)
+    return results
+
+def run_benchmarks(args):
+    """Run every benchmark and write the results as JSON"""
+    open_bus(BENCHMARK_CHANNEL, "virtual")
+    peer = can.Bus(channel=BENCHMARK_CHANNEL, interface="virtual")
+
+    results = {}
+    suite = [
+        ("render", benchmark_render),
+        ("resolutions", benchmark_resolutions),
+        ("gauge_geometry", lambda: benchmark_gauge_geometry(report=False)),
+        ("physics", benchmark_physics),
+        ("decode", lambda: benchmark_decode(peer)),
+        ("send", lambda: benchmark_send(peer)),
+        ("audio", benchmark_audio),
+    ]
+    try:
+        for name, benchmark in suite:
+            start = time.perf_counter()
+            results[name] = benchmark()
+            print(f"Benchmark {name}: {time.perf_counter() - start:.1f} s", file=sys.stderr)
+    finally:
+        peer.shutdown()
+        bus.shutdown()
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "python_can": can.__version__,
+        "numpy": np.__version__ if np is not None else None,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.benchmark_out and args.benchmark_out != "-":
+        with open(args.benchmark_out, "w") as f:
+            f.write(text + "\n")
+        print(f"Benchmark results written to {args.benchmark_out}", file=sys.stderr)
+    else:
+        print(text)
+
+# ================= ASYNC RUNTIME =================
+# --asyncio: one asyncio loop owns the dashboard instead of root.after chains.
+# Incoming frames wake a reader task (the Notifier watches the bus's file
+# descriptor where the interface has one), physics is its own timed task, the
+# render task sleeps until the next frame is due or something asks for one, and
+# Tk events are pumped from a task.
+ASYNC_RUNTIME = False  # Change to True to use it without --asyncio
+TK_PUMP_HZ = 60        # Rate Tk key and window events are processed at...
+TK_PUMP_IDLE_HZ = 20   # ...and once the cluster is idle (worst-case key latency 50 ms)
+
+frame_wakeup = None    # asyncio.Event behind request_frame() while the loop runs
+physics_wakeup = None  # Set by key presses so a resting physics task runs at once
+
+async def can_reader_task(reader, fleet):
+    """Apply frames as they arrive, a whole burst per wakeup"""
+    buffer = reader.buffer
+    while True:
+        msg = await reader.get_message()
+        decoded = False
+        while True:
+            decoded |= receive_frame(msg, fleet)
+            try:
+                msg = buffer.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+        if decoded:
+            request_frame()
+
+def vehicles_at_rest():
+    """Nothing can move: no keys held, every vehicle stopped with its engine off"""
+    for v in vehicles:
+        if v.keys_pressed or v.engine_started or v.speed or v.rpm:
+            return False
+    return True
+
+def next_tx_due():
+    """Clock time of the earliest cyclic frame due from any vehicle, or None"""
+    return min((due for v in vehicles for due in v.tx.next_due.values()), default=None)
+
+async def physics_task():
+    """Fixed-step physics, waking at each step boundary
+
+    While every vehicle is at rest it sleeps until the next cyclic frame is due
+    (or a key is pressed) and catches up on the steps in between, so an idle
+    dashboard wakes at the CAN cycle rate instead of PHYSICS_HZ.
+    """
+    longest = (MAX_PHYSICS_STEPS - 1) * PHYSICS_DT  # Still short of dropping the backlog
+    while True:
+        try:
+            advance_simulation(time.perf_counter())
+        except Exception as e:
+            print(f"Physics error: {e}")
+        delay = PHYSICS_DT - physics_accumulator
+        if not vehicles_at_rest():
+            await asyncio.sleep(max(0.0, delay))
+            continue
+        due = next_tx_due()
+        rest = longest if due is None else min(longest, due - clock())
+        try:
+            await asyncio.wait_for(physics_wakeup.wait(), max(0.0, delay, rest))
+        except asyncio.TimeoutError:
+            pass
+        physics_wakeup.clear()
+
+async def render_task():
+    """Frames at render()'s pace; a wakeup never beats the active frame rate"""
+    min_interval = 1.0 / (RENDER_FPS_ACTIVE if ADAPTIVE_FRAME_RATE else RENDER_FPS)
+    while True:
+        start = time.perf_counter()
+        delay = render()
+        root.update_idletasks()  # On screen now rather than at the next pump
+        try:
+            await asyncio.wait_for(frame_wakeup.wait(), max(0.0, delay))
+        except asyncio.TimeoutError:
+            pass
+        frame_wakeup.clear()
+        rest = start + min_interval - time.perf_counter()
+        if rest > 0:
+            await asyncio.sleep(rest)
+
+async def tk_pump_task(stop):
+    """Process Tk events until the window is closed, slower while idle"""
+    while True:
+        try:
+            root.update()
+        except Exception:
+            break  # TclError once the window has been destroyed
+        idle = time.perf_counter() - last_change_time >= RENDER_IDLE_AFTER
+        await asyncio.sleep(1.0 / (TK_PUMP_IDLE_HZ if idle else TK_PUMP_HZ))
+    stop.set()
+
+async def run_async_dashboard():
+    global frame_wakeup, physics_wakeup
+    loop = asyncio.get_running_loop()
+    frame_wakeup = asyncio.Event()
+    physics_wakeup = asyncio.Event()
+    stop = asyncio.Event()
+
+    notifiers = []
+    tasks = []
+    for rx_bus, fleet in vehicle_buses().items():
+        reader = can.AsyncBufferedReader()
+        notifiers.append(can.Notifier(rx_bus, [reader], loop=loop))
+        tasks.append(asyncio.create_task(can_reader_task(reader, fleet)))
+    tasks += [asyncio.create_task(physics_task()),
+              asyncio.create_task(render_task()),
+              asyncio.create_task(tk_pump_task(stop))]
+    try:
+        await stop.wait()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for notifier in notifiers:
+            notifier.stop()
+        frame_wakeup = physics_wakeup = None
+
+# ================= START =================
+def run_dashboard(args):
+    if args.view_state:
+        open_state_view(args.view_state)
+    elif args.replay:
+        open_replay(args.replay, args.replay_speed, args.replay_start)
+    else:
+        open_vehicle_buses(args)
+    if args.record:
+        start_recorder(args.record)
+    if args.export_state:
+        start_state_export(args.export_state)
+    if args.audio_out:
+        init_audio(args.audio_out)
+    else:
+        init_audio()
+    build_window(args.geometry)
+
+    print("=== Interactive Dashboard Started ===")
+    if AUDIO_ENABLED:
+        print("✓ Audio enabled - Engine and indicator sounds active")
+    else:
+        print("ℹ Audio disabled for optimal performance")
+        if not ENABLE_AUDIO_ATTEMPT:
+            print("  To enable audio: Edit main-dash.py and set ENABLE_AUDIO_ATTEMPT = True")
+    print("")
+    print("Controls:")
+    print("  E - Engine Start/Stop")
+    print("  G - Change Gear (P→R→N→D)")
+    print("  ↑/W - Accelerate")
+    print("  ↓ - Brake")
+    print("  ← - Left Turn Signal")
+    print("  → - Right Turn Signal")
+    print("  H - Hazard Lights")
+    print("  B - High Beam")
+    print("  P - Parking Brake")
+    print("  D - Door Open/Close")
+    print("  T - Seatbelt Toggle")
+    print("")
+    if state_view is None:
+        print(f"CAN Messages being sent on {args.channel}:")
+        print("  0x100 - Speed")
+        print("  0x101 - RPM")
+        print("  0x102 - Gear")
+        print("  0x103 - Fuel")
+        print("  0x104 - Temperature")
+        print("  0x200-0x208 - Warning Indicators")
+        print("  0x300-0x302 - Turn Signals & Door")
+        print("")
+        print(f"Use 'candump {args.channel}' to monitor CAN traffic")
+    if len(vehicles) > 1:
+        print(f"{len(vehicles)} vehicles - Tab switches the one shown and driven")
+        focus_vehicle(0)
+
+    if BENCHMARK_GAUGES:
+        benchmark_gauge_geometry()
+
+    for v in vehicles:
+        v.tx.use_bus_periodic = TX_PERIODIC_MODE or args.tx_periodic
+    if PROFILE or args.profile_out:
+        enable_profiler()
+    if ASYNC_RUNTIME or args.asyncio:
+        try:
+            asyncio.run(run_async_dashboard())
+        except KeyboardInterrupt:
+            pass
+    else:
+        simulation_tick()
+        render_tick()
+        if CAN_RX_THREAD:
+            start_can_receiver()
+        else:
+            read_can()
+        root.mainloop()
+    stop_can_receiver()
+    print(vehicle.tx.report(clock()))
+    close_vehicle_buses()
+    stop_recorder()
+    stop_state_export()
+    if args.profile_out:
+        write_profile(args.profile_out)
+
+    # Cleanup audio on exit
+    close_audio()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Interactive CAN bus dashboard simulator")
+    parser.add_argument("--channel", default=CAN_CHANNEL,
+                        help="CAN channel, or a comma-separated list to spread --vehicles "
+                             "over (default: vcan0)")
+    parser.add_argument("--interface", default=CAN_INTERFACE,
+                        help="python-can interface (default: socketcan)")
+    parser.add_argument("--dbc", default=DBC_FILE, metavar="PATH",
+                        help="take the CAN signal layout from a DBC file (e.g. dashboard.dbc)")
+    parser.add_argument("--powertrain", choices=("legacy", "packed", "both"),
+                        default=TX_POWERTRAIN_FRAMES,
+                        help="powertrain frames to send: single-byte 0x100-0x104, "
+                             "full-resolution 0x105, or both")
+    parser.add_argument("--record", metavar="PATH",
+                        help="record sent/received frames and physics snapshots "
+                             "(.blf, .asc, .log, ...)")
+    parser.add_argument("--replay", metavar="PATH",
+                        help="play a recorded log (.log, .asc, .blf) into the dashboard instead "
+                             "of a live bus; with --headless, report decode throughput")
+    parser.add_argument("--replay-speed", type=float, default=1.0, metavar="X",
+                        help="replay at X times real time, 0 = as fast as possible (default 1)")
+    parser.add_argument("--replay-start", type=float, default=0.0, metavar="SECONDS",
+                        help="start the replay this far into the log")
+    parser.add_argument("--export-state", metavar="PATH",
+                        help="publish live vehicle state to a memory-mapped file for other "
+                             "processes (e.g. /dev/shm/dash-state)")
+    parser.add_argument("--view-state", metavar="PATH",
+                        help="show the vehicles another dashboard exports with --export-state "
+                             "instead of simulating them; no CAN")
+    parser.add_argument("--profile-out", metavar="PATH",
+                        help="time every stage and write the stats as JSON on exit")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="time render, physics, CAN decode/send and audio on a virtual "
+                             "bus and stub canvas, print JSON results and exit")
+    parser.add_argument("--benchmark-out", metavar="PATH",
+                        help="write the --benchmark JSON to PATH instead of stdout")
+    parser.add_argument("--receive-own", action="store_true", default=CAN_RECEIVE_OWN_MESSAGES,
+                        help="also receive the frames this dashboard sends")
+    parser.add_argument("--audio-out",
+                        help="mix audio to a .wav file (or 'null') instead of the sound card")
+    parser.add_argument("--tx-periodic", action="store_true",
+                        help="send cyclic IDs with bus.send_periodic (kernel-timed on socketcan)")
+    parser.add_argument("--vehicles", type=int, default=1, metavar="N",
+                        help="simulate N vehicles in this process (Tab cycles the one shown)")
+    parser.add_argument("--id-stride", type=lambda text: int(text, 0), metavar="OFFSET",
+                        help="ID offset between vehicles sharing a channel "
+                             f"(default 0x{VEHICLE_ID_STRIDE:X}, 0 if each has its own channel)")
+    parser.add_argument("--fleet", action="store_true",
+                        help="simulate --vehicles on a process pool with scripted (--script) or "
+                             "random drivers, transmit only; implies no window")
+    parser.add_argument("--workers", type=int, metavar="N",
+                        help="fleet worker processes (default: one per core)")
+    parser.add_argument("--seed", type=int, help="fleet random driver seed")
+    parser.add_argument("--geometry", type=window_size, metavar="WIDTHxHEIGHT",
+                        help=f"initial window size, e.g. 1280x480 (default {W}x{H}); "
+                             "the cluster scales to fit")
+    parser.add_argument("--asyncio", action="store_true", default=ASYNC_RUNTIME,
+                        help="run CAN receive, physics, rendering and Tk events as asyncio tasks")
+    parser.add_argument("--headless", action="store_true",
+                        help="run physics and CAN without a window (no tkinter import)")
+    parser.add_argument("--script",
+                        help="headless input script of '<seconds> <press|release|tap> <key>' lines, - for stdin")
+    parser.add_argument("--duration", type=float,
+                        help="headless simulated seconds (default: end of script, or 60)")
+    parser.add_argument("--time-scale", type=float, default=1.0,
+                        help="headless simulated seconds per real second, 0 = as fast as possible")
+    parser.add_argument("--log-out",
+                        help="headless: write frames to a .log/.asc/.blf file instead of the bus "
+                             "(fleet: one file per worker, NAME-wN.EXT)")
+    args = parser.parse_args(argv)
+    if args.dbc and args.powertrain != "legacy":
+        parser.error(f"--powertrain {args.powertrain} selects frames of the built-in tables; "
+                     "with --dbc the DBC defines every output frame (add the packed frame to it)")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.powertrain != "legacy":
+        set_powertrain_frames(args.powertrain)
+    if args.dbc:
+        use_dbc(args.dbc)
+    if args.benchmark or args.benchmark_out:
+        run_benchmarks(args)
+    elif args.fleet:
+        run_fleet(args)
+    elif args.headless and args.replay:
+        run_replay(args)
+    elif args.headless:
+        run_headless(args)
+    else:
+        run_dashboard(args)
+
+if __name__ == "__main__":
+    main()